@@ -3,6 +3,8 @@ from flask_migrate import Migrate
 from redis import Redis, ConnectionError, ConnectionPool
 from app.models import db
 from app.routes import main_bp, auth_bp
+from app.tracing import configure_tracing
+from app.degraded import RedisBreaker, SnapshotReader, snapshot_dir
 import os
 import time
 import logging
@@ -11,8 +13,14 @@ import logging
 migrate = Migrate()
 logger = logging.getLogger(__name__)
 
-def initialize_redis():
-    """Initialize Redis with retries and proper SSL configuration."""
+def initialize_redis(socket_timeout=None):
+    """
+    Initialize Redis with retries and proper SSL configuration.
+
+    Args:
+        socket_timeout (float, optional): Seconds to connect and to wait for a reply;
+            None waits indefinitely, as blocking queue reads need.
+    """
     redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     ssl_cert_path = os.getenv("SSL_CERT_PATH", "/certificate.pem")
 
@@ -23,6 +31,8 @@ def initialize_redis():
             "ssl_cert_reqs": "CERT_OPTIONAL",  # Change to 'CERT_REQUIRED' if stricter validation is needed
             "ssl_ca_certs": ssl_cert_path,
         }
+    if socket_timeout is not None:
+        ssl_options.update(socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout)
 
     # Use a connection pool for SSL
     pool = ConnectionPool.from_url(redis_url, **ssl_options)
@@ -46,6 +56,11 @@ def create_app():
 
     # Initialize Redis
     app.redis_client = initialize_redis()
+    configure_tracing(app)
+
+    # Page reads go through a breaker with short timeouts and fall back to snapshots
+    app.redis_breaker = RedisBreaker(initialize_redis(socket_timeout=app.config["REDIS_READ_TIMEOUT"]))
+    app.snapshots = SnapshotReader(snapshot_dir(app))
 
     # Initialize extensions
     db.init_app(app)
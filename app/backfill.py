@@ -0,0 +1,248 @@
+from app.browser import open_page, close_browser
+from app.constants import LEAGUES, TENNIS_LEAGUES, BACKFILL_CONCURRENCY, BACKFILL_SEASONS
+from app.fetchers import parse_football_listing, parse_tennis_listing, fetch_tennis_draw_async, draw_key, apply_round
+from app.metrics import scrape_labels, flush_metrics
+from app.page_selectors import SelectorDrift, probe_selector
+from app.persistence import save_scrape, kickoff_date
+from app.rate_limit import wait_for_slot
+from app.records import to_dicts
+from datetime import datetime, time
+import argparse
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Historical results backfill: closing odds of past seasons, crawled from the
+# OddsPortal results archive (".../premier-league-2023-2024/results/#/page/2/")
+# and written to SQL with save_scrape(source="backfill"). Checkpoints live in Redis:
+#   backfill:seasons                      hash "<cache_key>:<season>" -> number of results pages
+#   backfill:pages:<cache_key>:<season>   set of the pages already written to the database
+# A page is checkpointed only after its rows are committed, and its snapshots
+# are stamped with the kickoff date, so a crashed run resumes where it stopped
+# and pages that are crawled twice insert nothing new.
+SEASONS_KEY = "backfill:seasons"
+
+
+def _pages_key(cache_key, season):
+    return f"backfill:pages:{cache_key}:{season}"
+
+
+def seasons(sport, first_year, last_year):
+    """
+    Season names of the archive URLs, oldest first.
+
+    Args:
+        sport (str): "football" seasons span two years ("2023-2024"), tennis seasons one ("2024").
+        first_year (int): Year the first season starts in.
+        last_year (int): Year the last season starts in.
+
+    Returns:
+        list: Season names.
+    """
+    if sport == "football":
+        return [f"{year}-{year + 1}" for year in range(first_year, last_year + 1)]
+    return [str(year) for year in range(first_year, last_year + 1)]
+
+
+def season_url(league_url, season, page="results/"):
+    """
+    Archive URL of a season of a league.
+
+    Args:
+        league_url (str): Current league URL (e.g., ".../england/premier-league/").
+        season (str): Season name (e.g., "2023-2024").
+        page (str): Page of the season: "results/" or "standings/".
+
+    Returns:
+        str: e.g., ".../england/premier-league-2023-2024/results/".
+    """
+    return f"{league_url.rstrip('/')}-{season}/{page}"
+
+
+def league_urls(sport, league):
+    """(listing URL, draw URL or None, cache key) of a league."""
+    if sport == "football":
+        return LEAGUES[league], None, f"matches_{league}"
+    urls = TENNIS_LEAGUES[league]
+    return urls["matches"], urls.get("rounds"), f"tennis_matches_{league}"
+
+
+def read_checkpoint(redis_client, cache_key, season):
+    """(number of results pages or None if unknown, set of pages done) of a season."""
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hget(SEASONS_KEY, f"{cache_key}:{season}")
+    pipe.smembers(_pages_key(cache_key, season))
+    total, done = pipe.execute()
+    return (int(total) if total is not None else None), {int(page) for page in done}
+
+
+def write_checkpoint(redis_client, cache_key, season, page, total=None):
+    """Mark a results page of a season as written to the database."""
+    pipe = redis_client.pipeline(transaction=False)
+    if total is not None:
+        pipe.hset(SEASONS_KEY, f"{cache_key}:{season}", total)
+    pipe.sadd(_pages_key(cache_key, season), page)
+    pipe.execute()
+
+
+def clear_checkpoint(redis_client, cache_key, season):
+    """Forget the progress of a season so it is crawled again."""
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hdel(SEASONS_KEY, f"{cache_key}:{season}")
+    pipe.delete(_pages_key(cache_key, season))
+    pipe.execute()
+
+
+async def results_pages(page, url):
+    """Number of results pages of a season, from the pagination of its first page."""
+    try:
+        selector = await probe_selector(page, "results_pagination", url, wait=False)
+    except SelectorDrift:
+        return 1  # A single page has no pagination
+    numbers = [text.strip() for text in await page.locator(selector).all_text_contents()]
+    return max([int(number) for number in numbers if number.isdigit()], default=1)
+
+
+def save_results(sport, league, matches):
+    """
+    Write the matches of a results page, one batch per kickoff date.
+
+    Snapshots are stamped with the kickoff date instead of the crawl time, so
+    writing the same page again inserts nothing.
+
+    Returns:
+        int: Number of odds snapshots written.
+    """
+    by_day = {}
+    for match in to_dicts(matches):
+        day = kickoff_date(match.get("date"))
+        if day is not None:
+            by_day.setdefault(day, []).append(match)
+    return sum(
+        save_scrape(sport, league, day_matches, scraped_at=datetime.combine(day, time()), source="backfill")
+        for day, day_matches in by_day.items()
+    )
+
+
+class Backfill:
+    """
+    Crawl the results archive of many leagues and seasons with a bound on open pages.
+
+    Every results page is its own task, so up to `concurrency` pages of any
+    league load at once while the shared rate limiter spaces their requests.
+    The first page of a season is crawled before the others because its
+    pagination tells how many pages the season has.
+    """
+
+    def __init__(self, app, concurrency=BACKFILL_CONCURRENCY):
+        self.app = app
+        self.slots = asyncio.Semaphore(concurrency)
+        self.written = 0
+        self.failed = 0
+
+    async def _crawl_page(self, sport, league, cache_key, season, url, number, draw):
+        """Crawl one results page; returns the number of results pages on page 1, else None."""
+        page_url = url if number == 1 else f"{url}#/page/{number}/"
+        parse = parse_football_listing if sport == "football" else parse_tennis_listing
+        try:
+            async with self.slots:
+                async with open_page(self.app, owner=f"backfill {cache_key}") as page:
+                    await wait_for_slot(page_url)
+                    await page.goto(page_url, timeout=30000)
+                    matches = await parse(page, page_url)
+                    total = await results_pages(page, page_url) if number == 1 else None
+
+            for match in matches:
+                round_name = draw.get(draw_key(match.home_player, match.away_player)) if draw else None
+                if round_name:
+                    apply_round(match, round_name)
+            written = await asyncio.to_thread(save_results, sport, league, matches)
+            await asyncio.to_thread(write_checkpoint, self.app.redis_client, cache_key, season, number, total)
+        except Exception as e:
+            # Not checkpointed, so the next run crawls the page again
+            self.failed += 1
+            logger.error(f"Error crawling {page_url}: {e}")
+            return None
+
+        self.written += written
+        logger.info(f"Backfilled {len(matches)} matches ({written} new snapshots) from {page_url}")
+        return total
+
+    async def season(self, sport, league, season):
+        """Crawl the results pages of one season that are not checkpointed yet."""
+        league_url, rounds_url, cache_key = league_urls(sport, league)
+        total, done = await asyncio.to_thread(read_checkpoint, self.app.redis_client, cache_key, season)
+        if total is not None and len(done) >= total:
+            return
+
+        labels = scrape_labels.set({"sport": sport, "league": league})
+        try:
+            # Rounds of past tournaments come from their own draw, not the current schedule
+            draw = {}
+            if rounds_url:
+                async with self.slots:
+                    draw = await fetch_tennis_draw_async(season_url(league_url, season, "standings/"))
+
+            url = season_url(league_url, season)
+            if total is None or 1 not in done:
+                total = await self._crawl_page(sport, league, cache_key, season, url, 1, draw) or total
+                if total is None:
+                    return  # Retried on the next run
+            await asyncio.gather(*(
+                self._crawl_page(sport, league, cache_key, season, url, number, draw)
+                for number in range(2, total + 1)
+                if number not in done
+            ))
+        finally:
+            scrape_labels.reset(labels)
+
+    async def run(self, jobs):
+        """
+        Crawl the given seasons.
+
+        Args:
+            jobs (list): (sport, league, season) tuples.
+        """
+        try:
+            await asyncio.gather(*(self.season(sport, league, season) for sport, league, season in jobs))
+        finally:
+            await close_browser(self.app)
+            await asyncio.to_thread(flush_metrics, self.app.redis_client)
+        logger.info(f"Backfill wrote {self.written} odds snapshots, {self.failed} pages failed.")
+
+
+def main():
+    """Entry point: python -m app.backfill [--sport tennis] [--league ...] [--from 2020 --to 2024]"""
+    from app import create_app
+
+    last_year = datetime.now().year - 1
+    parser = argparse.ArgumentParser(description="Backfill closing odds of past seasons into the database.")
+    parser.add_argument("--sport", choices=["football", "tennis"], help="Only this sport.")
+    parser.add_argument("--league", action="append", help="Only this league (repeatable).")
+    parser.add_argument("--from", dest="first_year", type=int, default=last_year - BACKFILL_SEASONS + 1)
+    parser.add_argument("--to", dest="last_year", type=int, default=last_year)
+    parser.add_argument("--concurrency", type=int, default=BACKFILL_CONCURRENCY, help="Results pages open at once.")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoints and crawl everything again.")
+    args = parser.parse_args()
+
+    leagues = [("football", league) for league in LEAGUES] + [("tennis", league) for league in TENNIS_LEAGUES]
+    jobs = [
+        (sport, league, season)
+        for sport, league in leagues
+        if (args.sport is None or sport == args.sport) and (args.league is None or league in args.league)
+        for season in seasons(sport, args.first_year, args.last_year)
+    ]
+
+    logging.basicConfig(level=logging.INFO)
+    app = create_app()
+    with app.app_context():
+        if args.restart:
+            for sport, league, season in jobs:
+                clear_checkpoint(app.redis_client, league_urls(sport, league)[2], season)
+        logger.info(f"Backfilling {len(jobs)} seasons with {args.concurrency} pages at once.")
+        asyncio.run(Backfill(app, args.concurrency).run(jobs))
+
+
+if __name__ == "__main__":
+    main()
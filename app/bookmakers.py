@@ -0,0 +1,201 @@
+from flask import current_app
+from app.browser import open_page
+from app.constants import BOOKMAKER_CACHE_TTL, BOOKMAKER_CONCURRENCY
+from app.records import parse_odd
+from app.rate_limit import wait_for_slot
+from app.page_selectors import SelectorDrift, probe_selector
+from app.metrics import timed, scrape_labels
+from app.scheduler import hold_detail_pages, release_detail_pages
+import statistics
+import asyncio
+import json
+
+# Bookmaker table on the match detail page: one row per bookmaker with its
+# name and the 1X2 (or home/away) odds in listing order. The row selector is
+# probed from SELECTORS["bookmaker_row"] in app/page_selectors.py.
+BOOKMAKER_NAME_SELECTOR = 'p[data-testid="outrights-expanded-bookmaker-name"]'
+BOOKMAKER_ODDS_SELECTOR = 'div[data-testid="odd-container"] p'
+
+
+def _outcomes(count):
+    return ("home", "draw", "away") if count == 3 else ("home", "away")
+
+
+def summarize_bookmakers(bookmakers):
+    """
+    Compute the best price and the consensus odds over all bookmakers.
+
+    The consensus removes each bookmaker's margin, takes the median fair
+    probability per outcome and converts it back to decimal odds.
+
+    Args:
+        bookmakers (dict): Bookmaker name to {outcome: odd}.
+
+    Returns:
+        dict: "best" ({outcome: {"odd", "bookmaker"}}), "consensus"
+        ({outcome: odd}) and "count" (number of bookmakers).
+    """
+    best = {}
+    fair = {}
+    for name, odds in bookmakers.items():
+        for outcome, odd in odds.items():
+            if outcome not in best or odd > best[outcome]["odd"]:
+                best[outcome] = {"odd": odd, "bookmaker": name}
+
+        overround = sum(1 / odd for odd in odds.values())
+        for outcome, odd in odds.items():
+            fair.setdefault(outcome, []).append(1 / odd / overround)
+
+    consensus = {outcome: round(1 / statistics.median(probabilities), 2) for outcome, probabilities in fair.items()}
+    return {"best": best, "consensus": consensus, "count": len(bookmakers)}
+
+
+async def fetch_bookmaker_odds_async(page, match_url):
+    """
+    Scrape the odds of every bookmaker from a match detail page.
+
+    Args:
+        page (Page): Open Playwright page to navigate with.
+        match_url (str): URL of the match detail page.
+
+    Returns:
+        dict: Bookmaker name to {outcome: odd}.
+
+    Raises:
+        SelectorDrift: If the bookmaker table cannot be found on the page.
+    """
+    app = current_app._get_current_object()
+    bookmakers = {}
+
+    await wait_for_slot(match_url)
+    with timed("navigation", page="bookmaker"):
+        await page.goto(match_url, timeout=30000)
+    with timed("selector_wait", page="bookmaker"):
+        rows = page.locator(await probe_selector(page, "bookmaker_row", match_url))
+
+    for i in range(await rows.count()):
+        try:
+            row = rows.nth(i)
+            name = (await row.locator(BOOKMAKER_NAME_SELECTOR).first.text_content(timeout=1000)).strip()
+            cells = row.locator(BOOKMAKER_ODDS_SELECTOR)
+            odds = [parse_odd(await cells.nth(j).text_content(timeout=1000)) for j in range(await cells.count())]
+            if len(odds) not in (2, 3) or None in odds:
+                continue  # Suspended or incomplete line
+            bookmakers[name] = dict(zip(_outcomes(len(odds)), odds))
+        except Exception as e:
+            app.logger.debug(f"Skipping bookmaker row {i} on {match_url}: {e}")
+            continue
+
+    return bookmakers
+
+
+async def enrich_with_bookmakers(matches, concurrency=BOOKMAKER_CONCURRENCY):
+    """
+    Attach per-bookmaker best price and consensus odds to listed matches.
+
+    Every match page is cached under "bookmakers:<url>" together with the
+    listing odds it was scraped for. A match is only scraped again when its
+    listing odds moved or its cache entry expired; until then, and if the new
+    scrape fails or finds no bookmakers, it keeps the cached summary. At most
+    `concurrency` pages are open at the same time, and within a scheduled
+    refresh they count against SCHEDULER_PAGE_BUDGET.
+
+    Args:
+        matches (list): Match records with a url, as returned by a fetcher.
+        concurrency (int): Maximum number of pages scraped in parallel.
+
+    Returns:
+        list: The same matches with their bookmakers attribute set.
+    """
+    app = current_app._get_current_object()
+    redis_client = app.redis_client
+    linked = [match for match in matches if match.url]
+    if not linked:
+        return matches
+
+    cache_keys = [f"bookmakers:{match.url}" for match in linked]
+    cached = await asyncio.to_thread(redis_client.mget, cache_keys)
+
+    stale = []
+    for match, blob in zip(linked, cached):
+        listing_odds = [match.odds.home, match.odds.draw, match.odds.away]
+        entry = json.loads(blob.decode("utf-8")) if blob else None
+        if entry:
+            match.bookmakers = entry["summary"]  # Also the fallback if the refetch fails
+        if not entry or entry["listing_odds"] != listing_odds:
+            stale.append(match)
+
+    app.logger.info(f"Bookmaker odds: {len(linked) - len(stale)} cached, {len(stale)} to fetch.")
+    if not stale:
+        return matches
+
+    queue = asyncio.Queue()
+    for match in stale:
+        queue.put_nowait(match)
+    fetched = {}
+    drifted = []
+
+    async def worker():
+        # Each worker keeps one page open and reuses it for its share of matches
+        async with open_page(app) as page:
+            while not queue.empty():
+                match = queue.get_nowait()
+                try:
+                    bookmakers = await fetch_bookmaker_odds_async(page, match.url)
+                    if bookmakers:
+                        match.bookmakers = summarize_bookmakers(bookmakers)
+                        fetched[f"bookmakers:{match.url}"] = json.dumps({
+                            "listing_odds": [match.odds.home, match.odds.draw, match.odds.away],
+                            "summary": match.bookmakers,
+                        })
+                except SelectorDrift as e:
+                    app.logger.error(f"Error fetching bookmaker odds for {match.url}: {e}")
+                    drifted.append(match.url)
+                    if len(drifted) >= 2 and not fetched:
+                        # Match pages share their layout, so the rest would fail the same way
+                        app.logger.error("Bookmaker table not found on any match page, skipping the rest.")
+                        while not queue.empty():
+                            queue.get_nowait()
+                except Exception as e:
+                    app.logger.error(f"Error fetching bookmaker odds for {match.url}: {e}")
+
+    # Detail pages come on top of the listing pages the scheduler counted for this refresh
+    labels = scrape_labels.get()
+    pages = min(concurrency, len(stale))
+    if labels["league"]:
+        pages = await asyncio.to_thread(hold_detail_pages, redis_client, labels["sport"], labels["league"], pages)
+    try:
+        await asyncio.gather(*(worker() for _ in range(pages)))
+    finally:
+        if labels["league"]:
+            await asyncio.to_thread(release_detail_pages, redis_client, labels["sport"], labels["league"])
+
+    if fetched:
+        def write_cache():
+            pipe = redis_client.pipeline(transaction=False)
+            for key, value in fetched.items():
+                pipe.set(key, value, ex=BOOKMAKER_CACHE_TTL)
+            pipe.execute()
+
+        await asyncio.to_thread(write_cache)
+
+    return matches
+
+
+async def fetch_with_bookmakers(fetch_func, *fetch_args):
+    """
+    Run a listing fetcher and enrich its matches with per-bookmaker odds.
+
+    Used as the fetch_func of fetch_matches_and_cache in deep mode.
+
+    Args:
+        fetch_func (callable): Async listing fetcher (e.g., fetch_football_matches_async).
+        *fetch_args: Arguments to pass to the fetch_func.
+
+    Returns:
+        list: Match records with their bookmakers attribute set where available.
+    """
+    matches = await fetch_func(*fetch_args)
+    if matches:
+        await enrich_with_bookmakers(matches)
+    return matches
@@ -1,21 +1,91 @@
 from playwright.async_api import async_playwright
+from app.sharding import node_id
+from app.browser_profile import browser_profile, restore_state
+from app.constants import BROWSER_DISK_CACHE_MB
+from contextlib import asynccontextmanager
+import asyncio
+import os
+import time
+
+def _launch_lock(app):
+    """The lock serializing browser launches of an app, bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    if getattr(app, "_browser_launch_loop", None) is not loop:
+        app._browser_launch_loop = loop
+        app._browser_launch_lock = asyncio.Lock()
+    return app._browser_launch_lock
+
 
 async def get_browser(app):
-    """Get or create a shared Playwright browser instance."""
-    if not hasattr(app, "_playwright_browser"):
-        app._playwright_context = await async_playwright().start()
-        app._playwright_browser = await app._playwright_context.chromium.launch(
+    """
+    Get or create a shared Playwright browser instance.
+
+    Launches hold a lock stored on the app, so callers that find no browser at
+    the same time (e.g., pages waiting for a recycle, or the first pages of a
+    backfill) share one launch instead of each starting Chromium.
+
+    With BROWSER_PROFILE_DIR set, the browser is a persistent context on this
+    process's profile (app/browser_profile.py), so its disk cache and cookies
+    outlive the browser; a new profile starts from the shared storage state.
+    Both kinds have new_page() and close().
+    """
+    if hasattr(app, "_playwright_browser"):
+        return app._playwright_browser
+    async with _launch_lock(app):
+        if not hasattr(app, "_playwright_browser"):
+            playwright = await async_playwright().start()
+            try:
+                app._playwright_browser = await _launch(app, playwright)
+            except BaseException:
+                await playwright.stop()
+                raise
+            app._playwright_context = playwright
+            app.logger.info("Browser instance created.")
+    return app._playwright_browser
+
+
+async def _launch(app, playwright):
+    profile = browser_profile(app)
+    if profile is None:
+        return await playwright.chromium.launch(
             headless=True,
             args=["--disable-dev-shm-usage"],
         )
-        app.logger.info("Browser instance created.")
-    return app._playwright_browser
+
+    user_data_dir, fresh = await asyncio.to_thread(profile.prepare)
+    context = await playwright.chromium.launch_persistent_context(
+        user_data_dir,
+        headless=True,
+        args=["--disable-dev-shm-usage", f"--disk-cache-size={BROWSER_DISK_CACHE_MB * 2**20}"],
+    )
+    for page in context.pages:
+        await page.close()  # The blank start page would count as leaked
+    state = await asyncio.to_thread(profile.load_state) if fresh else None
+    if state:
+        await restore_state(context, state)
+    app.logger.info(f"Using browser profile {user_data_dir}{' (new)' if fresh else ''}.")
+    return context
+
+
+def open_browser_pages(browser):
+    """Pages open in a browser or persistent context."""
+    contexts = getattr(browser, "contexts", None)
+    if contexts is None:
+        return len(browser.pages)
+    return sum(len(context.pages) for context in contexts)
 
 
 async def close_browser(app):
-    """Close the shared Playwright browser instance."""
+    """Close the shared Playwright browser instance, saving its storage state if it has a profile."""
     if hasattr(app, "_playwright_browser"):
         try:
+            profile = browser_profile(app)
+            if profile is not None:
+                try:
+                    state = await app._playwright_browser.storage_state()
+                    await asyncio.to_thread(profile.save_state, state)
+                except Exception as e:
+                    app.logger.warning(f"Could not save the browser storage state: {e}")
             await app._playwright_browser.close()
             await app._playwright_context.stop()
             app.logger.info("Browser instance closed.")
@@ -24,3 +94,196 @@ async def close_browser(app):
         finally:
             del app._playwright_browser
             del app._playwright_context
+            page_tracker(app).browser_closed()
+
+
+class PageTracker:
+    """
+    Open pages of the shared browser, by owner, and when to recycle it.
+
+    Chromium's renderer memory grows with every page a browser has served, so
+    the browser is relaunched once it has opened BROWSER_MAX_PAGES pages or its
+    processes use more than BROWSER_MAX_RSS_MB. Pages opened outside
+    open_page, or never closed, show up as untracked (leaked) pages.
+    """
+
+    def __init__(self):
+        self.pages = {}  # Page -> (owner, opened at)
+        self.launch_pages = 0  # Pages opened since the browser was launched
+        self.opened = 0
+        self.closed = 0
+        self.recycles = 0
+        self.untracked = 0
+        self.rss = None
+        self.opening = 0  # open_page calls waiting for their page
+        self.recycle_pending = False
+        self.recycling = False
+
+    def browser_closed(self):
+        self.launch_pages = 0
+        self.recycle_pending = False
+        self.recycling = False
+        self.untracked = 0
+
+    def idle(self):
+        return not self.pages and not self.opening and not self.recycling
+
+    def by_owner(self):
+        """Number of open pages per owner."""
+        owners = {}
+        for owner, _ in self.pages.values():
+            owners[owner] = owners.get(owner, 0) + 1
+        return owners
+
+    def stats(self):
+        """Counters and gauges of the page lifecycle, for monitoring."""
+        now = time.monotonic()
+        return {
+            "open_pages": len(self.pages),
+            "untracked_pages": self.untracked,
+            "oldest_page_seconds": round(max((now - opened for _, opened in self.pages.values()), default=0), 1),
+            "pages_opened_total": self.opened,
+            "pages_closed_total": self.closed,
+            "recycles_total": self.recycles,
+            "rss_bytes": self.rss or 0,
+        }
+
+
+def page_tracker(app):
+    """The PageTracker of an app, created on first use."""
+    if not hasattr(app, "_page_tracker"):
+        app._page_tracker = PageTracker()
+    return app._page_tracker
+
+
+def publish_browser_stats(redis_client, stats, node=None):
+    """Store a node's page lifecycle stats under "browser_stats:<node>" for monitoring."""
+    key = f"browser_stats:{node or node_id()}"
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hset(key, mapping=stats)
+    pipe.expire(key, 10 * 60)
+    pipe.execute()
+
+
+def browser_rss():
+    """
+    Resident memory of the browser, in bytes.
+
+    Sums VmRSS over every descendant process of this one (the Playwright
+    driver and all Chromium processes). Only available on Linux.
+
+    Returns:
+        int | None: Resident bytes, or None if /proc is not available.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+
+    parents = {}
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                # The command name may contain spaces, the parent pid follows it
+                parents[int(pid)] = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+
+    descendants, frontier = set(), {os.getpid()}
+    while frontier:
+        frontier = {pid for pid, parent in parents.items() if parent in frontier} - descendants
+        descendants |= frontier
+
+    rss = 0
+    for pid in descendants:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        rss += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return rss
+
+
+async def _after_page_closed(app, tracker):
+    """Sample memory and leaks, then recycle the browser if it is due and idle."""
+    browser = getattr(app, "_playwright_browser", None)
+    if browser is None:
+        return
+
+    tracker.rss = await asyncio.to_thread(browser_rss)
+    open_in_browser = open_browser_pages(browser)
+    tracker.untracked = max(0, open_in_browser - len(tracker.pages) - tracker.opening)
+    if tracker.untracked:
+        app.logger.warning(f"{tracker.untracked} browser pages were opened outside open_page or never closed.")
+
+    try:
+        await asyncio.to_thread(publish_browser_stats, app.redis_client, tracker.stats())
+    except Exception as e:
+        app.logger.warning(f"Could not publish browser stats: {e}")
+
+    max_rss = app.config["BROWSER_MAX_RSS_MB"] * 1024 * 1024
+    if tracker.launch_pages >= app.config["BROWSER_MAX_PAGES"] or (tracker.rss or 0) > max_rss:
+        tracker.recycle_pending = True
+
+    if tracker.recycle_pending and tracker.idle():
+        await _recycle(app, tracker)
+
+
+async def _recycle(app, tracker):
+    tracker.recycling = True
+    tracker.recycles += 1
+    app.logger.info(
+        f"Recycling browser after {tracker.launch_pages} pages at {(tracker.rss or 0) // 2**20} MB resident."
+    )
+    await close_browser(app)
+
+
+@asynccontextmanager
+async def open_page(app, owner=None):
+    """
+    Open a page of the shared browser and close it when the block exits.
+
+    Every page is tracked under its owner (the current asyncio task by
+    default). When the browser is due for recycling, new pages wait until the
+    open ones are closed and then get a freshly launched browser.
+
+    Args:
+        app (Flask): Flask application holding the shared browser.
+        owner (str, optional): Name the page is tracked under.
+
+    Yields:
+        Page: The open Playwright page.
+    """
+    tracker = page_tracker(app)
+    while tracker.recycle_pending:
+        if tracker.idle():
+            await _recycle(app, tracker)
+        else:
+            await asyncio.sleep(0.1)
+
+    if owner is None:
+        task = asyncio.current_task()
+        owner = task.get_name() if task else "main"
+
+    tracker.opening += 1
+    try:
+        browser = await get_browser(app)
+        page = await browser.new_page()
+    finally:
+        tracker.opening -= 1
+    tracker.pages[page] = (owner, time.monotonic())
+    tracker.launch_pages += 1
+    tracker.opened += 1
+    try:
+        yield page
+    finally:
+        del tracker.pages[page]
+        tracker.closed += 1
+        try:
+            await page.close()
+        except Exception as e:
+            app.logger.error(f"Error closing page of {owner}: {e}")
+        await _after_page_closed(app, tracker)
@@ -0,0 +1,164 @@
+from app.constants import BROWSER_PROFILE_VERSION, BROWSER_PROFILE_MAX_AGE
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Persistent Chromium profiles, so repeat page loads hit the browser's disk
+# cache and consent cookies survive relaunches. Layout under BROWSER_PROFILE_DIR:
+#   v<version>/profile-<n>/            user data dir of one process (Chromium allows one user per dir),
+#                                      held with an flock on profile-<n>.lock while the process runs
+#   v<version>/profile-<n>/.created    time the profile was created; it is wiped after BROWSER_PROFILE_MAX_AGE
+#   v<version>/storage_state.json      cookies and localStorage saved by the last browser to close,
+#                                      copied into every new profile (shared by all workers on the volume)
+# Bumping BROWSER_PROFILE_VERSION starts every worker from new profiles; the
+# directories of other versions are removed once no process holds them.
+STATE_FILE = "storage_state.json"
+
+RESTORE_LOCAL_STORAGE_SCRIPT = """
+(origins => {
+    const items = origins[location.origin];
+    if (!items) return;
+    for (const [name, value] of Object.entries(items)) {
+        if (localStorage.getItem(name) === null) localStorage.setItem(name, value);
+    }
+})(%s);
+"""
+
+
+def _try_lock(path):
+    """Open and exclusively lock a file without waiting; None if another process holds it."""
+    handle = open(path, "a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return handle
+    except OSError:
+        handle.close()
+        return None
+
+
+class BrowserProfile:
+    """
+    The persistent profile directory of this process.
+
+    A free profile-<n> slot is locked on first use and kept for the life of
+    the process, so a worker that relaunches its browser (after every Celery
+    task, or when the browser is recycled) finds its own cache again.
+    """
+
+    def __init__(self, root, version=BROWSER_PROFILE_VERSION, max_age=BROWSER_PROFILE_MAX_AGE):
+        self.root = root
+        self.directory = os.path.join(root, f"v{version}")
+        self.max_age = max_age
+        self.path = None
+        self._lock = None
+        self._acquire_lock = threading.Lock()
+
+    def _acquire(self):
+        """Lock a free slot once; later and concurrent calls keep the slot already held."""
+        with self._acquire_lock:
+            if self.path is not None:
+                return False
+            os.makedirs(self.directory, exist_ok=True)
+            slot = 0
+            while True:
+                lock = _try_lock(os.path.join(self.directory, f"profile-{slot}.lock"))
+                if lock:
+                    self._lock = lock
+                    self.path = os.path.join(self.directory, f"profile-{slot}")
+                    return True
+                slot += 1
+
+    def _remove_old_versions(self):
+        for name in os.listdir(self.root):
+            directory = os.path.join(self.root, name)
+            if not name.startswith("v") or directory == self.directory or not os.path.isdir(directory):
+                continue
+            locks = [os.path.join(directory, lock) for lock in os.listdir(directory) if lock.endswith(".lock")]
+            held = [_try_lock(lock) for lock in locks]
+            try:
+                if all(held):
+                    shutil.rmtree(directory, ignore_errors=True)
+                    logger.info(f"Removed browser profiles of old version {name}.")
+            finally:
+                for handle in held:
+                    if handle:
+                        handle.close()
+
+    def prepare(self, now=None):
+        """
+        The user data dir for the next browser launch, wiped first if it is too old.
+
+        Must only be called while no browser uses the profile.
+
+        Returns:
+            tuple: (path, True if the profile is new and needs the shared storage state)
+        """
+        now = now or time.time()
+        if self._acquire():
+            try:
+                self._remove_old_versions()
+            except OSError as e:
+                logger.warning(f"Could not remove old browser profiles: {e}")
+
+        marker = os.path.join(self.path, ".created")
+        try:
+            with open(marker) as f:
+                created = float(f.read())
+        except (OSError, ValueError):
+            created = None
+        if created is not None and now - created < self.max_age:
+            return self.path, False
+
+        if created is not None:
+            logger.info(f"Resetting browser profile {self.path} after {(now - created) / 3600:.0f} hours.")
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path)
+        with open(marker, "w") as f:
+            f.write(str(now))
+        return self.path, True
+
+    def load_state(self, now=None):
+        """Shared storage state (Playwright format), or None if there is none or it is too old."""
+        path = os.path.join(self.directory, STATE_FILE)
+        try:
+            if (now or time.time()) - os.path.getmtime(path) >= self.max_age:
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_state(self, state):
+        """Replace the shared storage state atomically."""
+        path = os.path.join(self.directory, STATE_FILE)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+
+def browser_profile(app):
+    """The BrowserProfile of an app, or None if BROWSER_PROFILE_DIR is not set."""
+    if not app.config["BROWSER_PROFILE_DIR"]:
+        return None
+    if not hasattr(app, "_browser_profile"):
+        app._browser_profile = BrowserProfile(app.config["BROWSER_PROFILE_DIR"])
+    return app._browser_profile
+
+
+async def restore_state(context, state):
+    """Copy saved cookies and localStorage (e.g., cookie consent) into a browser context."""
+    if state.get("cookies"):
+        await context.add_cookies(state["cookies"])
+    origins = {
+        origin["origin"]: {item["name"]: item["value"] for item in origin.get("localStorage", [])}
+        for origin in state.get("origins", [])
+    }
+    if origins:
+        await context.add_init_script(RESTORE_LOCAL_STORAGE_SCRIPT % json.dumps(origins))
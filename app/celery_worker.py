@@ -1,9 +1,17 @@
 from app import create_app
+from app.constants import SHARD_HEARTBEAT_INTERVAL
+from app.degraded import warm_cache, snapshot_dir
+from app.sharding import PRIORITIES, node_id, shard_queue, heartbeat, leave
+from app.tracing import start_span
 from celery import Celery
+from celery.signals import worker_init, worker_ready, worker_shutdown
 import nest_asyncio
+import threading
+import logging
 import os
 
 nest_asyncio.apply()
+logger = logging.getLogger(__name__)
 
 def create_celery_app(app=None):
     """Create and configure a Celery application instance."""
@@ -22,9 +30,13 @@ def create_celery_app(app=None):
         include=["app.tasks"],  
     )
 
+    # Workers consume their queues in the order given to -Q, so queued
+    # interactive refreshes always run before queued background ones
+    celery.conf.update(broker_transport_options={"queue_order_strategy": "priority"})
+
     if redis_url.startswith("rediss://"):
         celery.conf.update(
-            broker_transport_options={"ssl": ssl_config},
+            broker_transport_options={"ssl": ssl_config, "queue_order_strategy": "priority"},
             redis_backend_transport_options={"ssl": ssl_config},
         )
 
@@ -35,6 +47,16 @@ def create_celery_app(app=None):
         "result_serializer": "json",
         "timezone": "UTC",
         "enable_utc": True,
+        "task_default_queue": "background",
+        "task_acks_late": True,
+        "worker_prefetch_multiplier": 1,  # Don't hold background jobs while interactive ones wait
+        "task_routes": {"app.tasks.schedule_refreshes": {"queue": "interactive"}},  # Cheap, must not wait
+        "beat_schedule": {
+            "schedule-refreshes": {
+                "task": "app.tasks.schedule_refreshes",
+                "schedule": 60.0,  # The scheduler decides per league whether a refresh is due
+            },
+        },
     })
 
     if app:
@@ -44,7 +66,9 @@ def create_celery_app(app=None):
             abstract = True
 
             def __call__(self, *args, **kwargs):
-                with app.app_context():
+                # Continue the trace of the request that queued the task, if any
+                parent = getattr(self.request, "traceparent", None) or (self.request.headers or {}).get("traceparent")
+                with app.app_context(), start_span(f"celery {self.name}", parent, args=repr(args)):
                     return super().__call__(*args, **kwargs)
 
         celery.Task = ContextTask
@@ -54,3 +78,68 @@ def create_celery_app(app=None):
 # Create Flask app and integrate with Celery
 flask_app = create_app()
 celery = create_celery_app(flask_app)
+
+
+# League sharding: every worker node also consumes its own shard queue, served
+# right before the shared queue of the same priority, and heartbeats so that
+# app/sharding.py routes its leagues to it while it is alive.
+_heartbeat_stop = threading.Event()
+
+
+@worker_init.connect
+def add_shard_queues(sender=None, **kwargs):
+    """
+    Subscribe this node's shard queues, each in front of the shared queue of the same priority.
+
+    Runs after the worker selected the queues given to -Q, and re-selects them
+    in serving order; changing the options of celeryd_init has no effect, as
+    Celery passes that signal a copy of them.
+    """
+    queues = sender.app.amqp.queues
+    selected = list(queues.consume_from or ["interactive", "background"])
+    node = node_id()
+    queues.select([
+        name
+        for queue in selected
+        for name in ([shard_queue(node, queue), queue] if queue in PRIORITIES else [queue])
+    ])
+    logger.info(f"Consuming {', '.join(queues.consume_from)}.")
+
+
+@worker_ready.connect
+def warm_from_snapshots(**kwargs):
+    """Put back leagues that Redis lost (e.g., after a restart) from their on-disk snapshots, and refresh them."""
+    from app.jobs import refresh_warmed
+
+    try:
+        warmed = warm_cache(flask_app.redis_client, snapshot_dir(flask_app))
+        if warmed:
+            logger.info(f"Warmed {len(warmed)} leagues from their snapshots, refreshing them.")
+            with flask_app.app_context():
+                refresh_warmed(warmed)
+    except Exception as e:
+        logger.error(f"Error warming Redis from snapshots: {e}")
+
+
+@worker_ready.connect
+def start_heartbeat(**kwargs):
+    def beat():
+        while not _heartbeat_stop.is_set():
+            try:
+                dead = heartbeat(flask_app.redis_client)
+                if dead:
+                    logger.info(f"Worker nodes {dead} stopped heartbeating, their leagues were reassigned.")
+            except Exception as e:
+                logger.error(f"Error sending heartbeat: {e}")
+            _heartbeat_stop.wait(SHARD_HEARTBEAT_INTERVAL)
+
+    threading.Thread(target=beat, name="shard-heartbeat", daemon=True).start()
+
+
+@worker_shutdown.connect
+def stop_heartbeat(**kwargs):
+    _heartbeat_stop.set()
+    try:
+        leave(flask_app.redis_client)
+    except Exception as e:
+        logger.error(f"Error leaving the shard ring: {e}")
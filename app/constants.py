@@ -37,3 +37,116 @@ AUSTRALIAN_OPEN_SCHEDULE = {
     "Semifinals": {"start": "2025-01-23", "end": "2025-01-24"},
     "Finals": {"start": "2025-01-25", "end": "2025-01-26"},
 }
+
+# Scorito points per round, indexed by player category (A, B, C, D)
+ROUND_POINTS = {
+    "Quarterfinals": [240, 400, 560, 720],
+    "Semifinals": [320, 480, 640, 800],
+    "Finals": [400, 560, 720, 800],
+}
+
+# Tennis draw (standings page) caching
+TENNIS_DRAW_TTL = 6 * 60 * 60  # The bracket only changes once per round
+
+# Draw columns are named from the final backwards so any draw size maps exactly
+DRAW_FINAL_ROUNDS = ["Quarterfinals", "Semifinals", "Finals"]
+DRAW_EARLY_ROUNDS = ["First Round", "Second Round", "Third Round", "Fourth Round"]
+
+# Odds history (seconds)
+ODDS_HISTORY_RETENTION = 14 * 24 * 60 * 60  # Drop snapshots older than two weeks
+ODDS_HISTORY_FULL_RESOLUTION = 6 * 60 * 60  # Keep every snapshot for six hours
+ODDS_HISTORY_BUCKET = 60 * 60  # Then keep one snapshot per hour
+ODDS_HISTORY_MAXLEN = 2000  # Hard cap on snapshots per match
+
+# Football scoreline model
+SCORELINE_MAX_GOALS = 15  # Goals per team in the scoreline grid, renormalised over its truncated mass
+SCORELINE_MIN_RATE = 0.01  # Bounds of the fitted goal rates
+SCORELINE_MAX_RATE = 10.0
+SCORELINE_COVARIANCE = 0.1  # Shared goal rate of the bivariate Poisson model
+SCORELINE_POINTS = {
+    "outcome": 60,  # Correct home win / draw / away win
+    "exact": 30,  # Bonus for the exact score
+}
+
+# Per-bookmaker odds (deep mode)
+BOOKMAKER_CACHE_TTL = 30 * 60  # Seconds a match page stays valid if its listing odds don't move
+BOOKMAKER_CONCURRENCY = 4  # Match pages scraped in parallel
+
+# Live odds watcher
+LIVE_DEBOUNCE_MS = 250  # Batch DOM changes before sending them to Python
+LIVE_RELOAD_INTERVAL = 15 * 60  # Seconds between full page reloads
+LIVE_PUBLISH_ATTEMPTS = 3  # Re-reads of a league whose version changed while a live batch was patched
+
+# Adaptive refresh scheduler (seconds)
+SCHEDULER_PAGE_BUDGET = 4  # Browser pages open at once across all workers
+SCHEDULER_INTERVALS = [  # By days until the next match: today, tomorrow, in two days, later
+    5 * 60,
+    15 * 60,
+    60 * 60,
+    3 * 60 * 60,
+]
+SCHEDULER_IDLE_INTERVAL = 12 * 60 * 60  # No upcoming matches
+SCHEDULER_RETRY_MAX_MULTIPLIER = 64  # Failed refreshes retry at the active interval, doubled per failure up to this
+SCHEDULER_VOLATILITY_WINDOW = 60 * 60  # Odds moved recently: refresh twice as often
+SCHEDULER_STALE_JOB = 15 * 60  # A refresh running longer than this is considered dead
+
+# Request rate limits per host: (bucket capacity, requests per second)
+RATE_LIMITS = {
+    "www.oddsportal.com": (5, 0.5),  # Bursts of 5, then one page every 2 seconds
+}
+DEFAULT_RATE_LIMIT = (10, 2.0)
+UNLIMITED_HOSTS = {"127.0.0.1", "localhost"}  # Local fixture servers (benchmarks/)
+
+# League sharding across worker nodes
+SHARD_HEARTBEAT_INTERVAL = 10  # Seconds between node heartbeats
+SHARD_HEARTBEAT_TIMEOUT = 30  # A node silent for longer is considered dead and its leagues move
+SHARD_VIRTUAL_NODES = 64  # Points per node on the hash ring, evens out the league split
+
+# Selector health checks and per-league circuit breaker
+SELECTOR_RENDER_TIMEOUT = 15000  # Milliseconds to wait for the page to render (a[title] or network idle)
+SELECTOR_PROBE_TIMEOUT = 1000  # Milliseconds to find the listing rows after the page rendered
+BREAKER_DRIFT_THRESHOLD = 3  # Consecutive selector drifts before a league's breaker opens
+BREAKER_BASE_COOLDOWN = 15 * 60  # Seconds before a league with broken selectors is retried
+BREAKER_MAX_COOLDOWN = 6 * 60 * 60  # The cooldown doubles per failed retry up to this
+
+# Degraded mode: Redis circuit breaker of the web tier and on-disk snapshots
+REDIS_BREAKER_THRESHOLD = 3  # Consecutive Redis failures before pages are served from snapshots
+REDIS_BREAKER_COOLDOWN = 30  # Seconds before Redis is tried again
+SNAPSHOT_WARM_TTL = 15 * 60  # Seconds a league copied back from its snapshot stays in Redis
+
+# Versioned league publication (app/publication.py)
+PUBLICATION_GRACE = 60  # Seconds a superseded version stays readable
+PUBLICATION_STAGING_TTL = 10 * 60  # Seconds a staged version lives if its batch is never committed
+
+# Materialized league views (app/league_views.py)
+VIEW_TOP_PICKS = 10  # Matches in a league's top picks
+SCORELINE_VIEW_TOP = 10  # Scorelines per match in a league's predictions; the most /predictions returns
+VALUE_BET_MIN_PROBABILITY = 0.4  # Market win chance that makes a lower-category player a value bet
+
+# Match tables (app/tables.py)
+TABLE_PAGE_SIZE = 50  # Matches per page by default
+TABLE_MAX_PAGE_SIZE = 500  # Largest ?per_page= accepted
+
+# Cross-league search (app/search.py)
+SEARCH_MIN_TOKEN = 2  # Shorter name parts (initials) are not indexed
+SEARCH_PREFIX_EXPANSION = 50  # Tokens a query word may expand to
+SEARCH_MAX_RESULTS = 50
+
+# SQL match history (app/persistence.py)
+SQL_BATCH_SIZE = 500  # Rows per multi-row INSERT
+
+# Historical results backfill (app/backfill.py)
+BACKFILL_CONCURRENCY = 4  # Results pages open at once
+BACKFILL_SEASONS = 5  # Past seasons crawled when no years are given
+
+# Plain-HTTP fetch tier (app/http_fetch.py)
+HTTP_TIMEOUT = 10  # Seconds to connect and to read a listing
+HTTP_POOL_SIZE = 10  # Keep-alive connections per host
+HTTP_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+HTTP_CACHE_TTL = 24 * 60 * 60  # Seconds the validators and last parse of a listing are kept
+FETCH_TIER_RECHECK = 24 * 60 * 60  # Seconds before a listing that needed the browser is tried over HTTP again
+
+# Persistent browser profiles (app/browser_profile.py)
+BROWSER_PROFILE_VERSION = 1  # Bump to start every worker from new profiles
+BROWSER_PROFILE_MAX_AGE = 7 * 24 * 60 * 60  # Seconds before a profile and the shared storage state are reset
+BROWSER_DISK_CACHE_MB = 256  # Chromium HTTP cache per profile
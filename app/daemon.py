@@ -0,0 +1,169 @@
+from app.browser import get_browser, close_browser
+from app.constants import SHARD_HEARTBEAT_INTERVAL
+from app.degraded import warm_cache, snapshot_dir
+from app.jobs import REFRESH_JOBS, job_queue_key, queue_daemon_job
+from app.scheduler import due_jobs
+from app.search import league_of
+from app.sharding import node_id, node_queues, heartbeat, leave
+from app.tracing import start_span
+import redis.asyncio as aioredis
+import asyncio
+import json
+import logging
+import os
+import signal
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_TICK = 60  # Seconds between checks for due league refreshes
+
+
+def create_async_redis():
+    """Create an asyncio Redis client with the same SSL handling as initialize_redis."""
+    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    ssl_options = {}
+    if redis_url.startswith("rediss://"):
+        ssl_options = {
+            "ssl_cert_reqs": "CERT_OPTIONAL",
+            "ssl_ca_certs": os.getenv("SSL_CERT_PATH", "/certificate.pem"),
+        }
+    return aioredis.from_url(redis_url, **ssl_options)
+
+
+class ScrapeDaemon:
+    """
+    Long-running scrape worker: one event loop, one browser, many jobs.
+
+    Unlike the Celery worker, which starts a new event loop and browser for
+    every task, the daemon keeps both alive and runs up to `concurrency` league
+    refreshes at once, so their network waits overlap. Jobs are popped only
+    when a slot is free, leaving the rest for other daemons, and the
+    interactive queues are always served before the background queues. Each
+    daemon is a node of the league shard ring: it serves its own shard queue
+    before the shared one of the same priority.
+    """
+
+    def __init__(self, app, concurrency, node=None):
+        self.app = app
+        self.concurrency = concurrency
+        self.node = node or node_id()
+        self.slots = asyncio.Semaphore(concurrency)
+        self.active = {}  # "sport:league" -> asyncio.Task
+        self.stopping = asyncio.Event()
+        self.completed = 0
+
+    def submit(self, sport, league, deep=None, traceparent=None):
+        """Start a refresh unless the same league is already running here."""
+        job = f"{sport}:{league}"
+        if job in self.active or sport not in REFRESH_JOBS:
+            self.slots.release()
+            return
+        task = asyncio.create_task(self._run(job, REFRESH_JOBS[sport](league, deep), traceparent))
+        self.active[job] = task
+
+    async def _run(self, job, refresh, traceparent=None):
+        try:
+            with start_span(f"daemon {job}", traceparent, node=self.node):
+                await refresh
+            self.completed += 1
+        except Exception as e:
+            logger.error(f"Error in daemon job {job}: {e}")
+        finally:
+            del self.active[job]
+            self.slots.release()
+
+    async def consume(self, redis_client):
+        """Pop jobs from the queues while slots are free."""
+        queue_keys = [job_queue_key(queue) for queue in node_queues(self.node)]
+        while not self.stopping.is_set():
+            await self.slots.acquire()
+            item = None
+            while item is None and not self.stopping.is_set():
+                # BRPOP checks the keys in order, which gives interactive jobs priority
+                item = await redis_client.brpop(queue_keys, timeout=1)
+            if item is None:
+                self.slots.release()
+                break
+            try:
+                job = json.loads(item[1])
+                self.submit(job["sport"], job["league"], job.get("deep"), job.get("traceparent"))
+            except (ValueError, KeyError) as e:
+                logger.error(f"Invalid job on {item[0]!r}: {item[1]!r} ({e})")
+                self.slots.release()
+
+    async def schedule(self):
+        """
+        Queue the league refreshes the adaptive scheduler marks as due.
+
+        Only with SCRAPE_BACKEND "daemon"; otherwise Celery beat schedules the
+        refreshes, and a second scheduler would split them between the backends.
+        """
+        if self.app.config["SCRAPE_BACKEND"] != "daemon":
+            logger.info("SCRAPE_BACKEND is not \"daemon\", leaving refresh scheduling to Celery beat.")
+            return
+        redis_client = self.app.redis_client
+        while not self.stopping.is_set():
+            try:
+                for sport, league in await asyncio.to_thread(due_jobs, redis_client):
+                    await asyncio.to_thread(queue_daemon_job, redis_client, sport, league)
+            except Exception as e:
+                logger.error(f"Error scheduling refreshes: {e}")
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=SCHEDULER_TICK)
+            except asyncio.TimeoutError:
+                pass
+
+    async def heartbeat(self):
+        """Keep this node on the shard ring and take over the leagues of dead nodes."""
+        while not self.stopping.is_set():
+            try:
+                dead = await asyncio.to_thread(heartbeat, self.app.redis_client, self.node)
+                if dead:
+                    logger.info(f"Worker nodes {dead} stopped heartbeating, their leagues were reassigned.")
+            except Exception as e:
+                logger.error(f"Error sending heartbeat: {e}")
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=SHARD_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+        await asyncio.to_thread(leave, self.app.redis_client, self.node)
+
+    async def run(self):
+        """Run until SIGTERM/SIGINT, then finish the running jobs and close the browser."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stopping.set)
+
+        redis_client = create_async_redis()
+        try:
+            warmed = await asyncio.to_thread(warm_cache, self.app.redis_client, snapshot_dir(self.app))
+            if warmed:
+                logger.info(f"Warmed {len(warmed)} leagues from their snapshots, refreshing them.")
+                for cache_key in warmed:
+                    await asyncio.to_thread(queue_daemon_job, self.app.redis_client, *league_of(cache_key))
+        except Exception as e:
+            logger.error(f"Error warming Redis from snapshots: {e}")
+        await get_browser(self.app)
+        logger.info(f"Scrape daemon {self.node} started with {self.concurrency} slots.")
+        try:
+            await asyncio.gather(self.consume(redis_client), self.schedule(), self.heartbeat())
+            if self.active:
+                await asyncio.gather(*self.active.values(), return_exceptions=True)
+        finally:
+            await close_browser(self.app)
+            await redis_client.aclose()
+            logger.info(f"Scrape daemon stopped after {self.completed} jobs.")
+
+
+def main():
+    """Entry point: python -m app.daemon"""
+    from app import create_app
+
+    logging.basicConfig(level=logging.INFO)
+    app = create_app()
+    with app.app_context():
+        asyncio.run(ScrapeDaemon(app, app.config["SCRAPE_DAEMON_CONCURRENCY"]).run())
+
+
+if __name__ == "__main__":
+    main()
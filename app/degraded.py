@@ -0,0 +1,212 @@
+from flask import g, has_request_context
+from redis.exceptions import RedisError
+from app.constants import REDIS_BREAKER_THRESHOLD, REDIS_BREAKER_COOLDOWN, SNAPSHOT_WARM_TTL
+from app.publication import publish_leagues, read_league, read_leagues
+from app.league_views import league_blobs
+from app.search import index_league
+import threading
+import tempfile
+import logging
+import json
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+# Degraded-mode serving: workers keep the last good blob of every league as a
+# file in SNAPSHOT_DIR (a volume shared with the web tier, or local disk), and
+# the web tier reads Redis through a circuit breaker with short socket
+# timeouts. While the breaker is open, or shortly after Redis lost a league
+# (e.g., a cold start), pages are served from the snapshot instead of hanging. A request
+# whose Redis call failed is marked (redis_failed_in_request), so it does not
+# go on to queue a refresh, which would block on the broker.
+
+
+class RedisUnavailable(Exception):
+    """Redis failed or the breaker is open; serve from the snapshot."""
+
+
+class RedisBreaker:
+    """
+    Circuit breaker around a Redis client.
+
+    After `threshold` consecutive failures the breaker opens and calls fail
+    immediately for `cooldown` seconds. The first call after the cooldown is
+    a trial: success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, redis_client, threshold=REDIS_BREAKER_THRESHOLD, cooldown=REDIS_BREAKER_COOLDOWN):
+        self.redis_client = redis_client
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+        self.lock = threading.Lock()
+
+    def available(self):
+        """Whether calls currently go to Redis."""
+        return time.monotonic() >= self.open_until
+
+    def call(self, func, *args, **kwargs):
+        """
+        Call a Redis function through the breaker.
+
+        Args:
+            func (callable): Function taking the Redis client first (e.g., read_league).
+            *args, **kwargs: Its other arguments.
+
+        Returns:
+            The result of the call.
+
+        Raises:
+            RedisUnavailable: If the breaker is open or the call failed.
+        """
+        if not self.available():
+            _mark_request()
+            raise RedisUnavailable(f"Redis breaker open for {self.open_until - time.monotonic():.0f}s")
+        try:
+            result = func(self.redis_client, *args, **kwargs)
+        except RedisError as e:
+            _mark_request()
+            with self.lock:
+                self.failures += 1
+                if self.failures >= self.threshold:
+                    self.open_until = time.monotonic() + self.cooldown
+                    logger.warning(f"Redis failed {self.failures} times ({e}), serving snapshots for {self.cooldown}s.")
+            raise RedisUnavailable(str(e)) from e
+        if self.failures:
+            with self.lock:
+                self.failures = 0
+        return result
+
+
+def _mark_request():
+    if has_request_context():
+        g.redis_unavailable = True
+
+
+def redis_failed_in_request():
+    """Whether a breaker call of the current request failed or found the breaker open."""
+    return has_request_context() and g.get("redis_unavailable", False)
+
+
+def snapshot_dir(app):
+    """The snapshot directory of the app, created on first use."""
+    directory = app.config.get("SNAPSHOT_DIR") or os.path.join(tempfile.gettempdir(), "oddsportal-snapshots")
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def write_snapshot(directory, cache_key, blob):
+    """
+    Atomically replace the snapshot of a league.
+
+    Readers see either the old or the new file, never a partial write.
+
+    Args:
+        directory (str): Snapshot directory.
+        cache_key (str): Redis key of the league (e.g., "matches_eredivisie").
+        blob (str | bytes): Cached JSON, as written to Redis.
+    """
+    if isinstance(blob, str):
+        blob = blob.encode("utf-8")
+    path = os.path.join(directory, f"{cache_key}.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+
+class SnapshotReader:
+    """
+    Read league snapshots, keeping each in memory until its file changes.
+
+    A snapshot is only read from disk again when the worker replaced it, so
+    serving from snapshots costs a stat() per request.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.cache = {}  # cache_key -> (mtime_ns, blob)
+
+    def read(self, cache_key):
+        """
+        Returns:
+            tuple | None: (blob, age in seconds), or None without a snapshot.
+        """
+        path = os.path.join(self.directory, f"{cache_key}.json")
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            cached = self.cache.get(cache_key)
+            if cached and cached[0] == mtime_ns:
+                blob = cached[1]
+            else:
+                with open(path, "rb") as f:
+                    blob = f.read()
+                self.cache[cache_key] = (mtime_ns, blob)
+        except OSError:
+            return None
+        return blob, time.time() - mtime_ns / 1e9
+
+
+def read_cache(app, cache_key):
+    """
+    Read a league from Redis, falling back to its snapshot.
+
+    The snapshot is used while the Redis breaker is open or Redis fails, so a
+    web process keeps serving through a Redis outage. When Redis is up but
+    does not have the league (a cold start before warming), the snapshot is
+    only used while it is younger than SNAPSHOT_WARM_TTL, as a warmed copy
+    would be; after a cache clear or with an old snapshot the league is
+    missing, and the caller queues a refresh.
+
+    Args:
+        app (Flask): Flask application with `redis_breaker` and `snapshots`.
+        cache_key (str): Redis key of the league.
+
+    Returns:
+        tuple: (blob or None, snapshot age in seconds or None if the blob came from Redis)
+    """
+    max_age = None
+    try:
+        blob = app.redis_breaker.call(read_league, cache_key)
+        if blob is not None:
+            return blob, None
+        max_age = SNAPSHOT_WARM_TTL
+    except RedisUnavailable as e:
+        logger.debug(f"Reading {cache_key} from its snapshot: {e}")
+
+    snapshot = app.snapshots.read(cache_key)
+    if snapshot is None or (max_age is not None and snapshot[1] > max_age):
+        return None, None
+    return snapshot
+
+
+def warm_cache(redis_client, directory, ttl=SNAPSHOT_WARM_TTL):
+    """
+    Copy snapshots of leagues missing from Redis back into it, e.g., after a Redis restart.
+
+    The warmed keys expire after `ttl` seconds. Their odds are as old as the
+    snapshots and the refresh schedule was lost with Redis, so callers queue
+    a refresh of every warmed league.
+
+    Args:
+        redis_client (Redis): Redis client.
+        directory (str): Snapshot directory.
+        ttl (int): Seconds before a warmed key expires.
+
+    Returns:
+        list: Cache keys of the leagues warmed.
+    """
+    cache_keys = [name[: -len(".json")] for name in os.listdir(directory) if name.endswith(".json")]
+    missing = [cache_key for cache_key, blob in zip(cache_keys, read_leagues(redis_client, cache_keys)) if blob is None]
+    blobs, leagues = {}, {}
+    for cache_key in missing:
+        with open(os.path.join(directory, f"{cache_key}.json"), "rb") as f:
+            blob = f.read()
+        leagues[cache_key] = json.loads(blob)
+        blobs.update(league_blobs(cache_key, leagues[cache_key], blob))
+    publish_leagues(redis_client, blobs, ttl=ttl)
+    for cache_key, matches in leagues.items():
+        index_league(redis_client, cache_key, matches)
+    return missing
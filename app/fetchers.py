@@ -1,114 +1,331 @@
 from app.player_ratings import PLAYER_RATINGS
 from flask import current_app
-from app.browser import get_browser
+from app.browser import get_browser, open_page
 from flask import current_app
 from datetime import datetime, timedelta
-from app.constants import AUSTRALIAN_OPEN_SCHEDULE
+from app.constants import (
+    AUSTRALIAN_OPEN_SCHEDULE,
+    ROUND_POINTS,
+    TENNIS_DRAW_TTL,
+    DRAW_FINAL_ROUNDS,
+    DRAW_EARLY_ROUNDS,
+)
+from app.rate_limit import wait_for_slot
+from app.page_selectors import SelectorDrift, probe_selector, resolve_listing_selectors, resolve_html_listing_selectors
+from app.metrics import timed, observe_stage, count_rows, inc
+from app.records import FootballMatch, TennisMatch, Odds, Categories, ExpectedPoints, parse_odd, to_cache, from_cache
+from app.http_fetch import get_listing, store_listing, use_http, record_tier
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+import asyncio
+import json
+import requests
+import time
+
+async def extract_match_url(row, league_url):
+    """
+    Extract the match detail link of a listing row.
+
+    Args:
+        row (Locator): Listing row containing the participant links.
+        league_url (str): URL of the league page, used to resolve relative links.
+
+    Returns:
+        str | None: Absolute URL of the match page, or None if the row has no link.
+    """
+    try:
+        link = row.locator('a[title]').nth(0).locator('xpath=ancestor::a[@href][1]')
+        if await link.count() == 0:
+            return None
+        return urljoin(league_url, await link.get_attribute("href", timeout=1000))
+    except Exception:
+        return None
+
+class PageRow:
+    """A listing row of a Playwright page, read the way parse_*_rows expect."""
+
+    def __init__(self, row, selectors):
+        self.row = row
+        self.selectors = selectors
+
+    async def date_text(self):
+        """Text of the row's date header, or None if it is not a date row."""
+        date = self.row.locator(self.selectors["date"])
+        if await date.count() == 0:
+            return None
+        return (await date.first.text_content(timeout=1000)).strip()
+
+    async def participants(self):
+        """Names of the teams or players of the row, home first."""
+        return await self.row.locator('a[title]').all_text_contents()
+
+    async def odds(self):
+        """Odds texts of the row, home first."""
+        return await self.row.locator(self.selectors["odds"]).all_text_contents()
+
+    async def match_url(self, league_url):
+        return await extract_match_url(self.row, league_url)
+
+class HtmlRow:
+    """A listing row of a page fetched over plain HTTP, with the same interface as PageRow."""
+
+    def __init__(self, row, selectors, league_url):
+        # Read everything up front, so the parsing stays off the event loop
+        date = row.select_one(selectors["date"])
+        self._date_text = date.get_text().strip() if date is not None else None
+        links = row.select('a[title]')
+        self._participants = [link.get_text() for link in links]
+        self._odds = [odd.get_text() for odd in row.select(selectors["odds"])]
+        link = links[0].find_parent("a", href=True) if links else None
+        self._url = urljoin(league_url, link["href"]) if link is not None else None
+
+    async def date_text(self):
+        return self._date_text
+
+    async def participants(self):
+        return self._participants
+
+    async def odds(self):
+        return self._odds
+
+    async def match_url(self, league_url):
+        return self._url
+
+async def page_rows(page, league_url):
+    """Rows of a listing loaded in a Playwright page, failing fast if the page layout changed."""
+    with timed("selector_wait"):
+        selectors = await resolve_listing_selectors(page, league_url)
+    rows = page.locator(selectors["row"])
+    return [PageRow(rows.nth(i), selectors) for i in range(await rows.count())]
+
+async def html_rows(html, league_url):
+    """
+    Rows of a listing fetched over plain HTTP.
+
+    Raises:
+        SelectorDrift: If the HTML holds no listing, e.g. because it is rendered client-side.
+    """
+    def read_rows():
+        soup = BeautifulSoup(html, "html.parser")
+        selectors = resolve_html_listing_selectors(soup, league_url)
+        return [HtmlRow(row, selectors, league_url) for row in soup.select(selectors["row"])]
+
+    with timed("html_parse"):
+        return await asyncio.to_thread(read_rows)
+
+async def fetch_listing_tiered(league_url, parse_rows, record_type, fetch_page):
+    """
+    Fetch a listing over plain HTTP when possible, otherwise in a browser page.
+
+    The HTTP tier parses the server-rendered HTML with the same row parser as
+    the browser tier, and answers unchanged listings (304) from their last
+    parse. A listing without matches in its HTML (rendered client-side, or
+    blocked) escalates to the browser, and the tier that succeeded is recorded
+    so the next refresh of that league skips the failing tier. The tier
+    records are best effort: without Redis, listings are tried over HTTP and
+    still fall back to the browser.
+
+    Args:
+        league_url (str): URL of the listing.
+        parse_rows (callable): parse_football_rows or parse_tennis_rows.
+        record_type (type): FootballMatch or TennisMatch.
+        fetch_page (callable): Browser fetcher taking the listing URL.
+
+    Returns:
+        list: Match records.
+    """
+    app = current_app._get_current_object()
+    redis_client = app.redis_client
+
+    try_http = app.config["HTTP_FAST_PATH"]
+    if try_http:
+        try:
+            try_http = await asyncio.to_thread(use_http, redis_client, league_url)
+        except Exception as e:
+            app.logger.warning(f"Fetch tier of {league_url} unavailable, trying HTTP: {e}")
+
+    if try_http:
+        day = datetime.now().strftime("%d-%m-%Y")
+        matches = []
+        try:
+            await wait_for_slot(league_url)
+            with timed("http_fetch"):
+                listing = await asyncio.to_thread(get_listing, app, league_url, day)
+            if listing.status == 304 and listing.blob:
+                matches = from_cache(listing.blob, record_type)
+                app.logger.info(f"Listing unchanged since its last parse: {league_url}")
+            elif listing.text:
+                matches = await parse_rows(await html_rows(listing.text, league_url), league_url)
+                if matches:
+                    await _record_listing(app, store_listing, league_url, listing, to_cache(matches), day)
+        except (requests.RequestException, SelectorDrift) as e:
+            app.logger.info(f"No listing over HTTP for {league_url}, using the browser: {e}")
+        if matches:
+            inc("scrape_fetch_tier_total", tier="http")
+            await _record_listing(app, record_tier, league_url, "http")
+            return matches
+
+    matches = await fetch_page(league_url)
+    if matches:
+        inc("scrape_fetch_tier_total", tier="browser")
+        await _record_listing(app, record_tier, league_url, "browser")
+    return matches
+
+async def _record_listing(app, record, league_url, *args):
+    """Run a Redis write of the fetch tiers (record_tier, store_listing), logging instead of failing the scrape."""
+    try:
+        await asyncio.to_thread(record, app.redis_client, league_url, *args)
+    except Exception as e:
+        app.logger.warning(f"Could not record the fetch tier of {league_url}: {e}")
 
 async def fetch_football_matches_async(league_url):
     """
-    Asynchronously fetch match details and odds for a specific league.
+    Fetch match details and odds for a specific league, over HTTP if the listing allows.
 
     Args:
         league_url (str): URL of the league page on OddsPortal.
 
     Returns:
-        list: List of dictionaries containing match details (team names, odds, date).
+        list: List of FootballMatch records (team names, odds, date).
     """
-    app = current_app._get_current_object()
-    browser = await get_browser(app)
-    all_matches = []
-    current_date = None
-    seen_matches = set()
+    return await fetch_listing_tiered(league_url, parse_football_rows, FootballMatch, fetch_football_page_async)
 
-    try:
-        page = await browser.new_page()
-        app.logger.info(f"Navigating to league: {league_url}")
-        await page.goto(league_url, timeout=30000)
-        app.logger.info("League page loaded successfully!")
-
-        # Wait for the match container rows
-        await page.wait_for_selector('div[data-v-b8d70024]', timeout=30000)
-        rows = page.locator('div[data-v-b8d70024]')
-        row_count = await rows.count()
-        app.logger.info(f"Found {row_count} rows.")
-
-        for i in range(row_count):
-            try:
-                row = rows.nth(i)
-
-                # Check if the row contains a date
-                if await row.locator('.text-black-main.font-main').count() > 0:
-                    date_text = (await row.locator('.text-black-main.font-main').first.text_content(timeout=1000)).strip()
-                    app.logger.debug(f"Extracted date text: {date_text}")
-
-                    # Handle "Today," "Tomorrow," or explicit dates
-                    if "Today" in date_text:
-                        current_date = datetime.now().strftime("%d-%m-%Y")
-                    elif "Tomorrow" in date_text:
-                        current_date = (datetime.now() + timedelta(days=1)).strftime("%d-%m-%Y")
-                    else:
-                        try:
-                            # Parse full dates or add the current year dynamically
-                            cleaned_date_text = date_text.split(",")[-1].strip()
-                            if len(cleaned_date_text.split()) == 2:  # e.g., "28 Jan"
-                                current_year = datetime.now().year
-                                cleaned_date_text += f" {current_year}"
-                            current_date = datetime.strptime(cleaned_date_text, "%d %b %Y").strftime("%d-%m-%Y")
-                        except ValueError as e:
-                            app.logger.error(f"Error parsing date: {date_text}, {e}")
-                            current_date = "Unknown"
-
-                    app.logger.debug(f"Set current_date to: {current_date}")
-                    continue  # Move to the next row
-
-                # Check if the row contains match data
-                if await row.locator('a[title]').count() > 0:
-                    home_team = await row.locator('a[title]').nth(0).text_content(timeout=1000)
-                    away_team = await row.locator('a[title]').nth(1).text_content(timeout=1000)
-
-                    # Create a unique match identifier
-                    match_id = f"{home_team.strip()} vs {away_team.strip()}"
-                    if match_id in seen_matches:
-                        app.logger.debug(f"Duplicate match found: {match_id}")
-                        continue
-                    seen_matches.add(match_id)
+async def fetch_football_page_async(league_url):
+    """
+    Asynchronously fetch match details and odds for a specific league in a browser page.
 
-                    # Extract odds
-                    odds = row.locator('div[data-v-34474325] p')
-                    if await odds.count() < 3:
-                        app.logger.warning(f"Skipping row at index {i}: Missing odds.")
-                        continue
+    Args:
+        league_url (str): URL of the league page on OddsPortal.
 
-                    home_odd = await odds.nth(0).text_content(timeout=1000)
-                    draw_odd = await odds.nth(1).text_content(timeout=1000)
-                    away_odd = await odds.nth(2).text_content(timeout=1000)
-
-                    # Add match details to the list
-                    match_data = {
-                        "date": current_date or "Unknown",
-                        "home_team": home_team.strip(),
-                        "away_team": away_team.strip(),
-                        "odds": {
-                            "home": home_odd.strip(),
-                            "draw": draw_odd.strip(),
-                            "away": away_odd.strip(),
-                        },
-                    }
-                    all_matches.append(match_data)
-                    app.logger.debug(f"Added match: {home_team.strip()} vs {away_team.strip()} on {current_date}")
-
-            except Exception as e:
-                app.logger.error(f"Error processing row at index {i}: {e}")
-                continue
-
-        app.logger.info(f"Extracted {len(all_matches)} matches.")
-        return all_matches
+    Returns:
+        list: List of FootballMatch records (team names, odds, date).
+    """
+    app = current_app._get_current_object()
 
+    try:
+        async with open_page(app) as page:
+            app.logger.info(f"Navigating to league: {league_url}")
+            await wait_for_slot(league_url)
+            with timed("navigation"):
+                await page.goto(league_url, timeout=30000)
+            app.logger.info("League page loaded successfully!")
+            return await parse_football_listing(page, league_url)
+
+    except SelectorDrift:
+        raise
     except Exception as e:
         app.logger.error(f"Error fetching matches: {e}")
         return []
 
+async def parse_football_listing(page, league_url):
+    """
+    Parse the match rows of a loaded football listing or results page.
+
+    Args:
+        page (Page): Playwright page with the listing loaded.
+        league_url (str): URL of the page, used to resolve match links.
+
+    Returns:
+        list: List of FootballMatch records (team names, odds, date).
+
+    Raises:
+        SelectorDrift: If the page layout changed.
+    """
+    return await parse_football_rows(await page_rows(page, league_url), league_url)
+
+async def parse_football_rows(rows, league_url):
+    """
+    Build football matches from the rows of a listing, in page order.
+
+    Args:
+        rows (list): PageRow or HtmlRow objects.
+        league_url (str): URL of the page, used to resolve match links.
+
+    Returns:
+        list: List of FootballMatch records (team names, odds, date).
+    """
+    app = current_app._get_current_object()
+    all_matches = []
+    current_date = None
+    seen_matches = set()
+    app.logger.info(f"Found {len(rows)} rows.")
+    extraction_start = time.perf_counter()
+    skipped = errored = 0
+
+    for i, row in enumerate(rows):
+        try:
+            # Check if the row contains a date
+            date_text = await row.date_text()
+            if date_text is not None:
+                app.logger.debug(f"Extracted date text: {date_text}")
+
+                # Handle "Today," "Tomorrow," or explicit dates
+                if "Today" in date_text:
+                    current_date = datetime.now().strftime("%d-%m-%Y")
+                elif "Tomorrow" in date_text:
+                    current_date = (datetime.now() + timedelta(days=1)).strftime("%d-%m-%Y")
+                else:
+                    try:
+                        # Parse full dates or add the current year dynamically
+                        cleaned_date_text = date_text.split(",")[-1].strip()
+                        if len(cleaned_date_text.split()) == 2:  # e.g., "28 Jan"
+                            current_year = datetime.now().year
+                            cleaned_date_text += f" {current_year}"
+                        current_date = datetime.strptime(cleaned_date_text, "%d %b %Y").strftime("%d-%m-%Y")
+                    except ValueError as e:
+                        app.logger.error(f"Error parsing date: {date_text}, {e}")
+                        current_date = "Unknown"
+
+                app.logger.debug(f"Set current_date to: {current_date}")
+                continue  # Move to the next row
+
+            # Check if the row contains match data
+            teams = await row.participants()
+            if teams:
+                home_team, away_team = teams[0], teams[1]
+
+                # Create a unique match identifier
+                match_id = f"{home_team.strip()} vs {away_team.strip()}"
+                if match_id in seen_matches:
+                    app.logger.debug(f"Duplicate match found: {match_id}")
+                    skipped += 1
+                    continue
+                seen_matches.add(match_id)
+
+                # Extract odds
+                odds = await row.odds()
+                if len(odds) < 3:
+                    app.logger.warning(f"Skipping row at index {i}: Missing odds.")
+                    skipped += 1
+                    continue
+
+                home_odd, draw_odd, away_odd = odds[:3]
+
+                # Add match details to the list, parsing the odds once here
+                match_data = FootballMatch(
+                    date=current_date or "Unknown",
+                    home_team=home_team.strip(),
+                    away_team=away_team.strip(),
+                    odds=Odds(
+                        home=parse_odd(home_odd.strip()),
+                        draw=parse_odd(draw_odd.strip()),
+                        away=parse_odd(away_odd.strip()),
+                    ),
+                    url=await row.match_url(league_url),
+                )
+                all_matches.append(match_data)
+                app.logger.debug(f"Added match: {home_team.strip()} vs {away_team.strip()} on {current_date}")
+
+        except Exception as e:
+            app.logger.error(f"Error processing row at index {i}: {e}")
+            errored += 1
+            continue
+
+    observe_stage("row_extraction", time.perf_counter() - extraction_start)
+    count_rows(parsed=len(all_matches), skipped=skipped, errored=errored)
+    app.logger.info(f"Extracted {len(all_matches)} matches.")
+    return all_matches
+
 def determine_round(match_date: str) -> str:
     """
     Determine the round of the Australian Open based on the match date.
@@ -144,163 +361,362 @@ def contains_score(name):
     """
     return bool(re.search(r'\d', name))
 
+def draw_key(home_player: str, away_player: str) -> str:
+    """
+    Build an order-independent key for a pairing of two players.
+
+    Args:
+        home_player (str): First player name.
+        away_player (str): Second player name.
+
+    Returns:
+        str: Key shared by "A vs B" and "B vs A".
+    """
+    return " vs ".join(sorted([home_player.strip(), away_player.strip()]))
+
+def draw_round_name(index: int, total: int) -> str:
+    """
+    Name a draw column, counting the final rounds from the end of the bracket.
+
+    Args:
+        index (int): Zero-based column index in the draw.
+        total (int): Number of columns in the draw.
+
+    Returns:
+        str: The round name used by the app (e.g., "First Round", "Finals").
+    """
+    from_end = total - index
+    if from_end <= len(DRAW_FINAL_ROUNDS):
+        return DRAW_FINAL_ROUNDS[-from_end]
+    if index < len(DRAW_EARLY_ROUNDS):
+        return DRAW_EARLY_ROUNDS[index]
+    return f"Round {index + 1}"
+
+def apply_round(match_data: TennisMatch, round_name: str) -> TennisMatch:
+    """
+    Set the round of a tennis match and (re)calculate its expected points.
+
+    Args:
+        match_data (TennisMatch): Match as built by fetch_tennis_matches_async.
+        round_name (str): Round the match is played in.
+
+    Returns:
+        TennisMatch: The same match, updated in place.
+    """
+    round_specific_points = ROUND_POINTS.get(round_name)
+    expected_points = ExpectedPoints()
+
+    if round_specific_points:
+        category_index = {"A": 0, "B": 1, "C": 2}
+        home_points = round_specific_points[category_index.get(match_data.categories.player1, 3)]
+        away_points = round_specific_points[category_index.get(match_data.categories.player2, 3)]
+        home_win_probability = round(100 / match_data.odds.home, 2)
+        away_win_probability = round(100 / match_data.odds.away, 2)
+        expected_points.home = round(home_win_probability * home_points / 100, 2)
+        expected_points.away = round(away_win_probability * away_points / 100, 2)
+
+    match_data.round = round_name
+    match_data.expected_points = expected_points
+    return match_data
+
 async def fetch_tennis_matches_async(league_url):
     """
-    Fetch tennis match details asynchronously from OddsPortal.
+    Fetch tennis match details from OddsPortal, over HTTP if the listing allows.
+
+    Args:
+        league_url (str): The URL of the tennis league page.
+
+    Returns:
+        list: List of TennisMatch records with match details, odds, and date.
+    """
+    return await fetch_listing_tiered(league_url, parse_tennis_rows, TennisMatch, fetch_tennis_page_async)
+
+async def fetch_tennis_page_async(league_url):
+    """
+    Fetch tennis match details asynchronously from OddsPortal in a browser page.
 
     Args:
         league_url (str): The URL of the tennis league page.
 
     Returns:
-        list: List of dictionaries containing match details, odds, and date.
+        list: List of TennisMatch records with match details, odds, and date.
+    """
+    app = current_app._get_current_object()
+
+    try:
+        async with open_page(app) as page:
+            app.logger.info(f"Navigating to league: {league_url}")
+            await wait_for_slot(league_url)
+            with timed("navigation"):
+                await page.goto(league_url, timeout=30000)
+            app.logger.info("League page loaded successfully!")
+            return await parse_tennis_listing(page, league_url)
+
+    except SelectorDrift:
+        raise
+    except Exception as e:
+        app.logger.error(f"Error fetching tennis matches: {e}")
+        return []
+
+async def parse_tennis_listing(page, league_url):
+    """
+    Parse the match rows of a loaded tennis listing or results page.
+
+    Args:
+        page (Page): Playwright page with the listing loaded.
+        league_url (str): URL of the page, used to resolve match links.
+
+    Returns:
+        list: List of TennisMatch records with match details, odds, and date.
+
+    Raises:
+        SelectorDrift: If the page layout changed.
+    """
+    return await parse_tennis_rows(await page_rows(page, league_url), league_url)
+
+async def parse_tennis_rows(rows, league_url):
+    """
+    Build tennis matches from the rows of a listing, in page order.
+
+    Args:
+        rows (list): PageRow or HtmlRow objects.
+        league_url (str): URL of the page, used to resolve match links.
+
+    Returns:
+        list: List of TennisMatch records with match details, odds, and date.
     """
     app = current_app._get_current_object()
-    browser = await get_browser(app)  # Use the shared browser instance
     all_matches = []
     current_date = None
     seen_matches = set()
+    app.logger.info(f"Found {len(rows)} rows.")
+    extraction_start = time.perf_counter()
+    skipped = errored = 0
+
+    for i, row in enumerate(rows):
+        try:
+            # Check if the row contains a date
+            date_text = await row.date_text()
+            if date_text is not None:
+                app.logger.debug(f"Extracted date text: {date_text}")
+
+                # Remove prefixes like "Today" or "Tomorrow" if present
+                if "Today" in date_text:
+                    current_date = datetime.now().strftime("%d-%m-%Y")
+                elif "Tomorrow" in date_text:
+                    current_date = (datetime.now() + timedelta(days=1)).strftime("%d-%m-%Y")
+                else:
+                    # Parse and reformat the date
+                    try:
+                        current_date = datetime.strptime(date_text, "%d %b %Y").strftime("%d-%m-%Y")
+                    except ValueError as e:
+                        app.logger.error(f"Error parsing date: {date_text}, {e}")
+                        current_date = "Unknown"
+                continue  # Skip processing further as this is a date row
+            
+            # Check if the row contains match data
+            players = await row.participants()
+            if players:
+                home_player, away_player = players[0], players[1]
+
+                # Check if names contain scores and skip them if they do
+                if contains_score(home_player) or contains_score(away_player):
+                    app.logger.debug(f"Skipping match with score in names: {home_player} vs {away_player}")
+                    skipped += 1
+                    continue
+
+                # Create a unique identifier for deduplication
+                match_id = f"{home_player.strip()} vs {away_player.strip()}"
+                if match_id in seen_matches:
+                    app.logger.debug(f"Duplicate match found: {match_id}")
+                    skipped += 1
+                    continue
+                seen_matches.add(match_id)
+
+                # Extract odds
+                odds = await row.odds()
+                home_odd = float(odds[0])
+                away_odd = float(odds[1])
+
+                # Determine the round based on the current date
+                if current_date and current_date != "Unknown":
+                    round_name = determine_round(datetime.strptime(current_date, "%d-%m-%Y").strftime("%Y-%m-%d"))
+                else:
+                    round_name = "Unknown"
+
+                # Construct match data
+                match_data = TennisMatch(
+                    date=current_date or "Unknown",
+                    home_player=home_player.strip(),
+                    away_player=away_player.strip(),
+                    odds=Odds(home=home_odd, away=away_odd),
+                    categories=Categories(
+                        player1=PLAYER_RATINGS.get(home_player, "Unknown"),
+                        player2=PLAYER_RATINGS.get(away_player, "Unknown"),
+                    ),
+                    url=await row.match_url(league_url),
+                )
+                apply_round(match_data, round_name)
+                all_matches.append(match_data)
+        except Exception as e:
+            app.logger.error(f"Error processing row {i + 1}: {e}")
+            errored += 1
+            continue
+
+    observe_stage("row_extraction", time.perf_counter() - extraction_start)
+    count_rows(parsed=len(all_matches), skipped=skipped, errored=errored)
+    app.logger.info(f"Extracted {len(all_matches)} matches.")
+    return all_matches
+
+async def fetch_tennis_draw_async(rounds_url):
+    """
+    Fetch the tournament draw (bracket) from the OddsPortal standings page.
+
+    Args:
+        rounds_url (str): The URL of the tournament standings/draw page.
 
-    # Points per round
-    ROUND_POINTS = {
-        "Quarterfinals": [240, 400, 560, 720],
-        "Semifinals": [320, 480, 640, 800],
-        "Finals": [400, 560, 720, 800],
-    }
+    Returns:
+        dict: Mapping of draw_key(player1, player2) to the round name.
+    """
+    app = current_app._get_current_object()
+    draw = {}
 
     try:
-        page = await browser.new_page()
-        app.logger.info(f"Navigating to league: {league_url}")
-        await page.goto(league_url, timeout=30000)
-        app.logger.info("League page loaded successfully!")
-
-        # Wait for the match container rows
-        await page.wait_for_selector('div[data-v-b8d70024]', timeout=30000)
-        rows = page.locator('div[data-v-b8d70024]')
-        row_count = await rows.count()
-        app.logger.info(f"Found {row_count} rows.")
-
-        for i in range(row_count):
-            row = rows.nth(i)
-            try:
-                # Check if the row contains a date
-                if await row.locator('.text-black-main.font-main').count() > 0:
-                    # Extract the current date
-                    date_text = (await row.locator('.text-black-main.font-main').first.text_content(timeout=1000)).strip()
-                    app.logger.debug(f"Extracted date text: {date_text}")
-
-                    # Remove prefixes like "Today" or "Tomorrow" if present
-                    if "Today" in date_text:
-                        current_date = datetime.now().strftime("%d-%m-%Y")
-                    elif "Tomorrow" in date_text:
-                        current_date = (datetime.now() + timedelta(days=1)).strftime("%d-%m-%Y")
-                    else:
-                        # Parse and reformat the date
-                        try:
-                            current_date = datetime.strptime(date_text, "%d %b %Y").strftime("%d-%m-%Y")
-                        except ValueError as e:
-                            app.logger.error(f"Error parsing date: {date_text}, {e}")
-                            current_date = "Unknown"
-                    continue  # Skip processing further as this is a date row
-                    
-                # Check if the row contains match data
-                if await row.locator('a[title]').count() > 0:
-                    # Extract player names
-                    home_player = await row.locator('a[title]').nth(0).text_content(timeout=1000)
-                    away_player = await row.locator('a[title]').nth(1).text_content(timeout=1000)
-
-                    # Check if names contain scores and skip them if they do
-                    if contains_score(home_player) or contains_score(away_player):
-                        app.logger.debug(f"Skipping match with score in names: {home_player} vs {away_player}")
+        async with open_page(app) as page:
+            app.logger.info(f"Navigating to draw: {rounds_url}")
+            await wait_for_slot(rounds_url)
+            with timed("navigation", page="draw"):
+                await page.goto(rounds_url, timeout=30000)
+
+            # Every draw column holds the pairings of one round, first round left
+            with timed("selector_wait", page="draw"):
+                column_selector = await probe_selector(page, "draw_column", rounds_url)
+                match_selector = (await probe_selector(page, "draw_match", rounds_url, within=column_selector))[len(column_selector) + 1:]
+            columns = page.locator(column_selector)
+            column_count = await columns.count()
+            app.logger.info(f"Found {column_count} draw columns.")
+
+            for i in range(column_count):
+                round_name = draw_round_name(i, column_count)
+                pairings = columns.nth(i).locator(match_selector)
+
+                for j in range(await pairings.count()):
+                    try:
+                        players = pairings.nth(j).locator('a[title]')
+                        if await players.count() < 2:
+                            continue  # Opponent not decided yet
+                        home_player = await players.nth(0).text_content(timeout=1000)
+                        away_player = await players.nth(1).text_content(timeout=1000)
+                        draw[draw_key(home_player, away_player)] = round_name
+                    except Exception as e:
+                        app.logger.error(f"Error processing draw match {j + 1} in {round_name}: {e}")
                         continue
 
-                    # Create a unique identifier for deduplication
-                    match_id = f"{home_player.strip()} vs {away_player.strip()}"
-                    if match_id in seen_matches:
-                        app.logger.debug(f"Duplicate match found: {match_id}")
-                        continue
-                    seen_matches.add(match_id)
-
-                    # Extract odds
-                    odds = row.locator('div[data-v-34474325] p')
-                    home_odd = float(await odds.nth(0).text_content(timeout=1000))
-                    away_odd = float(await odds.nth(1).text_content(timeout=1000))
-
-                    # Determine the round based on the current date
-                    if current_date and current_date != "Unknown":
-                        round_name = determine_round(datetime.strptime(current_date, "%d-%m-%Y").strftime("%Y-%m-%d"))
-                    else:
-                        round_name = "Unknown"
-
-                    # Category and points calculations
-                    home_category = PLAYER_RATINGS.get(home_player, "Unknown")
-                    away_category = PLAYER_RATINGS.get(away_player, "Unknown")
-                    round_specific_points = ROUND_POINTS.get(round_name, "Unknown")
-                    home_points = round_specific_points[0] if home_category == "A" else \
-                                  round_specific_points[1] if home_category == "B" else \
-                                  round_specific_points[2] if home_category == "C" else \
-                                  round_specific_points[3]
-                    away_points = round_specific_points[0] if away_category == "A" else \
-                                  round_specific_points[1] if away_category == "B" else \
-                                  round_specific_points[2] if away_category == "C" else \
-                                  round_specific_points[3]
-                    home_win_probability = round(100 / home_odd, 2)
-                    away_win_probability = round(100 / away_odd, 2)
-                    expected_home_point = round(home_win_probability * home_points / 100, 2)
-                    expected_away_point = round(away_win_probability * away_points / 100, 2)
-
-                    # Construct match data
-                    match_data = {
-                        "date": current_date or "Unknown",
-                        "round": round_name,
-                        "home_player": home_player.strip(),
-                        "away_player": away_player.strip(),
-                        "odds": {
-                            "home": home_odd,
-                            "away": away_odd,
-                        },
-                        "expected_points": {
-                            "home": expected_home_point,
-                            "away": expected_away_point,
-                        },
-                        "categories": {
-                            "player1": home_category,
-                            "player2": away_category,
-                        },
-                    }
-                    all_matches.append(match_data)
-            except Exception as e:
-                app.logger.error(f"Error processing row {i + 1}: {e}")
-                continue
-
-        app.logger.info(f"Extracted {len(all_matches)} matches.")
-        return all_matches  # Moved outside the loop
+            app.logger.info(f"Extracted {len(draw)} draw pairings.")
+            return draw
 
     except Exception as e:
-        app.logger.error(f"Error fetching tennis matches: {e}")
-        return all_matches  # Return whatever was fetched even if incomplete
+        app.logger.error(f"Error fetching tennis draw: {e}")
+        return draw
+
+async def refresh_tennis_draw(rounds_url: str, draw_cache_key: str) -> dict:
+    """
+    Fetch the tournament draw and cache it with its own TTL.
+
+    Args:
+        rounds_url (str): The URL of the tournament standings/draw page.
+        draw_cache_key (str): Redis key the draw is cached under.
 
-    finally:
-        if page:
-            await page.close()  # Ensure the page is closed
+    Returns:
+        dict: Mapping of draw_key(player1, player2) to the round name.
+    """
+    draw = await fetch_tennis_draw_async(rounds_url)
+    if draw:
+        redis_client = current_app.redis_client
+        await asyncio.to_thread(redis_client.set, draw_cache_key, json.dumps(draw), ex=TENNIS_DRAW_TTL)
+    return draw
 
-async def fetch_combined_tennis_data(matches_url: str, rounds_url: str) -> list:
+def remember_missed_pairings(redis_client, draw_cache_key: str, pairings: set):
     """
-    Fetch tennis matches synchronously using the async fetcher.
+    Remember listed pairings the freshly fetched draw does not contain.
+
+    Qualifying and exhibition matches are never part of the draw, so they must
+    not make every refresh fetch it again. The set is replaced on each draw
+    fetch and expires with the draw.
+
+    Args:
+        redis_client (Redis): Redis client.
+        draw_cache_key (str): Redis key the draw is cached under.
+        pairings (set): draw_key of the pairings missing from the draw.
+    """
+    missed_key = f"{draw_cache_key}:missed"
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(missed_key)
+    if pairings:
+        pipe.sadd(missed_key, *pairings)
+        pipe.expire(missed_key, TENNIS_DRAW_TTL)
+    pipe.execute()
+
+async def fetch_combined_tennis_data(matches_url: str, rounds_url: str, draw_cache_key: str = None) -> list:
+    """
+    Fetch tennis matches and assign each match its round from the tournament draw.
+
+    Without a cached draw, the match listing and the draw are loaded concurrently
+    in two pages of the shared browser. The draw is cached separately under
+    draw_cache_key with TENNIS_DRAW_TTL and is only fetched again when a listed
+    match is missing from it and was not already missing after the last fetch.
 
     Args:
         matches_url (str): Matches URL.
-        rounds_url (str): Rounds URL (not currently used).
+        rounds_url (str): Rounds (standings/draw) URL.
+        draw_cache_key (str, optional): Redis key for the cached draw.
 
     Returns:
         list: Match details.
     """
     try:
-        data = await fetch_tennis_matches_async(matches_url)
+        if not rounds_url:
+            data = await fetch_tennis_matches_async(matches_url)
+        else:
+            redis_client = current_app.redis_client
+            draw_cache_key = draw_cache_key or f"tennis_draw_{rounds_url}"
+            cached_draw = await asyncio.to_thread(redis_client.get, draw_cache_key)
+
+            if cached_draw:
+                draw = json.loads(cached_draw.decode("utf-8"))
+                data = await fetch_tennis_matches_async(matches_url)
+                missing = {draw_key(m.home_player, m.away_player) for m in data} - draw.keys()
+                if missing:
+                    missed = await asyncio.to_thread(redis_client.smembers, f"{draw_cache_key}:missed")
+                    if missing - {pairing.decode("utf-8") for pairing in missed}:
+                        # A new pairing appeared, so the draw moved on since it was cached. Pairings
+                        # still missing, or all of them if the fetch failed, do not trigger another fetch
+                        draw = await refresh_tennis_draw(rounds_url, draw_cache_key) or draw
+                        await asyncio.to_thread(remember_missed_pairings, redis_client, draw_cache_key, missing - draw.keys())
+            else:
+                # Start the shared browser once so both pages open in the same instance
+                await get_browser(current_app._get_current_object())
+                data, draw = await asyncio.gather(
+                    fetch_tennis_matches_async(matches_url),
+                    refresh_tennis_draw(rounds_url, draw_cache_key),
+                )
+                if draw:
+                    missing = {draw_key(m.home_player, m.away_player) for m in data} - draw.keys()
+                    await asyncio.to_thread(remember_missed_pairings, redis_client, draw_cache_key, missing)
+
+            with timed("post_processing"):
+                for match in data:
+                    round_name = draw.get(draw_key(match.home_player, match.away_player))
+                    if round_name:
+                        apply_round(match, round_name)
+
         if not data:
             print(f"No data fetched from: {matches_url}")
         else:
             print(f"Fetched {len(data)} matches from: {matches_url}")
         return data
+    except SelectorDrift:
+        raise
     except Exception as e:
         print(f"Error fetching combined tennis data: {e}")
         return []
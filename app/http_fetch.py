@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from redis.exceptions import RedisError
+from requests.adapters import HTTPAdapter
+from app.constants import HTTP_TIMEOUT, HTTP_POOL_SIZE, HTTP_USER_AGENT, HTTP_CACHE_TTL, FETCH_TIER_RECHECK
+import json
+import requests
+import threading
+import time
+
+# Plain-HTTP tier of the listing fetchers (app/fetchers.py). A listing is first
+# requested over a pooled keep-alive session and parsed from the server HTML;
+# only when that yields no matches is a Chromium page opened. Redis keys:
+#   http_cache:<url>   hash etag, last_modified, day, matches: validators and the last parse of
+#                      a listing, so an unchanged page is answered with 304 and not parsed again
+#   fetch_tiers        hash url -> {"tier": "http" | "browser", "at": time} of the last successful fetch
+# A listing that needed the browser is only tried over HTTP again after
+# FETCH_TIER_RECHECK seconds.
+TIERS_KEY = "fetch_tiers"
+
+_session_lock = threading.Lock()
+
+
+def _cache_key(url):
+    return f"http_cache:{url}"
+
+
+@dataclass(slots=True)
+class Listing:
+    """Response to a conditional listing request."""
+    status: int
+    text: str = None  # Body of a 200 response
+    blob: str = None  # Matches of the last parse (to_cache format) on 304
+    etag: str = None
+    last_modified: str = None
+
+
+def http_session(app):
+    """
+    Get or create the HTTP session shared by all fetches of an app.
+
+    The session keeps connections to each host alive (up to HTTP_POOL_SIZE
+    per host); requests asks for compressed responses and decodes them.
+    """
+    with _session_lock:
+        if not hasattr(app, "_http_session"):
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "User-Agent": HTTP_USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-GB,en;q=0.9",
+            })
+            app._http_session = session
+        return app._http_session
+
+
+def get_listing(app, url, day):
+    """
+    Request a listing, conditionally if it was parsed before on the same day.
+
+    Listings show relative dates ("Today"), so a parse is only reused on the
+    day it was made.
+
+    Args:
+        app (Flask): Flask application holding the session and Redis client.
+        url (str): Listing URL.
+        day (str): Current day ("dd-mm-YYYY").
+
+    Returns:
+        Listing: The response.
+
+    Raises:
+        requests.RequestException: On network errors and error statuses.
+    """
+    try:
+        cached = {key.decode("utf-8"): value.decode("utf-8") for key, value in app.redis_client.hgetall(_cache_key(url)).items()}
+    except RedisError:
+        cached = {}  # Without Redis, requested unconditionally
+    headers = {}
+    if cached.get("day") == day:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = http_session(app).get(url, headers=headers, timeout=HTTP_TIMEOUT)
+    if response.status_code == 304 and headers:
+        return Listing(304, blob=cached.get("matches"))
+    response.raise_for_status()
+    return Listing(
+        response.status_code,
+        text=response.text,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+
+
+def store_listing(redis_client, url, listing, blob, day):
+    """Keep the validators and parsed matches of a listing for the next conditional request."""
+    if not listing.etag and not listing.last_modified:
+        return
+    key = _cache_key(url)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(key)
+    pipe.hset(key, mapping={
+        "etag": listing.etag or "",
+        "last_modified": listing.last_modified or "",
+        "day": day,
+        "matches": blob,
+    })
+    pipe.expire(key, HTTP_CACHE_TTL)
+    pipe.execute()
+
+
+def use_http(redis_client, url, now=None):
+    """Whether a listing should be tried over plain HTTP before the browser."""
+    record = redis_client.hget(TIERS_KEY, url)
+    if record is None:
+        return True
+    record = json.loads(record)
+    return record["tier"] == "http" or (now or time.time()) - record["at"] >= FETCH_TIER_RECHECK
+
+
+def record_tier(redis_client, url, tier, now=None):
+    """Remember which tier ("http" or "browser") fetched a listing."""
+    redis_client.hset(TIERS_KEY, url, json.dumps({"tier": tier, "at": int(now or time.time())}))
+
+
+def fetch_tiers(redis_client):
+    """Last successful tier of every listing, url -> {"tier", "at"}."""
+    return {url.decode("utf-8"): json.loads(record) for url, record in redis_client.hgetall(TIERS_KEY).items()}
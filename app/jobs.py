@@ -0,0 +1,222 @@
+from flask import current_app
+from app.utils import fetch_matches_and_cache
+from app.constants import TENNIS_LEAGUES, LEAGUES
+from app.fetchers import fetch_football_matches_async, fetch_combined_tennis_data
+from app.bookmakers import fetch_with_bookmakers
+from app.scheduler import (
+    start_job,
+    finish_job,
+    schedule_next_refresh,
+    schedule_retry,
+    job_name,
+    job_cache_key,
+    trip_breaker,
+    reset_breaker,
+    breaker_open_until,
+)
+from app.page_selectors import SelectorDrift
+from app.metrics import scrape_labels, observe, inc, flush_metrics
+from app.tracing import start_span, traceparent
+from app.sharding import PRIORITIES, queue_for
+from app.search import league_of
+import asyncio
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Jobs for the scrape daemon are JSON objects {"sport": ..., "league": ...}
+# pushed on one Redis list per queue (see app/daemon.py). Queues are named as
+# in Celery: a shared queue per priority plus a queue per node and priority
+# (see app/sharding.py).
+JOB_QUEUE_PREFIX = "scrape_jobs:"
+
+
+def job_queue_key(queue):
+    """Redis list holding the daemon jobs of a queue."""
+    return f"{JOB_QUEUE_PREFIX}{queue}"
+
+
+async def _run_refresh(sport, league, fetch_func, fetch_args):
+    """
+    Fetch, cache and reschedule one league, honouring its circuit breaker.
+
+    A league whose page no longer matches any known selectors fails within a
+    second of rendering; after BREAKER_DRIFT_THRESHOLD such failures in a row
+    its breaker trips, so neither the scheduler nor user requests scrape it
+    again until the cooldown ends.
+    """
+    redis_client = current_app.redis_client
+    open_until = await asyncio.to_thread(breaker_open_until, redis_client, sport, league)
+    if open_until:
+        logger.warning(f"Skipping {sport} league {league}: selectors broken, retrying at {open_until:.0f}.")
+        await asyncio.to_thread(finish_job, redis_client, sport, league)  # Marked running by due_jobs
+        return None
+
+    labels = scrape_labels.set({"sport": sport, "league": league})
+    started = time.perf_counter()
+    outcome = "empty"
+    await asyncio.to_thread(start_job, redis_client, sport, league)
+    try:
+        with start_span("refresh", sport=sport, league=league) as span:
+            try:
+                data = await fetch_matches_and_cache(
+                    fetch_func=fetch_func,
+                    cache_key=job_cache_key(job_name(sport, league)),
+                    fetch_args=fetch_args,
+                    logger=logger,
+                )
+                if data:
+                    outcome = "cached"
+                    await asyncio.to_thread(reset_breaker, redis_client, sport, league)
+                    interval = await asyncio.to_thread(schedule_next_refresh, redis_client, sport, league, data)
+                    logger.info(f"Next refresh of {sport} league {league} in {interval} seconds.")
+                else:
+                    interval = await asyncio.to_thread(schedule_retry, redis_client, sport, league)
+                    logger.warning(f"Refresh of {sport} league {league} cached nothing, retrying in {interval} seconds.")
+                return data
+            except SelectorDrift as e:
+                outcome = "selector_drift"
+                cooldown = await asyncio.to_thread(trip_breaker, redis_client, sport, league, str(e))
+                if cooldown:
+                    logger.error(f"Circuit breaker open for {sport} league {league} for {cooldown} seconds: {e}")
+                else:
+                    logger.warning(f"Selector drift on {sport} league {league}, retrying soon: {e}")
+                return None
+            finally:
+                span.attributes["outcome"] = outcome
+    finally:
+        observe("scrape_refresh_seconds", time.perf_counter() - started)
+        inc("scrape_refreshes_total", outcome=outcome)
+        scrape_labels.reset(labels)
+        await asyncio.to_thread(finish_job, redis_client, sport, league)
+        try:
+            await asyncio.to_thread(flush_metrics, redis_client)
+        except Exception as e:
+            logger.warning(f"Could not flush scrape metrics: {e}")
+
+
+async def run_tennis_refresh(league: str, deep: bool = None) -> list:
+    """
+    Fetch, cache and reschedule one tennis league.
+
+    The shared browser is left open so the caller decides its lifetime: the
+    Celery task closes it after every job, the daemon keeps it.
+
+    Args:
+        league (str): League name as defined in TENNIS_LEAGUES.
+        deep (bool, optional): Also scrape every bookmaker per match; defaults to DEEP_ODDS_MODE.
+
+    Returns:
+        list | None: The cached matches, or None if nothing was cached.
+    """
+    league_urls = TENNIS_LEAGUES.get(league, {})
+    matches_url = league_urls.get("matches")
+    rounds_url = league_urls.get("rounds")
+
+    if not matches_url:
+        logger.warning(f"Invalid tennis league: {league}")
+        return None
+
+    use_deep = current_app.config["DEEP_ODDS_MODE"] if deep is None else deep
+    fetch_args = (matches_url, rounds_url, f"tennis_draw_{league}")
+    return await _run_refresh(
+        "tennis",
+        league,
+        fetch_with_bookmakers if use_deep else fetch_combined_tennis_data,
+        (fetch_combined_tennis_data, *fetch_args) if use_deep else fetch_args,
+    )
+
+
+async def run_football_refresh(league: str, deep: bool = None) -> list:
+    """
+    Fetch, cache and reschedule one football league.
+
+    Args:
+        league (str): League name as defined in LEAGUES.
+        deep (bool, optional): Also scrape every bookmaker per match; defaults to DEEP_ODDS_MODE.
+
+    Returns:
+        list | None: The cached matches, or None if nothing was cached.
+    """
+    league_url = LEAGUES.get(league)
+    if not league_url:
+        logger.warning(f"Invalid football league: {league}")
+        return None
+
+    use_deep = current_app.config["DEEP_ODDS_MODE"] if deep is None else deep
+    return await _run_refresh(
+        "football",
+        league,
+        fetch_with_bookmakers if use_deep else fetch_football_matches_async,
+        (fetch_football_matches_async, league_url) if use_deep else (league_url,),
+    )
+
+
+REFRESH_JOBS = {
+    "football": run_football_refresh,
+    "tennis": run_tennis_refresh,
+}
+
+
+def queue_daemon_job(redis_client, sport: str, league: str, deep: bool = None, priority: str = "background") -> str:
+    """
+    Push a league refresh on the daemon queue of the node owning the league.
+
+    Args:
+        redis_client (Redis): Redis client.
+        sport (str): "football" or "tennis".
+        league (str): League name.
+        deep (bool, optional): Also scrape every bookmaker per match.
+        priority (str): "interactive" or "background".
+
+    Returns:
+        str: Name of the queue the job was pushed to.
+    """
+    queue = queue_for(redis_client, job_name(sport, league), priority)
+    job = {"sport": sport, "league": league, "deep": deep, "traceparent": traceparent()}
+    redis_client.lpush(job_queue_key(queue), json.dumps(job))
+    return queue
+
+
+def enqueue_refresh(sport: str, league: str, deep: bool = None, priority: str = "background") -> None:
+    """
+    Queue a league refresh on the configured scrape backend.
+
+    With SCRAPE_BACKEND "daemon" the job is pushed to a daemon queue,
+    otherwise it is sent to the Celery queue of the same name. Each league is
+    owned by one live worker node (consistent hashing, see app/sharding.py)
+    and goes to that node's queue of its priority, so the node's browser cache
+    and cached tennis draws stay warm. Interactive jobs (a user waiting on a
+    cold cache) are served before any queued background job.
+
+    Args:
+        sport (str): "football" or "tennis".
+        league (str): League name.
+        deep (bool, optional): Also scrape every bookmaker per match.
+        priority (str): "interactive" or "background".
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {priority}")
+
+    redis_client = current_app.redis_client
+    backend = current_app.config["SCRAPE_BACKEND"]
+    with start_span("enqueue refresh", sport=sport, league=league, priority=priority, backend=backend):
+        if backend == "daemon":
+            queue_daemon_job(redis_client, sport, league, deep, priority)
+            return
+
+        from app.tasks import fetch_football_in_background, fetch_tennis_matches_in_background
+        task = fetch_tennis_matches_in_background if sport == "tennis" else fetch_football_in_background
+        task.apply_async(
+            args=(league, deep),
+            queue=queue_for(redis_client, job_name(sport, league), priority),
+            headers={"traceparent": traceparent()},  # Continued in ContextTask (celery_worker)
+        )
+
+
+def refresh_warmed(cache_keys):
+    """Queue a background refresh of leagues warmed from their snapshots (see warm_cache)."""
+    for cache_key in cache_keys:
+        enqueue_refresh(*league_of(cache_key))
@@ -0,0 +1,245 @@
+from collections import Counter
+from app.constants import LEAGUES, TENNIS_LEAGUES, VIEW_TOP_PICKS, VALUE_BET_MIN_PROBABILITY
+from app.publication import read_leagues
+from app.records import FootballMatch, TennisMatch
+from app.scorelines import score_matches
+import json
+import time
+
+# Materialized views of a league: small summaries computed once per refresh
+# and published in the same batch as the league blob, under
+# "<cache_key>:<view>" (e.g., "tennis_matches_atp_australian_open:top_picks").
+# Pages that need a summary of many leagues read these instead of decoding
+# every league.
+FOOTBALL_VIEWS = ("summary", "top_picks", "by_date", "predictions")
+TENNIS_VIEWS = ("summary", "top_picks", "favourites_by_round", "value_bets", "by_date")
+
+CATEGORY_RANK = {"A": 0, "B": 1, "C": 2, "D": 3}
+
+
+def view_key(cache_key, view):
+    """Cache key of one view of a league."""
+    return f"{cache_key}:{view}"
+
+
+def _summary(matches, now):
+    dates = sorted(match.date for match in matches if match.date != "Unknown")
+    return {"matches": len(matches), "first_date": dates[0] if dates else None, "updated": int(now)}
+
+
+def _by_date(matches):
+    return dict(Counter(match.date for match in matches))
+
+
+def football_views(matches, now=None):
+    """
+    Views of a football league.
+
+    - summary: number of matches, first match date and refresh time
+    - top_picks: the VIEW_TOP_PICKS strongest favourites (lowest favourite odd)
+    - by_date: number of matches per date
+    - predictions: matches with their SCORELINE_VIEW_TOP best scorelines,
+      fitted here once per refresh rather than per request
+
+    Args:
+        matches (list): FootballMatch records.
+        now (float, optional): Refresh time, defaults to now.
+
+    Returns:
+        dict: View name to view.
+    """
+    picks = []
+    for match in matches:
+        if match.favourite:
+            odd = getattr(match.odds, match.favourite)
+            picks.append({
+                "date": match.date,
+                "home_team": match.home_team,
+                "away_team": match.away_team,
+                "pick": match.favourite,
+                "odd": odd,
+            })
+    picks.sort(key=lambda pick: pick["odd"])
+    return {
+        "summary": _summary(matches, now or time.time()),
+        "top_picks": picks[:VIEW_TOP_PICKS],
+        "by_date": _by_date(matches),
+        "predictions": score_matches(matches),
+    }
+
+
+def _win_probabilities(odds):
+    """Margin-free win probabilities (home, away) of a tennis match, or None."""
+    if not odds.home or not odds.away or min(odds.home, odds.away) <= 1.0:
+        return None
+    home, away = 1 / odds.home, 1 / odds.away
+    return home / (home + away), away / (home + away)
+
+
+def tennis_views(matches, now=None):
+    """
+    Views of a tennis league.
+
+    - summary: number of matches, first match date and refresh time
+    - top_picks: the VIEW_TOP_PICKS players with the most expected points
+    - favourites_by_round: the favourite of every match, per round
+    - value_bets: players the market gives at least VALUE_BET_MIN_PROBABILITY
+      to beat an opponent of a better Scorito category
+    - by_date: number of matches per date
+
+    Args:
+        matches (list): TennisMatch records.
+        now (float, optional): Refresh time, defaults to now.
+
+    Returns:
+        dict: View name to view.
+    """
+    picks, favourites, value_bets = [], {}, []
+    for match in matches:
+        players = {
+            "home": (match.home_player, match.categories.player1, match.expected_points.home),
+            "away": (match.away_player, match.categories.player2, match.expected_points.away),
+        }
+        side = "home" if (match.expected_points.home or 0) >= (match.expected_points.away or 0) else "away"
+        player, category, points = players[side]
+        if points:
+            picks.append({
+                "date": match.date,
+                "round": match.round,
+                "player": player,
+                "opponent": players["away" if side == "home" else "home"][0],
+                "category": category,
+                "expected_points": points,
+            })
+
+        if match.favourite:
+            favourite, _, _ = players[match.favourite]
+            underdog, _, _ = players["away" if match.favourite == "home" else "home"]
+            favourites.setdefault(match.round, []).append({
+                "date": match.date,
+                "player": favourite,
+                "opponent": underdog,
+                "odd": getattr(match.odds, match.favourite),
+            })
+
+        probabilities = _win_probabilities(match.odds)
+        home_rank = CATEGORY_RANK.get(match.categories.player1)
+        away_rank = CATEGORY_RANK.get(match.categories.player2)
+        if probabilities and home_rank is not None and away_rank is not None and home_rank != away_rank:
+            side = "home" if home_rank > away_rank else "away"  # The player of the worse category
+            probability = probabilities[0] if side == "home" else probabilities[1]
+            if probability >= VALUE_BET_MIN_PROBABILITY:
+                player, category, points = players[side]
+                value_bets.append({
+                    "date": match.date,
+                    "round": match.round,
+                    "player": player,
+                    "category": category,
+                    "opponent_category": players["away" if side == "home" else "home"][1],
+                    "win_probability": round(probability, 3),
+                    "expected_points": points,
+                })
+
+    picks.sort(key=lambda pick: pick["expected_points"], reverse=True)
+    value_bets.sort(key=lambda bet: bet["win_probability"], reverse=True)
+    return {
+        "summary": _summary(matches, now or time.time()),
+        "top_picks": picks[:VIEW_TOP_PICKS],
+        "favourites_by_round": favourites,
+        "value_bets": value_bets,
+        "by_date": _by_date(matches),
+    }
+
+
+def league_blobs(cache_key, data, blob=None):
+    """
+    The league blob and its views, to publish in one batch.
+
+    Args:
+        cache_key (str): Cache key of the league; "tennis_matches_*" is a tennis league.
+        data (list): Match dictionaries of the cache format.
+        blob (str | bytes, optional): data as JSON, if already serialized.
+
+    Returns:
+        dict: Cache key to blob, for publish_leagues.
+    """
+    if cache_key.startswith("tennis_"):
+        views = tennis_views([TennisMatch.from_dict(match) for match in data])
+    else:
+        views = football_views([FootballMatch.from_dict(match) for match in data])
+    return {
+        cache_key: blob if blob is not None else json.dumps(data),
+        **{view_key(cache_key, name): json.dumps(view) for name, view in views.items()},
+    }
+
+
+def read_views(redis_client, cache_keys, views):
+    """
+    Read views of several leagues in one round trip.
+
+    Args:
+        redis_client (Redis): Redis client.
+        cache_keys (list): Cache keys of the leagues.
+        views (list): View names.
+
+    Returns:
+        dict: Cache key to {view name: view}; missing views are left out.
+    """
+    keys = [(cache_key, view) for cache_key in cache_keys for view in views]
+    blobs = read_leagues(redis_client, [view_key(cache_key, view) for cache_key, view in keys])
+    result = {cache_key: {} for cache_key in cache_keys}
+    for (cache_key, view), blob in zip(keys, blobs):
+        if blob:
+            result[cache_key][view] = json.loads(blob)
+    return result
+
+
+def league_summaries(redis_client, views=("summary", "top_picks")):
+    """
+    Views of every cached league, for cross-league pages.
+
+    Returns:
+        dict: {"football": {league: views}, "tennis": {league: views}}, cached leagues only.
+    """
+    cache_keys = {f"matches_{league}": ("football", league) for league in LEAGUES}
+    cache_keys.update({f"tennis_matches_{league}": ("tennis", league) for league in TENNIS_LEAGUES})
+    summaries = {"football": {}, "tennis": {}}
+    for cache_key, league_views in read_views(redis_client, list(cache_keys), views).items():
+        if league_views:
+            sport, league = cache_keys[cache_key]
+            summaries[sport][league] = league_views
+    return summaries
+
+
+def league_predictions(redis_client, leagues=LEAGUES, top=5):
+    """
+    Predicted scorelines of every cached football match.
+
+    Leagues published before they had a predictions view are scored on the
+    spot.
+
+    Args:
+        redis_client (Redis): Redis client.
+        leagues (iterable): League names to include.
+        top (int): Number of scorelines per match, at most SCORELINE_VIEW_TOP.
+
+    Returns:
+        dict: League name to a list of matches, each with a "prediction" key.
+    """
+    cache_keys = {f"matches_{league}": league for league in leagues}
+    views = read_views(redis_client, list(cache_keys), ["predictions"])
+    missing = [cache_key for cache_key, league_views in views.items() if "predictions" not in league_views]
+    for cache_key, blob in zip(missing, read_leagues(redis_client, missing) if missing else []):
+        if blob:
+            matches = [FootballMatch.from_dict(match) for match in json.loads(blob)]
+            views[cache_key]["predictions"] = score_matches(matches)
+
+    results = {}
+    for cache_key, league_views in views.items():
+        matches = league_views.get("predictions")
+        if matches:
+            results[cache_keys[cache_key]] = [
+                {**match, "prediction": {**match["prediction"], "scorelines": match["prediction"]["scorelines"][:top]}}
+                for match in matches
+            ]
+    return results
@@ -0,0 +1,162 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from app.tracing import start_span
+import threading
+import time
+
+# Scrape metrics are collected in process memory and flushed to one Redis hash
+# after every refresh, so the web process can export the numbers of every
+# worker and daemon in the Prometheus text format. Each hash field is a full
+# series name, e.g. 'scrape_rows_total{league="eredivisie",outcome="parsed"}',
+# and histograms are stored as cumulative _bucket/_sum/_count series.
+METRICS_KEY = "metrics"
+
+METRIC_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+METRIC_FAMILIES = {
+    "scrape_stage_seconds": ("histogram", "Time spent in one stage of a scrape."),
+    "scrape_refresh_seconds": ("histogram", "Time of a whole league refresh."),
+    "scrape_rows_total": ("counter", "Listing rows by outcome (parsed, skipped, errored)."),
+    "scrape_refreshes_total": ("counter", "League refreshes by outcome."),
+    "scrape_fetch_tier_total": ("counter", "Listings fetched by tier (http, browser)."),
+}
+
+# Sport and league of the refresh running in the current task; set by
+# app.jobs so the fetchers don't need to know which league they scrape.
+scrape_labels = ContextVar("scrape_labels", default={"sport": "", "league": ""})
+
+_pending = {}
+_lock = threading.Lock()
+
+
+def _series(name, labels):
+    body = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{body}}}"
+
+
+def _add(series, amount):
+    with _lock:
+        _pending[series] = _pending.get(series, 0) + amount
+
+
+def inc(name, amount=1, **labels):
+    """Increment a counter for the current league."""
+    _add(_series(name, {**scrape_labels.get(), **labels}), amount)
+
+
+def observe(name, seconds, **labels):
+    """Record one observation of a histogram for the current league."""
+    labels = {**scrape_labels.get(), **labels}
+    for bound in METRIC_BUCKETS:
+        if seconds <= bound:
+            _add(_series(f"{name}_bucket", {**labels, "le": str(bound)}), 1)
+    _add(_series(f"{name}_bucket", {**labels, "le": "+Inf"}), 1)
+    _add(_series(f"{name}_sum", labels), seconds)
+    _add(_series(f"{name}_count", labels), 1)
+
+
+def observe_stage(stage, seconds, page="listing"):
+    """Record the duration of a scrape stage (e.g., "navigation") in scrape_stage_seconds."""
+    observe("scrape_stage_seconds", seconds, stage=stage, page=page)
+
+
+@contextmanager
+def timed(stage, page="listing"):
+    """Time the enclosed block as a scrape stage, and trace it as a span."""
+    start = time.perf_counter()
+    try:
+        with start_span(stage, page=page):
+            yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start, page)
+
+
+def count_rows(parsed=0, skipped=0, errored=0):
+    """Count the listing rows of one scrape by outcome."""
+    for outcome, amount in (("parsed", parsed), ("skipped", skipped), ("errored", errored)):
+        if amount:
+            inc("scrape_rows_total", amount, outcome=outcome)
+
+
+def drain_metrics():
+    """Take the metrics collected in this process since the last drain, series -> value."""
+    global _pending
+    with _lock:
+        pending, _pending = _pending, {}
+    return pending
+
+
+def flush_metrics(redis_client):
+    """
+    Add the metrics collected since the last flush to Redis.
+
+    Args:
+        redis_client (Redis): Redis client.
+
+    Returns:
+        int: Number of series written.
+    """
+    pending = drain_metrics()
+    if not pending:
+        return 0
+
+    pipe = redis_client.pipeline(transaction=False)
+    for series, amount in pending.items():
+        pipe.hincrbyfloat(METRICS_KEY, series, amount)
+    pipe.execute()
+    return len(pending)
+
+
+def render_metrics(redis_client):
+    """
+    Render all scrape metrics and browser stats in the Prometheus text format.
+
+    Args:
+        redis_client (Redis): Redis client.
+
+    Returns:
+        str: Exposition text, as served on /metrics.
+    """
+    families = {}
+    for series, value in redis_client.hgetall(METRICS_KEY).items():
+        series = series.decode("utf-8")
+        name = series.split("{", 1)[0]
+        for suffix in ("_bucket", "_sum", "_count"):
+            if name.endswith(suffix) and name[: -len(suffix)] in METRIC_FAMILIES:
+                name = name[: -len(suffix)]
+        families.setdefault(name, []).append(f"{series} {float(value):g}")
+
+    lines = []
+    for name in sorted(families):
+        kind, description = METRIC_FAMILIES.get(name, ("untyped", ""))
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}", *sorted(families[name])]
+
+    # Page lifecycle stats published by every scraping node (app/browser.py)
+    gauges = {}
+    for key in redis_client.scan_iter(match="browser_stats:*"):
+        node = key.decode("utf-8").split(":", 1)[1]
+        for field, value in redis_client.hgetall(key).items():
+            gauges.setdefault(f"browser_{field.decode('utf-8')}", []).append(
+                f'{{node="{node}"}} {float(value):g}'
+            )
+    for name in sorted(gauges):
+        kind = "counter" if name.endswith("_total") else "gauge"
+        lines += [f"# TYPE {name} {kind}", *(f"{name}{sample}" for sample in sorted(gauges[name]))]
+
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """
+    Print the metrics of all nodes: python -m app.metrics
+
+    The output is pushgateway compatible, e.g.
+    python -m app.metrics | curl --data-binary @- $PUSHGATEWAY_URL/metrics/job/scraper
+    """
+    from app import initialize_redis
+
+    print(render_metrics(initialize_redis()), end="")
+
+
+if __name__ == "__main__":
+    main()
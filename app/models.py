@@ -17,3 +17,46 @@ class User(db.Model):
     def check_password(self, password):
         """Check the user's password"""
         return check_password_hash(self.password, password)
+
+class Match(db.Model):
+    """A scraped match, one row per league, participants and kickoff date"""
+    __tablename__ = "matches"
+    id = db.Column(db.Integer, primary_key=True)
+    sport = db.Column(db.String(16), nullable=False)
+    league = db.Column(db.String(100), nullable=False)
+    match_key = db.Column(db.String(255), nullable=False)  # "<home> vs <away>", as in the odds history
+    kickoff_date = db.Column(db.Date, nullable=False)
+    home = db.Column(db.String(150), nullable=False)
+    away = db.Column(db.String(150), nullable=False)
+    round = db.Column(db.String(50))  # Tennis only
+    home_category = db.Column(db.String(10))  # Tennis only
+    away_category = db.Column(db.String(10))
+    url = db.Column(db.String(500))
+    first_seen = db.Column(db.DateTime, nullable=False)
+    last_seen = db.Column(db.DateTime, nullable=False)
+    snapshots = db.relationship("OddsSnapshot", backref="match", lazy="dynamic")
+
+    __table_args__ = (
+        db.UniqueConstraint("sport", "league", "match_key", "kickoff_date", name="uq_matches_league_key_date"),
+        db.Index("ix_matches_league_kickoff_date", "league", "kickoff_date"),
+        db.Index("ix_matches_kickoff_date", "kickoff_date"),
+        db.Index("ix_matches_home", "home"),
+        db.Index("ix_matches_away", "away"),
+    )
+
+class OddsSnapshot(db.Model):
+    """Odds of a match at one scrape"""
+    __tablename__ = "odds_snapshots"
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True)
+    match_id = db.Column(db.Integer, db.ForeignKey("matches.id", ondelete="CASCADE"), nullable=False)
+    scraped_at = db.Column(db.DateTime, nullable=False)
+    source = db.Column(db.String(20), nullable=False, default="listing")  # "listing", "live" or "backfill"
+    home_odds = db.Column(db.Float)
+    draw_odds = db.Column(db.Float)
+    away_odds = db.Column(db.Float)
+    home_expected_points = db.Column(db.Float)  # Tennis only
+    away_expected_points = db.Column(db.Float)
+
+    __table_args__ = (
+        db.UniqueConstraint("match_id", "scraped_at", "source", name="uq_odds_snapshots_match_time_source"),
+    )
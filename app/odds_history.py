@@ -0,0 +1,223 @@
+import time
+from app.constants import (
+    ODDS_HISTORY_RETENTION,
+    ODDS_HISTORY_FULL_RESOLUTION,
+    ODDS_HISTORY_BUCKET,
+    ODDS_HISTORY_MAXLEN,
+)
+
+# Odds history is kept in one Redis Stream per match:
+#   odds_history:<cache_key>:<match_id>   entries {outcome: odd}, ID = timestamp in ms
+#   odds_history:<cache_key>              sorted set of match ids scored by last update
+#   odds_history_downsampled:<cache_key>  start (ms) of the first bucket not yet downsampled
+# Streams store entries in compact listpacks and are range-queryable by time, so a
+# series or a first/last lookup never has to deserialize the whole history.
+# Both keys expire ODDS_HISTORY_RETENTION after their last append, so the
+# streams of matches that are no longer listed do not stay in Redis forever.
+
+
+def match_identifier(match):
+    """
+    Build the identifier used for a match in the odds history.
+
+    Args:
+        match (dict): Football or tennis match as cached by the fetchers.
+
+    Returns:
+        str: Identifier such as "Ajax vs PSV".
+    """
+    home = match.get("home_team") or match.get("home_player")
+    away = match.get("away_team") or match.get("away_player")
+    return f"{home} vs {away}"
+
+
+def _index_key(cache_key):
+    return f"odds_history:{cache_key}"
+
+
+def _stream_key(cache_key, match_id):
+    return f"odds_history:{cache_key}:{match_id}"
+
+
+def _downsampled_key(cache_key):
+    return f"odds_history_downsampled:{cache_key}"
+
+
+def _decode(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _parse_entry(entry):
+    entry_id, fields = entry
+    timestamp = int(_decode(entry_id).split("-")[0])
+    odds = {_decode(outcome): float(_decode(odd)) for outcome, odd in fields.items()}
+    return {"timestamp": timestamp, "odds": odds}
+
+
+def append_snapshot(redis_client, cache_key, matches, timestamp=None):
+    """
+    Append the odds of a freshly fetched league to its odds history.
+
+    Only matches whose odds changed since their last entry are appended, and
+    entries older than ODDS_HISTORY_RETENTION are trimmed in the same round trip.
+    A match with an unparseable odd is skipped.
+
+    Args:
+        redis_client (Redis): Redis client.
+        cache_key (str): Cache key of the league (e.g., "matches_eredivisie").
+        matches (list): Matches as returned by a fetcher.
+        timestamp (int, optional): Snapshot time in ms, defaults to now.
+
+    Returns:
+        int: Number of matches appended.
+    """
+    timestamp = timestamp or int(time.time() * 1000)
+    min_id = max(timestamp - ODDS_HISTORY_RETENTION * 1000, 0)
+
+    match_ids = [match_identifier(match) for match in matches]
+    pipe = redis_client.pipeline(transaction=False)
+    for match_id in match_ids:
+        pipe.xrevrange(_stream_key(cache_key, match_id), count=1)
+    latest = pipe.execute()
+
+    appended = 0
+    pipe = redis_client.pipeline(transaction=False)
+    for match, match_id, last in zip(matches, match_ids, latest):
+        try:
+            odds = {outcome: float(odd) for outcome, odd in match.get("odds", {}).items() if odd not in (None, "", "-")}
+        except (TypeError, ValueError):
+            continue
+        if not odds:
+            continue
+        if last:
+            last_entry = _parse_entry(last[0])
+            if last_entry["odds"] == odds or last_entry["timestamp"] >= timestamp:
+                continue
+
+        stream_key = _stream_key(cache_key, match_id)
+        pipe.xadd(stream_key, odds, id=f"{timestamp}-0", maxlen=ODDS_HISTORY_MAXLEN, approximate=True)
+        pipe.xtrim(stream_key, minid=min_id)
+        pipe.pexpire(stream_key, ODDS_HISTORY_RETENTION * 1000)
+        pipe.zadd(_index_key(cache_key), {match_id: timestamp})
+        appended += 1
+
+    pipe.zremrangebyscore(_index_key(cache_key), "-inf", min_id)
+    if appended:
+        pipe.pexpire(_index_key(cache_key), ODDS_HISTORY_RETENTION * 1000)
+    pipe.execute()
+    return appended
+
+
+def downsample(redis_client, cache_key, now=None):
+    """
+    Thin out old history to one entry per ODDS_HISTORY_BUCKET.
+
+    Entries newer than ODDS_HISTORY_FULL_RESOLUTION are kept as is; older ones
+    keep the last entry of each bucket, which is the odd that was current when
+    the bucket closed. Only whole buckets are thinned, each of them once: the
+    league remembers where the last run stopped, so a run within the same
+    bucket costs a single GET and later runs read only the newly closed
+    buckets.
+
+    Args:
+        redis_client (Redis): Redis client.
+        cache_key (str): Cache key of the league.
+        now (int, optional): Current time in ms, defaults to now.
+
+    Returns:
+        int: Number of entries deleted.
+    """
+    now = now or int(time.time() * 1000)
+    bucket_ms = ODDS_HISTORY_BUCKET * 1000
+    until = (now - ODDS_HISTORY_FULL_RESOLUTION * 1000) // bucket_ms * bucket_ms  # Start of the open bucket
+    marker = redis_client.get(_downsampled_key(cache_key))
+    start = int(marker) if marker else 0
+    if until <= start:
+        return 0
+
+    stream_keys = [_stream_key(cache_key, _decode(match_id)) for match_id in redis_client.zrange(_index_key(cache_key), 0, -1)]
+    pipe = redis_client.pipeline(transaction=False)
+    for stream_key in stream_keys:
+        pipe.xrange(stream_key, min=start, max=until - 1)
+    histories = pipe.execute()
+
+    pipe = redis_client.pipeline(transaction=False)
+    deletes = 0
+    for stream_key, entries in zip(stream_keys, histories):
+        stale_ids = []
+        for current, following in zip(entries, entries[1:]):
+            current_bucket = int(_decode(current[0]).split("-")[0]) // bucket_ms
+            following_bucket = int(_decode(following[0]).split("-")[0]) // bucket_ms
+            if current_bucket == following_bucket:
+                stale_ids.append(current[0])
+
+        if stale_ids:
+            pipe.xdel(stream_key, *stale_ids)
+            deletes += 1
+    pipe.set(_downsampled_key(cache_key), until, px=ODDS_HISTORY_RETENTION * 1000)
+    return sum(pipe.execute()[:deletes])
+
+
+def get_odds_series(redis_client, cache_key, match_id, start="-", end="+"):
+    """
+    Get the odds time series of a single match.
+
+    Args:
+        redis_client (Redis): Redis client.
+        cache_key (str): Cache key of the league.
+        match_id (str): Match identifier (see match_identifier).
+        start (int | str): Start time in ms, "-" for the oldest entry.
+        end (int | str): End time in ms, "+" for the newest entry.
+
+    Returns:
+        list: Dictionaries with "timestamp" (ms) and "odds" per outcome.
+    """
+    entries = redis_client.xrange(_stream_key(cache_key, match_id), min=start, max=end)
+    return [_parse_entry(entry) for entry in entries]
+
+
+def get_league_movement(redis_client, cache_key):
+    """
+    Summarize odds movement for every match in a league.
+
+    Only the first and the last entry of each match are read.
+
+    Args:
+        redis_client (Redis): Redis client.
+        cache_key (str): Cache key of the league.
+
+    Returns:
+        list: Dictionaries with the opening and latest odds and the change per
+        outcome, sorted by the largest absolute movement first.
+    """
+    match_ids = [_decode(match_id) for match_id in redis_client.zrange(_index_key(cache_key), 0, -1)]
+
+    pipe = redis_client.pipeline(transaction=False)
+    for match_id in match_ids:
+        pipe.xrange(_stream_key(cache_key, match_id), count=1)
+        pipe.xrevrange(_stream_key(cache_key, match_id), count=1)
+        pipe.xlen(_stream_key(cache_key, match_id))
+    results = pipe.execute()
+
+    movement = []
+    for index, match_id in enumerate(match_ids):
+        first, last, length = results[3 * index:3 * index + 3]
+        if not first or not last:
+            continue
+        opening = _parse_entry(first[0])
+        latest = _parse_entry(last[0])
+        change = {
+            outcome: round(odd - opening["odds"][outcome], 2)
+            for outcome, odd in latest["odds"].items()
+            if outcome in opening["odds"]
+        }
+        movement.append({
+            "match": match_id,
+            "snapshots": length,
+            "opening": opening,
+            "latest": latest,
+            "change": change,
+        })
+
+    movement.sort(key=lambda item: max((abs(c) for c in item["change"].values()), default=0), reverse=True)
+    return movement
@@ -0,0 +1,186 @@
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from app.constants import SELECTOR_PROBE_TIMEOUT, SELECTOR_RENDER_TIMEOUT
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Ranked candidate selectors per page element. OddsPortal's hashed Vue
+# attributes (data-v-...) change with every redesign, so each element falls back
+# to stable test ids and then to class-based structural patterns. The first
+# candidate that matches on the loaded page is used for the whole scrape.
+# Pages are only probed once they rendered: participant links (RENDER_ANCHOR)
+# are on every OddsPortal page whatever its layout, so a slow render is not
+# mistaken for drift.
+RENDER_ANCHOR = "a[title]"
+SELECTORS = {
+    "listing_row": [
+        "div[data-v-b8d70024]",
+        'div[data-testid="game-row"]',
+        "div.eventRow",
+    ],
+    "listing_date": [
+        ".text-black-main.font-main",
+        'div[data-testid="date-header"]',
+    ],
+    "listing_odds_cell": [
+        "div[data-v-34474325]",
+        'div[data-testid^="odd-container"]',
+    ],
+    "draw_column": [
+        "div.draw-column",
+        'div[data-testid="draw-column"]',
+    ],
+    "draw_match": [
+        "div.draw-match",
+        'div[data-testid="draw-match"]',
+    ],
+    "bookmaker_row": [
+        'div[data-testid="over-under-expanded-row"]',
+        'div[data-testid="expanded-row"]',
+    ],
+    "results_pagination": [
+        "a.pagination-link[data-number]",
+        'div[data-testid="pagination"] a',
+    ],
+}
+
+
+class SelectorDrift(Exception):
+    """None of the candidate selectors of a page element matched."""
+
+    def __init__(self, role, url):
+        super().__init__(f"No selector for {role} matched on {url}")
+        self.role = role
+        self.url = url
+
+
+async def wait_for_render(page, timeout=SELECTOR_RENDER_TIMEOUT):
+    """
+    Wait until the page rendered its participants or the network went idle.
+
+    Returns after `timeout` ms either way; the probe that follows decides
+    whether the page changed.
+    """
+    waits = [
+        asyncio.ensure_future(page.wait_for_selector(RENDER_ANCHOR, timeout=timeout)),
+        asyncio.ensure_future(page.wait_for_load_state("networkidle", timeout=timeout)),
+    ]
+    _, pending = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+    for wait in pending:
+        wait.cancel()
+    await asyncio.gather(*waits, return_exceptions=True)
+
+
+async def probe_selector(page, role, url, within=None, wait=True, timeout=SELECTOR_PROBE_TIMEOUT):
+    """
+    Find the first candidate selector of a page element that matches.
+
+    Once the page rendered (wait_for_render), waits at most `timeout` ms for
+    any candidate to appear, so a changed page fails within a second instead
+    of after a full navigation timeout.
+
+    Args:
+        page (Page): Loaded Playwright page.
+        role (str): Element name in SELECTORS (e.g., "listing_row").
+        url (str): URL of the page, for error reporting.
+        within (str, optional): Selector of the container the element must be inside.
+        wait (bool): Wait for the element to appear; otherwise only check the current DOM.
+        timeout (int): Milliseconds to wait for any candidate.
+
+    Returns:
+        str: The matching selector, prefixed with `within` if given.
+
+    Raises:
+        SelectorDrift: If no candidate matches.
+    """
+    candidates = [f"{within} {selector}" if within else selector for selector in SELECTORS[role]]
+    if wait:
+        await wait_for_render(page)
+        try:
+            await page.wait_for_selector(", ".join(candidates), timeout=timeout)
+        except PlaywrightTimeoutError:
+            raise SelectorDrift(role, url)
+
+    for rank, selector in enumerate(candidates):
+        if await page.locator(selector).count() > 0:
+            if rank > 0:
+                logger.warning(f"Primary selector for {role} no longer matches on {url}, using fallback {selector!r}.")
+            return selector
+    raise SelectorDrift(role, url)
+
+
+async def resolve_listing_selectors(page, url):
+    """
+    Pick the selectors of a league listing page, failing fast on drift.
+
+    Args:
+        page (Page): Playwright page with the listing loaded.
+        url (str): URL of the listing.
+
+    Returns:
+        dict: "row", "date", "odds_cell" and "odds" selectors; odds are
+        relative to a row, the others to the page.
+
+    Raises:
+        SelectorDrift: If the rows or their odds cannot be found.
+    """
+    row = await probe_selector(page, "listing_row", url)
+    odds_cell = await probe_selector(page, "listing_odds_cell", url, within=row)
+    odds_cell = odds_cell[len(row) + 1:]
+    try:
+        date = await probe_selector(page, "listing_date", url, wait=False)
+    except SelectorDrift:
+        # Matches are still listed, only their dates will be unknown
+        logger.warning(f"No date header selector matched on {url}.")
+        date = SELECTORS["listing_date"][0]
+    return {"row": row, "date": date, "odds_cell": odds_cell, "odds": f"{odds_cell} p"}
+
+
+def select_candidate(soup, role, url, within=None):
+    """
+    Find the first candidate selector of a page element in static HTML.
+
+    The counterpart of probe_selector for pages fetched over plain HTTP, so
+    server-rendered listings are parsed with the same selectors.
+
+    Args:
+        soup (BeautifulSoup): Parsed page.
+        role (str): Element name in SELECTORS.
+        url (str): URL of the page, for error reporting.
+        within (str, optional): Selector of the container the element must be inside.
+
+    Returns:
+        str: The matching selector, prefixed with `within` if given.
+
+    Raises:
+        SelectorDrift: If no candidate matches.
+    """
+    for selector in SELECTORS[role]:
+        selector = f"{within} {selector}" if within else selector
+        if soup.select_one(selector) is not None:
+            return selector
+    raise SelectorDrift(role, url)
+
+
+def resolve_html_listing_selectors(soup, url):
+    """
+    Pick the selectors of a league listing fetched over plain HTTP.
+
+    Args:
+        soup (BeautifulSoup): Parsed listing page.
+        url (str): URL of the listing.
+
+    Returns:
+        dict: Same keys as resolve_listing_selectors.
+
+    Raises:
+        SelectorDrift: If the page has no rows or odds, e.g. because it is rendered client-side.
+    """
+    row = select_candidate(soup, "listing_row", url)
+    odds_cell = select_candidate(soup, "listing_odds_cell", url, within=row)[len(row) + 1:]
+    try:
+        date = select_candidate(soup, "listing_date", url)
+    except SelectorDrift:
+        date = SELECTORS["listing_date"][0]
+    return {"row": row, "date": date, "odds_cell": odds_cell, "odds": f"{odds_cell} p"}
@@ -0,0 +1,179 @@
+from datetime import datetime, timezone
+from sqlalchemy import select, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models import db, Match, OddsSnapshot
+from app.odds_history import match_identifier
+from app.records import parse_odd
+from app.constants import SQL_BATCH_SIZE
+
+# Every scrape is also written to SQL for season-long reporting: one row per
+# match in "matches" (upserted on league, match key and kickoff date) and one
+# row per scrape in "odds_snapshots". Writes use multi-row INSERT ... ON
+# CONFLICT statements through the engine, never per-row ORM adds, so a league
+# costs two statements per SQL_BATCH_SIZE matches and runs safely from worker
+# threads. Matches without a kickoff date ("Unknown") are not written: keyed on
+# the scrape day, the same match would get a new row every day.
+
+
+def _insert(table):
+    """INSERT for the dialect of the database, with ON CONFLICT support."""
+    dialect = postgresql if db.engine.dialect.name == "postgresql" else sqlite
+    return dialect.insert(table)
+
+
+def kickoff_date(value):
+    """Parse a cached "dd-mm-YYYY" date; None for unknown dates."""
+    try:
+        return datetime.strptime(value or "", "%d-%m-%Y").date()
+    except ValueError:
+        return None
+
+
+def _chunks(rows, size=SQL_BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def save_scrape(sport, league, matches, scraped_at=None, source="listing"):
+    """
+    Upsert the matches of one scrape and insert their odds snapshots.
+
+    Matches with an unknown kickoff date are skipped.
+
+    Args:
+        sport (str): "football" or "tennis".
+        league (str): League name.
+        matches (list): Match dictionaries of the cache format.
+        scraped_at (datetime, optional): Time of the scrape, defaults to now (UTC).
+        source (str): "listing", "live" or "backfill".
+
+    Returns:
+        int: Number of odds snapshots written.
+    """
+    scraped_at = scraped_at or datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = {}
+    for match in matches:
+        day = kickoff_date(match.get("date"))
+        if day is None:
+            continue
+        categories = match.get("categories") or {}
+        row = {
+            "sport": sport,
+            "league": league,
+            "match_key": match_identifier(match)[:255],
+            "kickoff_date": day,
+            "home": match.get("home_team") or match.get("home_player"),
+            "away": match.get("away_team") or match.get("away_player"),
+            "round": match.get("round"),
+            "home_category": categories.get("player1"),
+            "away_category": categories.get("player2"),
+            "url": match.get("url"),
+            "first_seen": scraped_at,
+            "last_seen": scraped_at,
+        }
+        # One row per key: a statement may not upsert the same row twice
+        rows[(row["match_key"], row["kickoff_date"])] = (row, match)
+
+    written = 0
+    with db.engine.begin() as connection:
+        for chunk in _chunks(list(rows.values())):
+            stmt = _insert(Match).values([row for row, _ in chunk])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["sport", "league", "match_key", "kickoff_date"],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in ("round", "home_category", "away_category", "url", "last_seen")
+                },
+            ).returning(Match.id, Match.match_key, Match.kickoff_date)
+            ids = {(key, day): match_id for match_id, key, day in connection.execute(stmt)}
+
+            snapshots = []
+            for row, match in chunk:
+                odds = match.get("odds") or {}
+                expected_points = match.get("expected_points") or {}
+                snapshots.append({
+                    "match_id": ids[(row["match_key"], row["kickoff_date"])],
+                    "scraped_at": scraped_at,
+                    "source": source,
+                    "home_odds": parse_odd(odds.get("home")),
+                    "draw_odds": parse_odd(odds.get("draw")),
+                    "away_odds": parse_odd(odds.get("away")),
+                    "home_expected_points": expected_points.get("home"),
+                    "away_expected_points": expected_points.get("away"),
+                })
+            result = connection.execute(_insert(OddsSnapshot).values(snapshots).on_conflict_do_nothing())
+            written += result.rowcount
+    return written
+
+
+def odds_trajectory(participant, since=None):
+    """
+    Odds of every match of a team or player over time (ix_matches_home / ix_matches_away).
+
+    Args:
+        participant (str): Team or player name as scraped (e.g., "Sinner J.").
+        since (date, optional): Only matches from this kickoff date.
+
+    Returns:
+        list: One dictionary per snapshot, oldest first, with the participant's own odds.
+    """
+    query = (
+        select(Match, OddsSnapshot)
+        .join(OddsSnapshot, OddsSnapshot.match_id == Match.id)
+        .where(or_(Match.home == participant, Match.away == participant))
+        .order_by(Match.kickoff_date, OddsSnapshot.scraped_at)
+    )
+    if since:
+        query = query.where(Match.kickoff_date >= since)
+
+    trajectory = []
+    for match, snapshot in db.session.execute(query):
+        is_home = match.home == participant
+        trajectory.append({
+            "league": match.league,
+            "kickoff_date": match.kickoff_date.isoformat(),
+            "opponent": match.away if is_home else match.home,
+            "scraped_at": snapshot.scraped_at.isoformat(),
+            "source": snapshot.source,
+            "odds": snapshot.home_odds if is_home else snapshot.away_odds,
+            "opponent_odds": snapshot.away_odds if is_home else snapshot.home_odds,
+        })
+    return trajectory
+
+
+def league_favourites(league, start=None, end=None):
+    """
+    How often each team or player was the favourite of a league, on the last odds before kickoff.
+
+    Args:
+        league (str): League name.
+        start (date, optional): First kickoff date of the season.
+        end (date, optional): Last kickoff date of the season.
+
+    Returns:
+        list: [{"participant", "favourite", "matches"}], most often favourite first.
+    """
+    last_scrape = (
+        select(OddsSnapshot.match_id, db.func.max(OddsSnapshot.scraped_at).label("scraped_at"))
+        .group_by(OddsSnapshot.match_id)
+        .subquery()
+    )
+    query = (
+        select(Match.home, Match.away, OddsSnapshot.home_odds, OddsSnapshot.away_odds)
+        .join(last_scrape, last_scrape.c.match_id == Match.id)
+        .join(OddsSnapshot, (OddsSnapshot.match_id == Match.id) & (OddsSnapshot.scraped_at == last_scrape.c.scraped_at))
+        .where(Match.league == league)
+    )
+    if start:
+        query = query.where(Match.kickoff_date >= start)
+    if end:
+        query = query.where(Match.kickoff_date <= end)
+
+    counts = {}
+    for home, away, home_odds, away_odds in db.session.execute(query):
+        for participant in (home, away):
+            counts.setdefault(participant, {"participant": participant, "favourite": 0, "matches": 0})
+            counts[participant]["matches"] += 1
+        if home_odds and away_odds:
+            counts[home if home_odds < away_odds else away]["favourite"] += 1
+    return sorted(counts.values(), key=lambda entry: (-entry["favourite"], entry["participant"]))
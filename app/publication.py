@@ -0,0 +1,191 @@
+from app.constants import PUBLICATION_GRACE, PUBLICATION_STAGING_TTL
+import os
+import time
+
+# League blobs are published as immutable versions: each write goes to a new
+# "<cache_key>@<version>" key and the hash "league_versions" maps every cache
+# key (e.g., "matches_eredivisie") to its current version. A batch of leagues
+# is committed by swapping all their pointers in one Lua call, so readers, which
+# resolve pointers and blobs in one Lua call, always see a consistent set of
+# leagues. Superseded versions expire after PUBLICATION_GRACE seconds.
+POINTERS_KEY = "league_versions"
+
+_READ_SCRIPT = """
+local versions = redis.call('HMGET', KEYS[1], unpack(ARGV))
+local blobs = {}
+for i, cache_key in ipairs(ARGV) do
+    if versions[i] then
+        blobs[i] = redis.call('GET', cache_key .. '@' .. versions[i])
+    else
+        blobs[i] = false
+    end
+end
+return blobs
+"""
+
+# Commit of a batch: optionally check that every cache key still points at
+# the version the writer read (compare-and-set), then swap all pointers.
+# ARGV: ttl (0 keeps the versions), new version, then cache key / expected
+# version pairs ("" skips the check). Returns the old versions, or false on a conflict.
+_COMMIT_SCRIPT = """
+local ttl = tonumber(ARGV[1])
+local version = ARGV[2]
+for i = 3, #ARGV, 2 do
+    if ARGV[i + 1] ~= '' and redis.call('HGET', KEYS[1], ARGV[i]) ~= ARGV[i + 1] then
+        return false
+    end
+end
+local old = {}
+for i = 3, #ARGV, 2 do
+    old[#old + 1] = redis.call('HGET', KEYS[1], ARGV[i]) or ''
+    redis.call('HSET', KEYS[1], ARGV[i], version)
+    local key = ARGV[i] .. '@' .. version
+    if ttl > 0 then
+        redis.call('EXPIRE', key, ttl)
+    else
+        redis.call('PERSIST', key)
+    end
+end
+return old
+"""
+
+_VERSIONED_READ_SCRIPT = """
+local version = redis.call('HGET', KEYS[1], ARGV[1])
+if not version then
+    return {false, false}
+end
+return {version, redis.call('GET', ARGV[1] .. '@' .. version)}
+"""
+
+_read_script = None
+_commit_script = None
+_versioned_read_script = None
+
+
+def version_key(cache_key, version):
+    """Redis key of one published version of a league."""
+    return f"{cache_key}@{version}"
+
+
+def new_version():
+    """Sortable, unique version id: milliseconds since the epoch plus random bits."""
+    return f"{int(time.time() * 1000)}-{os.urandom(3).hex()}"
+
+
+def publish_leagues(redis_client, blobs, ttl=None, grace=PUBLICATION_GRACE, expected=None):
+    """
+    Publish a batch of leagues atomically.
+
+    1. Stage: write every blob under a new versioned key in one pipeline.
+       The staged keys expire unless committed, so a crash leaves no garbage.
+    2. Commit: in one Lua call, read the old pointers, point every cache key at
+       its new version and make the new versions permanent (or give them `ttl`).
+       With `expected`, the commit only happens if those cache keys still point
+       at the given versions, so a writer that patched what it read cannot
+       overwrite a newer publication.
+    3. Expire the superseded versions after `grace` seconds, so readers that
+       resolved the old pointer can still read its blob.
+
+    Three round trips, whatever the number of leagues.
+
+    Args:
+        redis_client (Redis): Redis client.
+        blobs (dict): Cache key to JSON blob (str or bytes).
+        ttl (int, optional): Seconds the new versions live; None keeps them until superseded.
+        grace (int): Seconds superseded versions stay readable.
+        expected (dict, optional): Cache key to the version it must still point at.
+
+    Returns:
+        str | None: The published version, or None for an empty batch or a
+        failed compare-and-set.
+    """
+    global _commit_script
+    if not blobs:
+        return None
+    version = new_version()
+    cache_keys = list(blobs)
+    expected = expected or {}
+
+    pipe = redis_client.pipeline(transaction=False)
+    for cache_key, blob in blobs.items():
+        pipe.set(version_key(cache_key, version), blob, ex=PUBLICATION_STAGING_TTL)
+    pipe.execute()
+
+    if _commit_script is None:
+        _commit_script = redis_client.register_script(_COMMIT_SCRIPT)
+    args = [ttl or 0, version]
+    for cache_key in cache_keys:
+        args += [cache_key, expected.get(cache_key) or ""]
+    old_versions = _commit_script(keys=[POINTERS_KEY], args=args, client=redis_client)
+    if old_versions is None:
+        redis_client.delete(*(version_key(cache_key, version) for cache_key in cache_keys))
+        return None
+
+    superseded = [
+        version_key(cache_key, old.decode("utf-8"))
+        for cache_key, old in zip(cache_keys, old_versions)
+        if old
+    ]
+    if superseded:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in superseded:
+            pipe.expire(key, grace)
+        pipe.execute()
+    return version
+
+
+def publish_league(redis_client, cache_key, blob, ttl=None):
+    """Publish one league; see publish_leagues."""
+    return publish_leagues(redis_client, {cache_key: blob}, ttl=ttl)
+
+
+def read_leagues(redis_client, cache_keys):
+    """
+    Read the current version of several leagues in one round trip.
+
+    The pointers and blobs are read in one Lua script, so the leagues come
+    from the same committed batches even while a publication is running.
+
+    Args:
+        redis_client (Redis): Redis client.
+        cache_keys (list): Cache keys of the leagues.
+
+    Returns:
+        list: Blob (bytes) or None per cache key, in order.
+    """
+    global _read_script
+    if not cache_keys:
+        return []
+    if _read_script is None:
+        _read_script = redis_client.register_script(_READ_SCRIPT)
+    blobs = _read_script(keys=[POINTERS_KEY], args=list(cache_keys), client=redis_client)
+    return [blob or None for blob in blobs]
+
+
+def read_league(redis_client, cache_key):
+    """Read the current version of one league, or None; see read_leagues."""
+    return read_leagues(redis_client, [cache_key])[0]
+
+
+def read_league_version(redis_client, cache_key):
+    """
+    Read the current version of one league together with its version id.
+
+    Returns:
+        tuple: (version or None, blob (bytes) or None), for publish_leagues(expected=...).
+    """
+    global _versioned_read_script
+    if _versioned_read_script is None:
+        _versioned_read_script = redis_client.register_script(_VERSIONED_READ_SCRIPT)
+    version, blob = _versioned_read_script(keys=[POINTERS_KEY], args=[cache_key], client=redis_client)
+    return (version.decode("utf-8") if version else None), (blob or None)
+
+
+def unpublish_league(redis_client, cache_key, grace=PUBLICATION_GRACE):
+    """Remove a league; its last version expires after `grace` seconds."""
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.hget(POINTERS_KEY, cache_key)
+    pipe.hdel(POINTERS_KEY, cache_key)
+    old = pipe.execute()[0]
+    if old:
+        redis_client.expire(version_key(cache_key, old.decode("utf-8")), grace)
@@ -0,0 +1,72 @@
+from flask import current_app
+from urllib.parse import urlparse
+from app.constants import RATE_LIMITS, DEFAULT_RATE_LIMIT, UNLIMITED_HOSTS
+import asyncio
+import time
+
+# Token bucket per host shared by every worker through Redis. The bucket holds
+# up to `capacity` requests and refills at `rate` requests per second; the script
+# takes a token if there is one and otherwise returns how long to wait for it.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+local updated = tonumber(redis.call('HGET', KEYS[1], 'updated'))
+if tokens == nil then
+    tokens = capacity
+    updated = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+def take_token(redis_client, host, now=None):
+    """
+    Try to take a request token for a host.
+
+    Args:
+        redis_client (Redis): Redis client.
+        host (str): Target host (e.g., "www.oddsportal.com").
+        now (float, optional): Current time in seconds, defaults to now.
+
+    Returns:
+        float: 0 if a token was taken, otherwise the seconds to wait before retrying.
+    """
+    capacity, rate = RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT)
+    wait = redis_client.eval(TOKEN_BUCKET_SCRIPT, 1, f"rate_limit:{host}", capacity, rate, now or time.time())
+    return float(wait)
+
+
+async def wait_for_slot(url):
+    """
+    Wait until a request to the host of `url` is allowed by its rate limit.
+
+    Call before every navigation to a scraped site. If Redis is unavailable the
+    request is let through rather than blocking the scrape.
+
+    Args:
+        url (str): URL about to be requested.
+    """
+    host = urlparse(url).hostname or ""
+    if host in UNLIMITED_HOSTS:
+        return
+    redis_client = current_app.redis_client
+    while True:
+        try:
+            wait = await asyncio.to_thread(take_token, redis_client, host)
+        except Exception as e:
+            current_app.logger.warning(f"Rate limiter unavailable for {host}: {e}")
+            return
+        if wait <= 0:
+            return
+        await asyncio.sleep(wait)
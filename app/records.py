@@ -0,0 +1,207 @@
+from dataclasses import dataclass, field
+from typing import Optional
+import json
+
+
+def parse_odd(value) -> Optional[float]:
+    """
+    Parse a decimal odd as scraped or cached.
+
+    Args:
+        value (str | float | None): Odd such as "1.85", 1.85 or "-".
+
+    Returns:
+        float | None: The odd, or None when it is missing or not a number.
+    """
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _odd(value) -> Optional[float]:
+    """parse_odd for decoding: the floats of the cache format are taken as they are."""
+    return value if value.__class__ is float else parse_odd(value)
+
+
+def _favourite(odds: dict) -> Optional[str]:
+    """Outcome with the lowest odd, or None when no odds are known."""
+    known = {outcome: odd for outcome, odd in odds.items() if odd is not None}
+    return min(known, key=known.get) if known else None
+
+
+def highlights(odds: dict) -> list:
+    """Outcomes whose odd ties the lowest one, highlighted in the match tables."""
+    known = [odd for odd in odds.values() if odd is not None]
+    return [outcome for outcome, odd in odds.items() if known and odd == min(known)]
+
+
+@dataclass(slots=True)
+class Odds:
+    """Decimal odds of a match; draw is None for tennis."""
+    home: Optional[float]
+    away: Optional[float]
+    draw: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Odds":
+        odds = object.__new__(cls)
+        odds.home = _odd(data.get("home"))
+        odds.away = _odd(data.get("away"))
+        odds.draw = _odd(data.get("draw"))
+        return odds
+
+
+@dataclass(slots=True)
+class ExpectedPoints:
+    """Expected Scorito points for each player of a tennis match."""
+    home: Optional[float] = None
+    away: Optional[float] = None
+
+
+@dataclass(slots=True)
+class Categories:
+    """Scorito categories (A-D) of both players of a tennis match."""
+    player1: str = "Unknown"
+    player2: str = "Unknown"
+
+
+@dataclass(slots=True)
+class FootballMatch:
+    """A football match with its 1X2 odds."""
+    date: str
+    home_team: str
+    away_team: str
+    odds: Odds
+    url: Optional[str] = None  # Match detail page
+    bookmakers: Optional[dict] = None  # Best price and consensus from the detail page
+    favourite: Optional[str] = field(init=False)  # "home", "draw" or "away"
+
+    def __post_init__(self):
+        self.favourite = _favourite({"home": self.odds.home, "draw": self.odds.draw, "away": self.odds.away})
+
+    def to_dict(self) -> dict:
+        return {
+            "date": self.date,
+            "home_team": self.home_team,
+            "away_team": self.away_team,
+            "odds": {"home": self.odds.home, "draw": self.odds.draw, "away": self.odds.away},
+            "favourite": self.favourite,
+            # Read by the match tables without comparing odds per request
+            "highlight": highlights({"home": self.odds.home, "draw": self.odds.draw, "away": self.odds.away}),
+            "url": self.url,
+            "bookmakers": self.bookmakers,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FootballMatch":
+        # Built without __init__, so a favourite stored in the cache is not computed again
+        match = object.__new__(cls)
+        match.date = data.get("date") or "Unknown"
+        match.home_team = data["home_team"]
+        match.away_team = data["away_team"]
+        match.odds = Odds.from_dict(data.get("odds") or {})
+        match.url = data.get("url")
+        match.bookmakers = data.get("bookmakers")
+        if "favourite" in data:
+            match.favourite = data["favourite"]
+        else:
+            match.__post_init__()
+        return match
+
+
+@dataclass(slots=True)
+class TennisMatch:
+    """A tennis match with its odds, round and expected Scorito points."""
+    date: str
+    home_player: str
+    away_player: str
+    odds: Odds
+    categories: Categories = field(default_factory=Categories)
+    round: str = "Unknown"
+    expected_points: ExpectedPoints = field(default_factory=ExpectedPoints)
+    url: Optional[str] = None  # Match detail page
+    bookmakers: Optional[dict] = None  # Best price and consensus from the detail page
+    favourite: Optional[str] = field(init=False)  # "home" or "away"
+
+    def __post_init__(self):
+        self.favourite = _favourite({"home": self.odds.home, "away": self.odds.away})
+
+    def to_dict(self) -> dict:
+        return {
+            "date": self.date,
+            "round": self.round,
+            "home_player": self.home_player,
+            "away_player": self.away_player,
+            "odds": {"home": self.odds.home, "away": self.odds.away},
+            "expected_points": {"home": self.expected_points.home, "away": self.expected_points.away},
+            "categories": {"player1": self.categories.player1, "player2": self.categories.player2},
+            "favourite": self.favourite,
+            "highlight": highlights({"home": self.odds.home, "away": self.odds.away}),
+            "url": self.url,
+            "bookmakers": self.bookmakers,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TennisMatch":
+        expected_points = data.get("expected_points") or {}
+        categories = data.get("categories") or {}
+        match = object.__new__(cls)  # As in FootballMatch.from_dict
+        match.date = data.get("date") or "Unknown"
+        match.home_player = data["home_player"]
+        match.away_player = data["away_player"]
+        match.odds = Odds.from_dict(data.get("odds") or {})
+        match.categories = Categories(categories.get("player1", "Unknown"), categories.get("player2", "Unknown"))
+        match.round = data.get("round") or "Unknown"
+        match.expected_points = ExpectedPoints(expected_points.get("home"), expected_points.get("away"))
+        match.url = data.get("url")
+        match.bookmakers = data.get("bookmakers")
+        if "favourite" in data:
+            match.favourite = data["favourite"]
+        else:
+            match.__post_init__()
+        return match
+
+
+def to_dicts(matches: list) -> list:
+    """
+    Convert match records to the dictionaries of the cache format.
+
+    Args:
+        matches (list): Match records (plain dictionaries are passed through).
+
+    Returns:
+        list: Match dictionaries.
+    """
+    return [match.to_dict() if hasattr(match, "to_dict") else match for match in matches]
+
+
+def to_cache(matches: list) -> str:
+    """
+    Serialize matches to the JSON format stored in Redis.
+
+    Args:
+        matches (list): Match records (plain dictionaries are passed through).
+
+    Returns:
+        str: JSON list of match dictionaries.
+    """
+    return json.dumps(to_dicts(matches))
+
+
+def from_cache(blob, record_type) -> list:
+    """
+    Deserialize a cached JSON list into match records.
+
+    Args:
+        blob (bytes | str): JSON as stored by to_cache.
+        record_type (type): FootballMatch or TennisMatch.
+
+    Returns:
+        list: Match records.
+    """
+    if isinstance(blob, bytes):
+        blob = blob.decode("utf-8")
+    return [record_type.from_dict(data) for data in json.loads(blob)]
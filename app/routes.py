@@ -1,10 +1,23 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, current_app
+from flask import Blueprint, render_template, stream_template, request, redirect, url_for, flash, get_flashed_messages, session, current_app
 from werkzeug.security import generate_password_hash, check_password_hash
 from blinker import signal
-from app.constants import LEAGUES, TENNIS_LEAGUES
+from app.constants import LEAGUES, TENNIS_LEAGUES, TABLE_PAGE_SIZE, SEARCH_MAX_RESULTS, SCORELINE_VIEW_TOP
 import re
 import json
 from app.models import db, User  # Lazy import of db
+from app.odds_history import get_odds_series, get_league_movement
+from app.records import FootballMatch, TennisMatch, Odds
+from app.tables import match_table
+from app.search import search
+from app.persistence import odds_trajectory, league_favourites
+from datetime import date
+from app.metrics import render_metrics
+from app.http_fetch import fetch_tiers
+from app.tracing import start_span
+from app.degraded import read_cache, redis_failed_in_request, RedisUnavailable
+from app.league_views import league_summaries, league_predictions
+from app.publication import publish_league, read_league, unpublish_league
+import functools
 
 # Blueprints
 main_bp = Blueprint("main", __name__)
@@ -17,81 +30,220 @@ fetch_football_signal = signal("fetch-football")
 # Signal Handlers
 @fetch_football_signal.connect
 def handle_fetch_football(sender, league):
-    from app.tasks import fetch_football_in_background
+    from app.jobs import enqueue_refresh
     current_app.logger.info(f"Signal received to fetch football data for league: {league}")
-    fetch_football_in_background.delay(league)
+    with start_span("signal fetch-football", league=league):
+        enqueue_refresh("football", league, priority="interactive")
 
 @fetch_tennis_signal.connect
 def handle_fetch_tennis(sender, league):
-    from app.tasks import fetch_tennis_matches_in_background
+    from app.jobs import enqueue_refresh
     current_app.logger.info(f"Signal received to fetch tennis data for league: {league}")
-    fetch_tennis_matches_in_background.delay(league)
+    with start_span("signal fetch-tennis", league=league):
+        enqueue_refresh("tennis", league, priority="interactive")
+
+def traced(view):
+    """Run a view in a span that starts the trace of the request."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        # Continue the caller's trace if the request carries a traceparent header
+        with start_span(f"{request.method} {request.path}", request.headers.get("traceparent"), query=request.query_string.decode()):
+            return view(*args, **kwargs)
+    return wrapper
+
+def request_refresh(fetch_signal, league):
+    """
+    Send a refresh signal, unless Redis is down.
+
+    Queuing a refresh goes to Redis and the Celery broker without the
+    breaker's timeouts, so it is skipped while the breaker is open and when a
+    Redis call of this request already failed.
+
+    Returns:
+        bool: Whether the signal was sent.
+    """
+    if not current_app.redis_breaker.available() or redis_failed_in_request():
+        return False
+    fetch_signal.send(current_app._get_current_object(), league=league)
+    return True
+
+def serving_snapshot(fetch_signal, league, age):
+    """Note a page served from the on-disk snapshot; ask for a refresh if Redis just lost the league."""
+    flash(f"Showing odds from {age / 60:.0f} minutes ago while live data is unavailable.", "info")
+    current_app.logger.warning(f"Serving league '{league}' from its snapshot ({age:.0f}s old).")
+    request_refresh(fetch_signal, league)
+
+def table_filters():
+    """Pagination and filters of a match table from the query string."""
+    return {
+        "page": request.args.get("page", 1, type=int),
+        "per_page": request.args.get("per_page", TABLE_PAGE_SIZE, type=int),
+        "date": request.args.get("date") or None,
+        "round_name": request.args.get("round") or None,
+        "query": request.args.get("q") or None,
+    }
+
+def stream_page(template, **context):
+    """
+    Render a template as a stream, so the first rows reach the browser early.
+
+    Flashed messages are taken before streaming starts: the session cookie is
+    sent with the headers, before the layout would pop them. Streaming views
+    must be sync: the stream keeps the request context of the view's thread.
+    """
+    get_flashed_messages(with_categories=True)
+    return stream_template(template, **context)
+
+def cached_summaries():
+    """Summary and top picks of every cached league, or nothing while Redis is unavailable."""
+    try:
+        return current_app.redis_breaker.call(league_summaries)
+    except RedisUnavailable:
+        return {"football": {}, "tennis": {}}
 
 # Routes
 @main_bp.route("/")
 def home():
-    return render_template("home.html")
+    return render_template("home.html", summaries=cached_summaries())
+
+@main_bp.route("/summary")
+def summary():
+    """Materialized views of every cached league, e.g., ?view=value_bets&view=summary."""
+    views = request.args.getlist("view") or ["summary", "top_picks"]
+    try:
+        return current_app.redis_breaker.call(league_summaries, views=views)
+    except RedisUnavailable:
+        return {"error": "Redis is unavailable"}, 503
 
 @main_bp.route("/status/<string:league>")
 def check_status(league):
     cache_key = f"matches_{league}"
-    matches = current_app.redis_client.get(cache_key)
+    matches, snapshot_age = read_cache(current_app, cache_key)
     if matches:
-        return {"status": "ready"}, 200
+        return {"status": "ready", "stale": snapshot_age is not None}, 200
+    if not current_app.redis_breaker.available():
+        return {"status": "unavailable"}, 503
     return {"status": "loading"}, 202
 
+@main_bp.route("/history/<string:league>")
+def odds_history(league):
+    """Odds movement of a league, or the odds series of one match with ?match=."""
+    cache_key = f"tennis_matches_{league}" if league in TENNIS_LEAGUES else f"matches_{league}"
+    match_id = request.args.get("match")
+    try:
+        if match_id:
+            return {"match": match_id, "series": current_app.redis_breaker.call(get_odds_series, cache_key, match_id)}
+        return {"league": league, "movement": current_app.redis_breaker.call(get_league_movement, cache_key)}
+    except RedisUnavailable:
+        return {"error": "Redis is unavailable"}, 503
+
+@main_bp.route("/metrics")
+def metrics():
+    """Scrape metrics of all workers in the Prometheus text format."""
+    try:
+        text = current_app.redis_breaker.call(render_metrics)
+    except RedisUnavailable:
+        return "# Redis is unavailable\n", 503, {"Content-Type": "text/plain; version=0.0.4"}
+    return text, 200, {"Content-Type": "text/plain; version=0.0.4"}
+
+@main_bp.route("/fetch-tiers")
+def listing_fetch_tiers():
+    """How every league listing was last fetched: plain HTTP or the browser."""
+    try:
+        return current_app.redis_breaker.call(fetch_tiers)
+    except RedisUnavailable:
+        return {"error": "Redis is unavailable"}, 503
+
+@main_bp.route("/search")
+def search_matches():
+    """Matches of all leagues whose teams or players start with the words of ?q=."""
+    query = request.args.get("q", "")
+    limit = max(1, min(request.args.get("limit", SEARCH_MAX_RESULTS, type=int), SEARCH_MAX_RESULTS))
+    try:
+        results = current_app.redis_breaker.call(search, query, limit=limit)
+    except RedisUnavailable:
+        return {"error": "Redis is unavailable"}, 503
+    return {"query": query, "results": results}
+
+@main_bp.route("/reports/trajectory")
+def report_trajectory():
+    """Odds of a team or player over all stored scrapes, e.g., ?participant=Sinner J.&since=2025-01-01."""
+    participant = request.args.get("participant", "")
+    since = request.args.get("since", type=date.fromisoformat)
+    return {"participant": participant, "trajectory": odds_trajectory(participant, since)}
+
+@main_bp.route("/reports/favourites/<string:league>")
+def report_favourites(league):
+    """How often each team or player of a league was the favourite, e.g., ?start=2024-08-01&end=2025-05-31."""
+    start = request.args.get("start", type=date.fromisoformat)
+    end = request.args.get("end", type=date.fromisoformat)
+    return {"league": league, "favourites": league_favourites(league, start, end)}
+
+@main_bp.route("/predictions")
+def predictions():
+    """Most likely scorelines for every cached football match."""
+    top = max(1, min(request.args.get("top", 5, type=int), SCORELINE_VIEW_TOP))
+    try:
+        return current_app.redis_breaker.call(league_predictions, top=top)
+    except RedisUnavailable:
+        return {"error": "Redis is unavailable"}, 503
+
 @main_bp.route("/football")
-async def football():
+@traced
+def football():
     # if "user_id" not in session:
     #     flash("Please log in to access this page.", "warning")
     #     return redirect(url_for("auth.login"))
 
     selected_league = request.args.get("league", "eredivisie")
     cache_key = f"matches_{selected_league}"
-    matches = current_app.redis_client.get(cache_key)
+    matches, snapshot_age = read_cache(current_app, cache_key)
     
+    table = None
     if matches:
-        matches = json.loads(matches.decode("utf-8")) 
+        table = match_table(matches, FootballMatch, **table_filters())
         loading = False
-        current_app.logger.info(f"Cache hit for league '{selected_league}': {len(matches)} matches retrieved.")
-    else:
+        current_app.logger.info(f"Cache hit for league '{selected_league}': {table.total} matches retrieved.")
+        if snapshot_age is not None:
+            serving_snapshot(fetch_football_signal, selected_league, snapshot_age)
+    elif request_refresh(fetch_football_signal, selected_league):
         flash("Data is being fetched; please wait.", "info")
-        fetch_football_signal.send(current_app._get_current_object(), league=selected_league)
         current_app.logger.info(f"Cache miss for league '{selected_league}'. Signal sent to fetch matches.")
         loading = True
+    else:
+        flash("Odds are temporarily unavailable; please try again shortly.", "warning")
+        loading = False
 
-    return render_template("football.html", matches=matches or [], leagues=LEAGUES, selected_league=selected_league, loading=loading)
+    return stream_page("football.html", table=table, leagues=LEAGUES, selected_league=selected_league, loading=loading)
 
 @main_bp.route("/tennis")
-async def tennis():
+@traced
+def tennis():
     # if "user_id" not in session:
     #     flash("Please log in to access this page.", "warning")
     #     return redirect(url_for("auth.login"))
 
     selected_league = request.args.get("league", "atp_australian_open")
     cache_key = f"tennis_matches_{selected_league}"
-    matches = current_app.redis_client.get(cache_key)
+    matches, snapshot_age = read_cache(current_app, cache_key)
 
+    table = None
     if matches:
-        matches = json.loads(matches.decode("utf-8"))
-        # Sort matches by highest expected points
-        matches.sort(
-            key=lambda match: max(
-                match["expected_points"].get("home", 0),
-                match["expected_points"].get("away", 0),
-            ),
-            reverse=True,
-        )
+        # Sorted by highest expected points
+        table = match_table(matches, TennisMatch, **table_filters())
         loading = False
-        current_app.logger.info(f"Cache hit for league '{selected_league}': {len(matches)} matches retrieved.")
-    else:
+        current_app.logger.info(f"Cache hit for league '{selected_league}': {table.total} matches retrieved.")
+        if snapshot_age is not None:
+            serving_snapshot(fetch_tennis_signal, selected_league, snapshot_age)
+    elif request_refresh(fetch_tennis_signal, selected_league):
         flash("Data is being fetched; please wait.", "info")
-        fetch_tennis_signal.send(current_app._get_current_object(), league=selected_league)
         current_app.logger.info(f"Cache miss for league '{selected_league}'. Signal sent to fetch matches.")
         loading = True
-        matches = []
+    else:
+        flash("Odds are temporarily unavailable; please try again shortly.", "warning")
+        loading = False
 
-    return render_template("tennis.html", matches=matches, leagues=TENNIS_LEAGUES, selected_league=selected_league, loading=loading)
+    return stream_page("tennis.html", table=table, leagues=TENNIS_LEAGUES, selected_league=selected_league, loading=loading)
 
 @auth_bp.route("/login", methods=["GET", "POST"])
 def login():
@@ -170,7 +322,7 @@ def test_cache():
 @main_bp.route("/test-redis-matches")
 def test_redis_matches():
     try:
-        value = current_app.redis_client.get(f"matches_eredivisie")
+        value = read_league(current_app.redis_client, "matches_eredivisie")
         if value:
             # Decode and print the value (assuming JSON serialization)
             value = value.decode("utf-8")
@@ -183,8 +335,8 @@ def test_redis_matches():
 @main_bp.route("/test-redis-write")
 def test_redis_write():
     try:
-        test_data = [{"match_id": "test123", "home": "Team A", "away": "Team B", "odds": {"home": 1.5, "draw": 3.2, "away": 5.0}}]
-        current_app.redis_client.set("matches_eredivisie", json.dumps(test_data), ex=3600)
+        test_data = [FootballMatch(date="Unknown", home_team="Team A", away_team="Team B", odds=Odds(home=1.5, draw=3.2, away=5.0)).to_dict()]
+        publish_league(current_app.redis_client, "matches_eredivisie", json.dumps(test_data), ttl=3600)
         return "Test data written to Redis."
     except Exception as e:
         return f"Error writing to Redis: {e}", 500
@@ -192,7 +344,7 @@ def test_redis_write():
 @main_bp.route("/test-redis-read")
 def test_redis_read():
     try:
-        value = current_app.redis_client.get("matches_eredivisie")
+        value = read_league(current_app.redis_client, "matches_eredivisie")
         if value:
             matches = json.loads(value.decode("utf-8"))
             return f"Test data retrieved: {matches}"
@@ -218,13 +370,13 @@ def clear_all_data():
 def clear_tennis_cache():
     """Clear tennis cache for debugging."""
     key = f"tennis_matches_atp_australian_open"
-    current_app.redis_client.delete(key)
+    unpublish_league(current_app.redis_client, key)
     return "Tennis cache cleared."
 
 @main_bp.route("/debug-tennis-data")
 def debug_tennis_data():
     key = f"tennis_matches_atp_australian_open"  # Use the league you are testing
-    value = current_app.redis_client.get(key)
+    value = read_league(current_app.redis_client, key)
     if value:
         matches = json.loads(value.decode("utf-8"))
         return matches  # This will return the data directly as JSON
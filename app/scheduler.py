@@ -0,0 +1,322 @@
+from datetime import datetime
+from app.constants import (
+    LEAGUES,
+    TENNIS_LEAGUES,
+    SCHEDULER_PAGE_BUDGET,
+    SCHEDULER_INTERVALS,
+    SCHEDULER_IDLE_INTERVAL,
+    SCHEDULER_RETRY_MAX_MULTIPLIER,
+    SCHEDULER_VOLATILITY_WINDOW,
+    SCHEDULER_STALE_JOB,
+    BREAKER_DRIFT_THRESHOLD,
+    BREAKER_BASE_COOLDOWN,
+    BREAKER_MAX_COOLDOWN,
+)
+import json
+import time
+
+# The schedule is a sorted set of jobs ("football:<league>" / "tennis:<league>")
+# scored by the time their next refresh is due. Running scrapes are tracked in a
+# second sorted set scored by their start time, which caps the browser pages in
+# use across all workers.
+SCHEDULE_KEY = "refresh_schedule"
+IN_FLIGHT_KEY = "scrapes_in_flight"
+
+# Match detail pages a running refresh has open on top of its PAGES_PER_JOB
+# (deep mode, app/bookmakers.py), job -> pages. Counted in the page budget
+# while the job is in flight.
+DETAIL_PAGES_KEY = "detail_pages_in_flight"
+
+# Consecutive failed refreshes per job, which back off its retries; cleared
+# by a successful refresh.
+FAILURES_KEY = "refresh_failures"
+
+# Leagues whose pages no longer match any known selectors, job -> JSON state.
+# The breaker opens after BREAKER_DRIFT_THRESHOLD consecutive drifts (earlier
+# ones are retried at the active interval). A tripped league is rescheduled
+# after its cooldown as a single probe scrape; another failure doubles the
+# cooldown, a successful scrape closes the breaker.
+BREAKER_KEY = "selector_breakers"
+
+# Browser pages a refresh keeps open at most (tennis loads the draw alongside)
+PAGES_PER_JOB = {"football": 1, "tennis": 2}
+
+
+def job_name(sport, league):
+    return f"{sport}:{league}"
+
+
+def job_cache_key(job):
+    sport, league = job.split(":", 1)
+    return f"tennis_matches_{league}" if sport == "tennis" else f"matches_{league}"
+
+
+def all_jobs():
+    """Every league refresh the scheduler knows about."""
+    return [job_name("football", league) for league in LEAGUES] + \
+           [job_name("tennis", league) for league in TENNIS_LEAGUES]
+
+
+def days_until_next_match(matches, today=None):
+    """
+    Days from today until the first upcoming match.
+
+    Args:
+        matches (list): Cached match dictionaries with "dd-mm-YYYY" dates.
+        today (date, optional): Reference date, defaults to today.
+
+    Returns:
+        int | None: 0 for today, 1 for tomorrow, ... or None without upcoming matches.
+    """
+    today = today or datetime.now().date()
+    days = []
+    for match in matches:
+        try:
+            match_date = datetime.strptime(match.get("date", ""), "%d-%m-%Y").date()
+        except ValueError:
+            continue
+        if match_date >= today:
+            days.append((match_date - today).days)
+    return min(days) if days else None
+
+
+def plan_refresh_interval(matches, recent_moves, today=None):
+    """
+    Seconds until a league should be refreshed again.
+
+    Leagues with matches today are refreshed most often and leagues with
+    nothing coming up for days rarely; a league whose odds moved within
+    SCHEDULER_VOLATILITY_WINDOW is refreshed twice as often.
+
+    Args:
+        matches (list): Cached match dictionaries of the league.
+        recent_moves (int): Matches whose odds moved within the volatility window.
+        today (date, optional): Reference date, defaults to today.
+
+    Returns:
+        int: Refresh interval in seconds.
+    """
+    days = days_until_next_match(matches, today)
+    if days is None:
+        return SCHEDULER_IDLE_INTERVAL
+
+    interval = SCHEDULER_INTERVALS[min(days, len(SCHEDULER_INTERVALS) - 1)]
+    if recent_moves:
+        interval //= 2
+    return interval
+
+
+def schedule_next_refresh(redis_client, sport, league, matches, now=None):
+    """
+    Plan the next refresh of a league after it has been fetched.
+
+    Args:
+        redis_client (Redis): Redis client.
+        sport (str): "football" or "tennis".
+        league (str): League name.
+        matches (list): Freshly fetched match dictionaries.
+        now (float, optional): Current time in seconds, defaults to now.
+
+    Returns:
+        int: The planned interval in seconds.
+    """
+    now = now or time.time()
+    cache_key = job_cache_key(job_name(sport, league))
+    recent_moves = redis_client.zcount(
+        f"odds_history:{cache_key}", (now - SCHEDULER_VOLATILITY_WINDOW) * 1000, "+inf"
+    )
+    interval = plan_refresh_interval(matches, recent_moves)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.zadd(SCHEDULE_KEY, {job_name(sport, league): now + interval})
+    pipe.hdel(FAILURES_KEY, job_name(sport, league))
+    pipe.execute()
+    return interval
+
+
+def schedule_retry(redis_client, sport, league, now=None):
+    """
+    Plan the retry of a refresh that failed or fetched nothing.
+
+    The retry comes after the active interval (SCHEDULER_INTERVALS[0]),
+    doubled per consecutive failure up to SCHEDULER_RETRY_MAX_MULTIPLIER
+    times, so a transient failure on a match day costs minutes, not the
+    SCHEDULER_IDLE_INTERVAL of a league without upcoming matches.
+
+    Args:
+        redis_client (Redis): Redis client.
+        sport (str): "football" or "tennis".
+        league (str): League name.
+        now (float, optional): Current time in seconds, defaults to now.
+
+    Returns:
+        int: Seconds until the retry.
+    """
+    now = now or time.time()
+    job = job_name(sport, league)
+    failures = redis_client.hincrby(FAILURES_KEY, job, 1)
+    interval = SCHEDULER_INTERVALS[0] * min(2 ** (failures - 1), SCHEDULER_RETRY_MAX_MULTIPLIER)
+    redis_client.zadd(SCHEDULE_KEY, {job: now + interval})
+    return interval
+
+
+def start_job(redis_client, sport, league, now=None):
+    """Mark a refresh as running so it counts against the page budget."""
+    redis_client.zadd(IN_FLIGHT_KEY, {job_name(sport, league): now or time.time()})
+
+
+def finish_job(redis_client, sport, league):
+    """Release the pages of a finished refresh."""
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.zrem(IN_FLIGHT_KEY, job_name(sport, league))
+    pipe.hdel(DETAIL_PAGES_KEY, job_name(sport, league))
+    pipe.execute()
+
+
+def pages_in_use(redis_client, now=None):
+    """
+    Browser pages held by running refreshes, detail pages included.
+
+    Jobs running longer than SCHEDULER_STALE_JOB are assumed to have died.
+
+    Args:
+        redis_client (Redis): Redis client.
+        now (float, optional): Current time in seconds, defaults to now.
+
+    Returns:
+        tuple: (pages in use, set of running jobs)
+    """
+    now = now or time.time()
+    redis_client.zremrangebyscore(IN_FLIGHT_KEY, "-inf", now - SCHEDULER_STALE_JOB)
+    running = {job.decode("utf-8") for job in redis_client.zrange(IN_FLIGHT_KEY, 0, -1)}
+    detail_pages = {job.decode("utf-8"): int(pages) for job, pages in redis_client.hgetall(DETAIL_PAGES_KEY).items()}
+    return sum(PAGES_PER_JOB[job.split(":", 1)[0]] + detail_pages.get(job, 0) for job in running), running
+
+
+def hold_detail_pages(redis_client, sport, league, pages, budget=SCHEDULER_PAGE_BUDGET, now=None):
+    """
+    Reserve match detail pages for a running refresh within the page budget.
+
+    Args:
+        redis_client (Redis): Redis client.
+        sport (str): "football" or "tennis".
+        league (str): League name.
+        pages (int): Detail pages wanted.
+        budget (int): Maximum number of browser pages in use at once.
+        now (float, optional): Current time in seconds, defaults to now.
+
+    Returns:
+        int: Detail pages granted; at least one, so a refresh always makes progress.
+    """
+    job = job_name(sport, league)
+    redis_client.hdel(DETAIL_PAGES_KEY, job)
+    used, _ = pages_in_use(redis_client, now)
+    granted = max(1, min(pages, budget - used))
+    redis_client.hset(DETAIL_PAGES_KEY, job, granted)
+    return granted
+
+
+def release_detail_pages(redis_client, sport, league):
+    """Release the detail pages of a refresh once its match pages are scraped."""
+    redis_client.hdel(DETAIL_PAGES_KEY, job_name(sport, league))
+
+
+def due_jobs(redis_client, budget=SCHEDULER_PAGE_BUDGET, now=None):
+    """
+    Pick the leagues to refresh now, most overdue first, within the page budget.
+
+    Leagues that were never scheduled are due immediately. Picked jobs are
+    marked as running and provisionally rescheduled SCHEDULER_STALE_JOB
+    ahead, so a refresh that dies is retried once it is considered dead,
+    without being dispatched twice.
+
+    Args:
+        redis_client (Redis): Redis client.
+        budget (int): Maximum number of browser pages in use at once.
+        now (float, optional): Current time in seconds, defaults to now.
+
+    Returns:
+        list: (sport, league) tuples to dispatch.
+    """
+    now = now or time.time()
+    known = {job.decode("utf-8") for job in redis_client.zrange(SCHEDULE_KEY, 0, -1)}
+    new_jobs = {job: 0 for job in all_jobs() if job not in known}
+    if new_jobs:
+        redis_client.zadd(SCHEDULE_KEY, new_jobs)
+
+    jobs = set(all_jobs())
+    used, running = pages_in_use(redis_client, now)
+    picked = []
+    for job in redis_client.zrangebyscore(SCHEDULE_KEY, "-inf", now):
+        job = job.decode("utf-8")
+        if job in running or job not in jobs:
+            continue  # Already running, or a league that was removed
+        sport, league = job.split(":", 1)
+        if used + PAGES_PER_JOB[sport] > budget:
+            break
+        used += PAGES_PER_JOB[sport]
+        picked.append((sport, league))
+
+    if picked:
+        pipe = redis_client.pipeline(transaction=False)
+        for sport, league in picked:
+            pipe.zadd(IN_FLIGHT_KEY, {job_name(sport, league): now})
+            pipe.zadd(SCHEDULE_KEY, {job_name(sport, league): now + SCHEDULER_STALE_JOB})
+        pipe.execute()
+    return picked
+
+
+def trip_breaker(redis_client, sport, league, reason, now=None):
+    """
+    Count a selector drift of a league and stop scraping it once the drifts repeat.
+
+    Args:
+        redis_client (Redis): Redis client.
+        sport (str): "football" or "tennis".
+        league (str): League name.
+        reason (str): Why the scrape failed, kept for inspection.
+        now (float, optional): Current time in seconds, defaults to now.
+
+    Returns:
+        int: Cooldown in seconds before the league is tried again, or 0 if the
+        breaker stays closed below BREAKER_DRIFT_THRESHOLD drifts.
+    """
+    now = now or time.time()
+    job = job_name(sport, league)
+    state = redis_client.hget(BREAKER_KEY, job)
+    failures = json.loads(state)["failures"] + 1 if state else 1
+    if failures < BREAKER_DRIFT_THRESHOLD:
+        cooldown, retry_at = 0, now + SCHEDULER_INTERVALS[0]
+    else:
+        cooldown = min(BREAKER_BASE_COOLDOWN * 2 ** (failures - BREAKER_DRIFT_THRESHOLD), BREAKER_MAX_COOLDOWN)
+        retry_at = now + cooldown
+
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hset(BREAKER_KEY, job, json.dumps({"failures": failures, "open_until": now + cooldown, "reason": reason}))
+    pipe.zadd(SCHEDULE_KEY, {job: retry_at})
+    pipe.execute()
+    return cooldown
+
+
+def reset_breaker(redis_client, sport, league):
+    """Close the breaker of a league after a successful scrape."""
+    redis_client.hdel(BREAKER_KEY, job_name(sport, league))
+
+
+def breaker_open_until(redis_client, sport, league, now=None):
+    """
+    Time until which scrapes of a league are blocked.
+
+    Args:
+        redis_client (Redis): Redis client.
+        sport (str): "football" or "tennis".
+        league (str): League name.
+        now (float, optional): Current time in seconds, defaults to now.
+
+    Returns:
+        float | None: End of the cooldown, or None if the league may be scraped.
+    """
+    state = redis_client.hget(BREAKER_KEY, job_name(sport, league))
+    if not state:
+        return None
+    open_until = json.loads(state)["open_until"]
+    return open_until if open_until > (now or time.time()) else None
@@ -0,0 +1,209 @@
+import numpy as np
+from app.constants import (
+    SCORELINE_MAX_GOALS,
+    SCORELINE_MIN_RATE,
+    SCORELINE_MAX_RATE,
+    SCORELINE_COVARIANCE,
+    SCORELINE_POINTS,
+    SCORELINE_VIEW_TOP,
+)
+
+
+def margin_free_probabilities(odds):
+    """
+    Convert decimal 1X2 odds into probabilities without the bookmaker margin.
+
+    Args:
+        odds (np.ndarray): Array of shape (n, 3) with home, draw and away odds.
+
+    Returns:
+        np.ndarray: Array of shape (n, 3) whose rows sum to 1.
+    """
+    implied = 1.0 / odds
+    return implied / implied.sum(axis=1, keepdims=True)
+
+
+def _poisson_pmf(rates, max_goals):
+    """Poisson probabilities of 0..max_goals for every rate, shape (n, max_goals + 1)."""
+    goals = np.arange(max_goals + 1)
+    log_factorials = np.cumsum(np.log(np.maximum(goals, 1)))
+    log_pmf = goals * np.log(rates[:, None]) - rates[:, None] - log_factorials
+    return np.exp(log_pmf)
+
+
+def bivariate_poisson_grid(lambda_home, lambda_away, covariance=SCORELINE_COVARIANCE, max_goals=SCORELINE_MAX_GOALS):
+    """
+    Scoreline probabilities of a bivariate Poisson model for a batch of matches.
+
+    Home goals are X = Z1 + Z3 and away goals Y = Z2 + Z3 with independent
+    Poisson Z1 ~ lambda_home, Z2 ~ lambda_away and a shared Z3 ~ covariance.
+    Each grid is renormalised over its truncated mass, so the scorelines
+    beyond `max_goals` of a heavy favourite do not leak out of the 1X2 sums.
+
+    Args:
+        lambda_home (np.ndarray): Home rates, shape (n,).
+        lambda_away (np.ndarray): Away rates, shape (n,).
+        covariance (float): Rate of the shared component.
+        max_goals (int): Highest number of goals per team in the grid.
+
+    Returns:
+        np.ndarray: Array of shape (n, max_goals + 1, max_goals + 1) where
+        [i, x, y] is the probability of match i ending x-y.
+    """
+    size = max_goals + 1
+    home = _poisson_pmf(lambda_home, max_goals)
+    away = _poisson_pmf(lambda_away, max_goals)
+    shared = _poisson_pmf(np.full(len(lambda_home), covariance), max_goals)
+
+    grid = np.zeros((len(lambda_home), size, size))
+    for k in range(size):
+        grid[:, k:, k:] += shared[:, k, None, None] * home[:, :size - k, None] * away[:, None, :size - k]
+    return grid / grid.sum(axis=(1, 2), keepdims=True)
+
+
+def _outcome_probabilities(grid):
+    """Home win, draw and away win probabilities from scoreline grids, shape (n, 3)."""
+    home = np.tril(np.ones(grid.shape[1:]), -1)
+    away = np.triu(np.ones(grid.shape[1:]), 1)
+    return np.stack([
+        (grid * home).sum(axis=(1, 2)),
+        np.trace(grid, axis1=1, axis2=2),
+        (grid * away).sum(axis=(1, 2)),
+    ], axis=1)
+
+
+def fit_goal_expectancies(probabilities, covariance=SCORELINE_COVARIANCE, iterations=20):
+    """
+    Fit the bivariate Poisson rates that reproduce the 1X2 probabilities.
+
+    Solves P(home win) and P(away win) for log(lambda_home) and log(lambda_away)
+    with a damped Newton iteration that runs on the whole batch at once. The
+    iteration starts with the rates apart by the log ratio of the win
+    probabilities, so heavy favourites converge instead of drifting to the
+    rate bounds.
+
+    Args:
+        probabilities (np.ndarray): Margin-free 1X2 probabilities, shape (n, 3).
+        covariance (float): Rate of the shared component.
+        iterations (int): Number of Newton steps.
+
+    Returns:
+        tuple: (lambda_home, lambda_away), each of shape (n,).
+    """
+    target = probabilities[:, [0, 2]]
+    supremacy = np.log(probabilities[:, 0] / probabilities[:, 2]) / 4
+    theta = np.log(1.3) + np.stack([supremacy, -supremacy], axis=1)
+    epsilon = 1e-4
+
+    def residual(params):
+        grid = bivariate_poisson_grid(np.exp(params[:, 0]), np.exp(params[:, 1]), covariance)
+        return _outcome_probabilities(grid)[:, [0, 2]] - target
+
+    for _ in range(iterations):
+        current = residual(theta)
+        jacobian = np.stack([
+            (residual(theta + [epsilon, 0]) - current) / epsilon,
+            (residual(theta + [0, epsilon]) - current) / epsilon,
+        ], axis=2)
+        step = np.linalg.solve(jacobian, current[:, :, None])[:, :, 0]
+        theta -= np.clip(step, -0.5, 0.5)
+        theta = np.clip(theta, np.log(SCORELINE_MIN_RATE), np.log(SCORELINE_MAX_RATE))
+
+    return np.exp(theta[:, 0]), np.exp(theta[:, 1])
+
+
+def expected_prediction_points(grid, points=SCORELINE_POINTS):
+    """
+    Expected Scorito points for predicting each scoreline.
+
+    A prediction earns points["outcome"] when the result (home win, draw, away
+    win) is right and points["exact"] on top of that when the score is exact.
+
+    Args:
+        grid (np.ndarray): Scoreline probabilities, shape (n, g, g).
+        points (dict): Points for the correct outcome and the exact score.
+
+    Returns:
+        np.ndarray: Expected points per candidate scoreline, shape (n, g, g).
+    """
+    outcomes = _outcome_probabilities(grid)
+    goals = np.arange(grid.shape[1])
+    # 0 = home win, 1 = draw, 2 = away win for every cell of the grid
+    cell_outcome = np.sign(goals[None, :] - goals[:, None]) + 1
+    return points["outcome"] * outcomes[:, cell_outcome] + points["exact"] * grid
+
+
+def predict_scorelines(odds, top=5):
+    """
+    Score a batch of matches: goal expectancies and the best scoreline picks.
+
+    Args:
+        odds (np.ndarray): Decimal 1X2 odds, shape (n, 3).
+        top (int): Number of scorelines to return per match.
+
+    Returns:
+        list: One dictionary per match with the fitted expectancies, the
+        margin-free probabilities, the fit residual (largest gap between the
+        model's and the market's 1X2 probabilities, large when the rates hit
+        their bounds) and the top scorelines by expected points.
+    """
+    probabilities = margin_free_probabilities(odds)
+    lambda_home, lambda_away = fit_goal_expectancies(probabilities)
+    grid = bivariate_poisson_grid(lambda_home, lambda_away)
+    expected = expected_prediction_points(grid)
+    residuals = np.abs(_outcome_probabilities(grid) - probabilities).max(axis=1)
+
+    size = grid.shape[1]
+    flat_expected = expected.reshape(len(odds), -1)
+    best = np.argsort(-flat_expected, axis=1)[:, :top]
+
+    predictions = []
+    for i in range(len(odds)):
+        scorelines = []
+        for cell in best[i]:
+            home_goals, away_goals = divmod(int(cell), size)
+            scorelines.append({
+                "score": f"{home_goals}-{away_goals}",
+                "probability": round(float(grid[i, home_goals, away_goals]), 4),
+                "expected_points": round(float(flat_expected[i, cell]), 2),
+            })
+        predictions.append({
+            "expectancies": {
+                "home": round(float(lambda_home[i] + SCORELINE_COVARIANCE), 2),
+                "away": round(float(lambda_away[i] + SCORELINE_COVARIANCE), 2),
+            },
+            "probabilities": {
+                outcome: round(float(p), 4)
+                for outcome, p in zip(("home", "draw", "away"), probabilities[i])
+            },
+            "fit_residual": round(float(residuals[i]), 4),
+            "scorelines": scorelines,
+        })
+    return predictions
+
+
+def score_matches(matches, top=SCORELINE_VIEW_TOP):
+    """
+    Predict scorelines for the football matches of a league in one batch.
+
+    Args:
+        matches (list): FootballMatch records.
+        top (int): Number of scorelines to return per match.
+
+    Returns:
+        list: Matches with full 1X2 odds, as cache dictionaries with a "prediction" key.
+    """
+    scored, odds = [], []
+    for match in matches:
+        row = [getattr(match.odds, outcome) for outcome in ("home", "draw", "away")]
+        if None in row or min(row) <= 1.0:
+            continue  # Missing or suspended odds
+        scored.append(match)
+        odds.append(row)
+
+    if not odds:
+        return []
+    return [
+        {**match.to_dict(), "prediction": prediction}
+        for match, prediction in zip(scored, predict_scorelines(np.array(odds, dtype=float), top=top))
+    ]
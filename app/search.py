@@ -0,0 +1,179 @@
+import json
+import re
+import unicodedata
+from app.constants import SEARCH_MIN_TOKEN, SEARCH_PREFIX_EXPANSION, SEARCH_MAX_RESULTS
+from app.odds_history import match_identifier
+
+# Cross-league search over team and player names, maintained by the workers:
+#   search:tokens               sorted set of every indexed name token (score 0, for lex prefix ranges)
+#   search:token:<token>        set of entries "<cache_key>|<match_id>" with that token
+#   search:league:<cache_key>   set of the entries currently indexed for a league
+#   search:matches              hash entry -> JSON summary of the match (league, names, date, odds)
+# A league is re-indexed incrementally on every refresh: only entries that
+# appeared or disappeared touch the token sets. Queries run as one Lua script.
+TOKENS_KEY = "search:tokens"
+MATCHES_KEY = "search:matches"
+
+_SEARCH_SCRIPT = """
+local token_limit = tonumber(ARGV[1])
+local result_limit = tonumber(ARGV[2])
+local found = nil
+for i = 3, #ARGV do
+    local tokens = redis.call('ZRANGEBYLEX', KEYS[1], '[' .. ARGV[i], '[' .. ARGV[i] .. '\\255', 'LIMIT', 0, token_limit)
+    local entries = {}
+    for _, token in ipairs(tokens) do
+        for _, entry in ipairs(redis.call('SMEMBERS', 'search:token:' .. token)) do
+            entries[entry] = true
+        end
+    end
+    if found == nil then
+        found = entries
+    else
+        for entry in pairs(found) do
+            if not entries[entry] then
+                found[entry] = nil
+            end
+        end
+    end
+end
+local matched = {}
+for entry in pairs(found or {}) do
+    table.insert(matched, entry)
+end
+table.sort(matched)
+for i = #matched, result_limit + 1, -1 do
+    matched[i] = nil
+end
+if #matched == 0 then
+    return {}
+end
+return redis.call('HMGET', KEYS[2], unpack(matched))
+"""
+
+_search_script = None
+
+
+def _token_key(token):
+    return f"search:token:{token}"
+
+
+def _league_key(cache_key):
+    return f"search:league:{cache_key}"
+
+
+def tokens(text):
+    """
+    Normalized search tokens of a name: lowercase, without accents, at least SEARCH_MIN_TOKEN long.
+
+    Args:
+        text (str): Team or player name, or a search query (e.g., "Djoković N.").
+
+    Returns:
+        list: Tokens in order, without duplicates (e.g., ["djokovic"]).
+    """
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii").lower()
+    return list(dict.fromkeys(token for token in re.split(r"[^a-z0-9]+", text) if len(token) >= SEARCH_MIN_TOKEN))
+
+
+def _entry_tokens(entry):
+    """Tokens of the team or player names of an index entry "<cache_key>|<home> vs <away>"."""
+    return tokens(" ".join(entry.split("|", 1)[1].split(" vs ")))
+
+
+def league_of(cache_key):
+    """(sport, league) of a cache key such as "tennis_matches_atp_australian_open"."""
+    if cache_key.startswith("tennis_matches_"):
+        return "tennis", cache_key[len("tennis_matches_"):]
+    return "football", cache_key[len("matches_"):]
+
+
+def _summary(cache_key, match):
+    sport, league = league_of(cache_key)
+    return json.dumps({
+        "sport": sport,
+        "league": league,
+        "date": match.get("date"),
+        "round": match.get("round"),
+        "home": match.get("home_team") or match.get("home_player"),
+        "away": match.get("away_team") or match.get("away_player"),
+        "odds": match.get("odds"),
+    })
+
+
+def index_league(redis_client, cache_key, matches):
+    """
+    Bring the search index of a league up to date with its cached matches.
+
+    Args:
+        redis_client (Redis): Redis client.
+        cache_key (str): Cache key of the league.
+        matches (list): Match dictionaries of the cache format.
+
+    Returns:
+        tuple: (entries added, entries removed)
+    """
+    entries = {f"{cache_key}|{match_identifier(match)}": match for match in matches}
+    indexed = {entry.decode("utf-8") for entry in redis_client.smembers(_league_key(cache_key))}
+    added = entries.keys() - indexed
+    removed = indexed - entries.keys()
+
+    pipe = redis_client.pipeline(transaction=False)
+    for entry in added:
+        entry_tokens = _entry_tokens(entry)
+        for token in entry_tokens:
+            pipe.sadd(_token_key(token), entry)
+        if entry_tokens:
+            pipe.zadd(TOKENS_KEY, {token: 0 for token in entry_tokens})
+    for entry in removed:
+        for token in _entry_tokens(entry):
+            pipe.srem(_token_key(token), entry)
+    if added:
+        pipe.sadd(_league_key(cache_key), *added)
+    if removed:
+        pipe.srem(_league_key(cache_key), *removed)
+        pipe.hdel(MATCHES_KEY, *removed)
+    # Summaries carry the odds, so every entry is rewritten
+    if entries:
+        pipe.hset(MATCHES_KEY, mapping={entry: _summary(cache_key, match) for entry, match in entries.items()})
+    pipe.execute()
+
+    # Drop tokens no entry uses anymore, so prefix ranges stay short
+    candidates = list({token for entry in removed for token in _entry_tokens(entry)})
+    if candidates:
+        pipe = redis_client.pipeline(transaction=False)
+        for token in candidates:
+            pipe.exists(_token_key(token))
+        unused = [token for token, exists in zip(candidates, pipe.execute()) if not exists]
+        if unused:
+            redis_client.zrem(TOKENS_KEY, *unused)
+    return len(added), len(removed)
+
+
+def search(redis_client, query, limit=SEARCH_MAX_RESULTS):
+    """
+    Find matches in all leagues by team or player name, in one round trip.
+
+    Every word of the query must prefix-match a token of the match's names,
+    so "djok" and "real mad" both match.
+
+    Args:
+        redis_client (Redis): Redis client.
+        query (str): Search text.
+        limit (int): Maximum number of matches.
+
+    Returns:
+        list: Match summaries (sport, league, date, round, home, away, odds).
+    """
+    global _search_script
+    limit = max(1, min(limit, SEARCH_MAX_RESULTS))
+    query_tokens = tokens(query)
+    if not query_tokens:
+        return []
+    if _search_script is None:
+        _search_script = redis_client.register_script(_SEARCH_SCRIPT)
+    summaries = _search_script(
+        keys=[TOKENS_KEY, MATCHES_KEY],
+        args=[SEARCH_PREFIX_EXPANSION, limit, *query_tokens],
+        client=redis_client,
+    )
+    return [json.loads(summary) for summary in summaries if summary]
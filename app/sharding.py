@@ -0,0 +1,131 @@
+from app.constants import SHARD_HEARTBEAT_TIMEOUT, SHARD_VIRTUAL_NODES
+import bisect
+import hashlib
+import os
+import socket
+import time
+
+# Worker nodes announce themselves in a sorted set scored by their last
+# heartbeat. Leagues are assigned to the live nodes with a consistent hash ring,
+# so a node joining or leaving only moves the leagues next to it on the ring,
+# and every node consumes its own shard queues before the shared ones.
+NODES_KEY = "worker_nodes"
+PRIORITIES = ["interactive", "background"]
+
+
+def node_id():
+    """Identifier of this worker node (Heroku dyno name or hostname)."""
+    return os.getenv("WORKER_NODE_ID") or os.getenv("DYNO") or socket.gethostname()
+
+
+def shard_queue(node, priority):
+    """Name of a node's queue for one priority, e.g. "shard.worker.1.background"."""
+    return f"shard.{node}.{priority}"
+
+
+def node_queues(node):
+    """Queues a node consumes, in the order they are served."""
+    queues = []
+    for priority in PRIORITIES:
+        queues += [shard_queue(node, priority), priority]
+    return queues
+
+
+def _hash(value):
+    return int(hashlib.md5(value.encode("utf-8")).hexdigest()[:16], 16)
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes."""
+
+    def __init__(self, nodes, virtual_nodes=SHARD_VIRTUAL_NODES):
+        self.ring = sorted(
+            (_hash(f"{node}#{i}"), node)
+            for node in nodes
+            for i in range(virtual_nodes)
+        )
+        self.hashes = [point for point, _ in self.ring]
+
+    def node_for(self, key):
+        """Node owning `key`, or None if the ring is empty."""
+        if not self.ring:
+            return None
+        index = bisect.bisect(self.hashes, _hash(key)) % len(self.ring)
+        return self.ring[index][1]
+
+
+def heartbeat(redis_client, node=None, now=None):
+    """
+    Announce a node as alive and hand over the queues of dead nodes.
+
+    Args:
+        redis_client (Redis): Redis client.
+        node (str, optional): Node identifier, defaults to node_id().
+        now (float, optional): Current time in seconds, defaults to now.
+
+    Returns:
+        list: Nodes found dead during this heartbeat.
+    """
+    now = now or time.time()
+    redis_client.zadd(NODES_KEY, {node or node_id(): now})
+
+    dead = [n.decode("utf-8") for n in redis_client.zrangebyscore(NODES_KEY, "-inf", now - SHARD_HEARTBEAT_TIMEOUT)]
+    for dead_node in dead:
+        # Only the node that removes the entry reclaims its queues
+        if redis_client.zrem(NODES_KEY, dead_node):
+            reclaim_queues(redis_client, dead_node)
+    return dead
+
+
+def leave(redis_client, node=None):
+    """Remove a node on shutdown and hand its queued jobs to the shared queues."""
+    node = node or node_id()
+    redis_client.zrem(NODES_KEY, node)
+    reclaim_queues(redis_client, node)
+
+
+def reclaim_queues(redis_client, node, prefixes=("", "scrape_jobs:")):
+    """
+    Move the jobs queued for a node to the shared queues.
+
+    Celery's Redis transport and the scrape daemon both keep a queue as a
+    Redis list, named after the queue (Celery) or prefixed with "scrape_jobs:"
+    (daemon), so the jobs can be moved list to list.
+
+    Args:
+        redis_client (Redis): Redis client.
+        node (str): Node whose queues are reclaimed.
+        prefixes (tuple): List name prefixes of the Celery and daemon queues.
+
+    Returns:
+        int: Number of jobs moved.
+    """
+    moved = 0
+    for prefix in prefixes:
+        for priority in PRIORITIES:
+            source = f"{prefix}{shard_queue(node, priority)}"
+            while redis_client.lmove(source, f"{prefix}{priority}", "RIGHT", "LEFT") is not None:
+                moved += 1
+    return moved
+
+
+def live_nodes(redis_client, now=None):
+    """Nodes with a heartbeat within SHARD_HEARTBEAT_TIMEOUT."""
+    now = now or time.time()
+    return [n.decode("utf-8") for n in redis_client.zrangebyscore(NODES_KEY, now - SHARD_HEARTBEAT_TIMEOUT, "+inf")]
+
+
+def queue_for(redis_client, job, priority):
+    """
+    Queue a league refresh should go to.
+
+    Args:
+        redis_client (Redis): Redis client.
+        job (str): "sport:league" job name.
+        priority (str): "interactive" or "background".
+
+    Returns:
+        str: The owning node's shard queue, or the shared queue without live nodes.
+    """
+    owner = HashRing(live_nodes(redis_client)).node_for(job)
+    return shard_queue(owner, priority) if owner else priority
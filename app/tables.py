@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from markupsafe import Markup
+from app.constants import TABLE_PAGE_SIZE, TABLE_MAX_PAGE_SIZE
+from app.records import TennisMatch, highlights
+from itertools import combinations
+import json
+import math
+
+HIGHLIGHT = Markup(' class="highlight"')
+OUTCOMES = ("home", "draw", "away")
+
+# Class attributes of a row's cells by its highlighted outcomes (the lowest
+# odd, or all outcomes tied at it), built once; cached matches carry their
+# highlighted outcomes (see to_dict), so rows share these
+CELLS = {
+    highlighted: {outcome: HIGHLIGHT if outcome in highlighted else "" for outcome in OUTCOMES}
+    for size in range(len(OUTCOMES) + 1)
+    for highlighted in combinations(OUTCOMES, size)
+}
+
+
+@dataclass(slots=True)
+class TableRow:
+    """A match of a table page with the class attribute of its cells per outcome."""
+    match: object
+    cell: dict  # "home" / "draw" / "away" -> ' class="highlight"' for the lowest odds, else ""
+
+
+@dataclass(slots=True)
+class TablePage:
+    """One page of a filtered match table."""
+    rows: list
+    total: int  # Matches after filtering
+    page: int
+    pages: int
+    per_page: int
+    dates: list  # Filter options over the whole league
+    rounds: list
+
+
+def _tennis_sort_key(match):
+    expected_points = match.get("expected_points") or {}
+    return max(expected_points.get("home") or 0, expected_points.get("away") or 0)
+
+
+def _names(match):
+    return " ".join(
+        str(match.get(field) or "") for field in ("home_team", "away_team", "home_player", "away_player")
+    ).lower()
+
+
+def match_table(blob, record_type, page=1, per_page=TABLE_PAGE_SIZE, date=None, round_name=None, query=None):
+    """
+    Filter, sort and paginate a cached league for a match table.
+
+    Filtering and sorting work on the cached dictionaries, and only the
+    matches on the requested page are turned into records. Tennis matches are
+    sorted by their highest expected points.
+
+    Args:
+        blob (bytes | str): Cached league as stored by to_cache.
+        record_type (type): FootballMatch or TennisMatch.
+        page (int): 1-based page number, clamped to the available pages.
+        per_page (int): Matches per page, at most TABLE_MAX_PAGE_SIZE.
+        date (str, optional): Only matches on this date.
+        round_name (str, optional): Only matches of this round (tennis).
+        query (str, optional): Only matches with a team or player containing this text.
+
+    Returns:
+        TablePage: The requested page.
+    """
+    if isinstance(blob, bytes):
+        blob = blob.decode("utf-8")
+    matches = json.loads(blob)
+    dates = sorted({match.get("date") or "Unknown" for match in matches})
+    rounds = sorted({match["round"] for match in matches if match.get("round")})
+
+    if date:
+        matches = [match for match in matches if (match.get("date") or "Unknown") == date]
+    if round_name:
+        matches = [match for match in matches if match.get("round") == round_name]
+    if query:
+        query = query.lower()
+        matches = [match for match in matches if query in _names(match)]
+    if record_type is TennisMatch:
+        matches.sort(key=_tennis_sort_key, reverse=True)
+
+    per_page = max(1, min(per_page, TABLE_MAX_PAGE_SIZE))
+    pages = max(1, math.ceil(len(matches) / per_page))
+    page = max(1, min(page, pages))
+    rows = []
+    for data in matches[(page - 1) * per_page : page * per_page]:
+        match = record_type.from_dict(data)
+        # Leagues cached before the highlights were stored fall back to the record's odds
+        highlighted = data["highlight"] if "highlight" in data else highlights(
+            {"home": match.odds.home, "draw": match.odds.draw, "away": match.odds.away}
+        )
+        rows.append(TableRow(match, CELLS[tuple(highlighted)]))
+    return TablePage(rows, len(matches), page, pages, per_page, dates, rounds)
@@ -1,8 +1,8 @@
 from app.celery_worker import celery
-from app.utils import fetch_matches_and_cache, log_task_status
-from app.constants import TENNIS_LEAGUES, LEAGUES
-from app.fetchers import fetch_football_matches_async, fetch_combined_tennis_data
+from app.utils import log_task_status
 from app.browser import close_browser, get_browser
+from app.jobs import run_football_refresh, run_tennis_refresh, enqueue_refresh
+from app.scheduler import due_jobs
 import logging
 import asyncio
 import sys
@@ -15,33 +15,24 @@ from browser import close_browser, get_browser
 logger = logging.getLogger(__name__)
 
 @celery.task(name="app.tasks.fetch_tennis_matches_in_background")
-def fetch_tennis_matches_in_background(league: str) -> None:
+def fetch_tennis_matches_in_background(league: str, deep: bool = None) -> None:
     """
     Fetch and process tennis matches for a specific league.
+
+    Args:
+        league (str): League name as defined in TENNIS_LEAGUES.
+        deep (bool, optional): Also scrape every bookmaker per match; defaults to DEEP_ODDS_MODE.
     """
     from flask import current_app
 
     try:
         log_task_status(logger, "start", task_name="fetch_tennis_matches_in_background", league=league)
 
-        league_urls = TENNIS_LEAGUES.get(league, {})
-        matches_url = league_urls.get("matches")
-        rounds_url = league_urls.get("rounds")
-
-        if not matches_url:
-            logger.warning(f"Invalid tennis league: {league}")
-            return
-
         async def task_logic():
             # Use a fresh browser instance for this task
             browser = await get_browser(current_app)
             try:
-                await fetch_matches_and_cache(
-                    fetch_func=fetch_combined_tennis_data,
-                    cache_key=f"tennis_matches_{league}",
-                    fetch_args=(matches_url, rounds_url),
-                    logger=logger,
-                )
+                await run_tennis_refresh(league, deep)
             finally:
                 await close_browser(current_app)
 
@@ -51,33 +42,24 @@ def fetch_tennis_matches_in_background(league: str) -> None:
         logger.error(f"Error in fetch_tennis_matches_in_background for league {league}: {e}")
 
 @celery.task(name="app.tasks.fetch_football_in_background")
-def fetch_football_in_background(league: str) -> None:
+def fetch_football_in_background(league: str, deep: bool = None) -> None:
     """
     Fetch and process football matches for a specific league.
 
     Args:
         league (str): League name as defined in LEAGUES.
+        deep (bool, optional): Also scrape every bookmaker per match; defaults to DEEP_ODDS_MODE.
     """
     from flask import current_app
 
     try:
         log_task_status(logger, "start", task_name="fetch_football_in_background", league=league)
 
-        league_url = LEAGUES.get(league)
-        if not league_url:
-            logger.warning(f"Invalid football league: {league}")
-            return
-
         async def task_logic():
             # Use a fresh browser instance for each task
             browser = await get_browser(current_app)
             try:
-                await fetch_matches_and_cache(
-                    fetch_func=fetch_football_matches_async,
-                    cache_key=f"matches_{league}",
-                    fetch_args=(league_url,),
-                    logger=logger,
-                )
+                await run_football_refresh(league, deep)
             finally:
                 await close_browser(current_app)
 
@@ -86,6 +68,31 @@ def fetch_football_in_background(league: str) -> None:
     except Exception as e:
         logger.error(f"Error in fetch_football_in_background for league {league}: {e}")
 
+@celery.task(name="app.tasks.schedule_refreshes")
+def schedule_refreshes() -> list:
+    """
+    Dispatch the league refreshes that are due, within the global page budget.
+
+    Runs periodically from Celery beat (see beat_schedule in celery_worker).
+
+    Returns:
+        list: The dispatched "sport:league" jobs.
+    """
+    from flask import current_app
+
+    try:
+        dispatched = []
+        for sport, league in due_jobs(current_app.redis_client):
+            enqueue_refresh(sport, league)
+            dispatched.append(f"{sport}:{league}")
+
+        if dispatched:
+            logger.info(f"Scheduled refreshes: {', '.join(dispatched)}")
+        return dispatched
+    except Exception as e:
+        logger.error(f"Error in schedule_refreshes: {e}")
+        return []
+
 @celery.task(name="app.tasks.test_task")
 def test_task() -> str:
     """
@@ -0,0 +1,195 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from app.sharding import node_id
+import requests
+import threading
+import queue
+import json
+import os
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Minimal tracing in the W3C Trace Context model: a request starts a trace,
+# every span knows its parent, and the context crosses process boundaries as
+# a "traceparent" string ("00-<trace id>-<span id>-01") in Celery task headers
+# and daemon job payloads. Finished spans are written by a background thread
+# as JSON lines to a file or as OTLP/HTTP JSON to a collector (TRACE_EXPORT).
+current_span = ContextVar("current_span", default=None)
+
+_exporter = None
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start_ns", "end_ns", "error")
+
+    def __init__(self, name, trace_id, parent_id=None, attributes=None):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class SpanExporter:
+    """
+    Write finished spans from a background thread.
+
+    Spans are queued as they end and written in batches, so exporting never
+    blocks a request or a scrape. The thread is started on first use, after
+    Celery has forked its worker processes.
+    """
+
+    def __init__(self, target, service):
+        self.target = target
+        self.service = service
+        self.queue = queue.Queue(maxsize=10000)
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def export(self, span):
+        if self.thread is None or not self.thread.is_alive():
+            with self.lock:
+                if self.thread is None or not self.thread.is_alive():
+                    self.thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self.thread.start()
+        try:
+            self.queue.put_nowait(span.to_dict())
+        except queue.Full:
+            pass  # Drop spans rather than grow without bound
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while not self.queue.empty() and len(batch) < 512:
+                batch.append(self.queue.get_nowait())
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.warning(f"Could not export {len(batch)} spans to {self.target}: {e}")
+
+    def _write(self, batch):
+        if self.target.startswith("file:"):
+            with open(self.target[len("file:"):], "a") as f:
+                for span in batch:
+                    f.write(json.dumps({**span, "service": self.service}) + "\n")
+        else:
+            endpoint = self.target.split(":", 1)[1].rstrip("/")
+            requests.post(f"{endpoint}/v1/traces", json=otlp_payload(batch, self.service), timeout=5)
+
+
+def otlp_payload(spans, service):
+    """Convert span dictionaries to an OTLP/HTTP JSON export request."""
+    def attributes(values):
+        return [{"key": key, "value": {"stringValue": str(value)}} for key, value in values.items()]
+
+    return {"resourceSpans": [{
+        "resource": {"attributes": attributes({"service.name": service, "host.name": node_id()})},
+        "scopeSpans": [{
+            "scope": {"name": "app.tracing"},
+            "spans": [{
+                "traceId": span["trace_id"],
+                "spanId": span["span_id"],
+                **({"parentSpanId": span["parent_id"]} if span["parent_id"] else {}),
+                "name": span["name"],
+                "kind": 1,
+                "startTimeUnixNano": str(span["start_ns"]),
+                "endTimeUnixNano": str(span["end_ns"]),
+                "attributes": attributes(span["attributes"]),
+                "status": {"code": 2, "message": span["error"]} if span["error"] else {},
+            } for span in spans],
+        }],
+    }]}
+
+
+def configure_tracing(app):
+    """
+    Set up span export from the app config.
+
+    TRACE_EXPORT is "file:<path>" for JSON lines, "otlp:<collector URL>" for
+    an OTLP/HTTP collector (e.g., otlp:http://localhost:4318), or empty to
+    only propagate trace context without exporting spans.
+
+    Args:
+        app (Flask): Flask application.
+    """
+    global _exporter
+    target = app.config.get("TRACE_EXPORT")
+    if target and not target.startswith(("file:", "otlp:")):
+        logger.warning(f"Ignoring TRACE_EXPORT {target!r}: expected file:<path> or otlp:<url>.")
+        target = None
+    _exporter = SpanExporter(target, app.config["TRACE_SERVICE_NAME"]) if target else None
+
+
+def parse_traceparent(traceparent):
+    """
+    Read a W3C traceparent header.
+
+    Returns:
+        tuple | None: (trace id, parent span id), or None if missing or malformed.
+    """
+    parts = (traceparent or "").split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+def traceparent():
+    """The traceparent of the current span, to pass to another process, or None."""
+    span = current_span.get()
+    return f"00-{span.trace_id}-{span.span_id}-01" if span else None
+
+
+@contextmanager
+def start_span(name, traceparent=None, **attributes):
+    """
+    Run the enclosed block in a span.
+
+    The span is a child of the current span. Without one, it continues the
+    trace of `traceparent` (a span started in another process) or starts a
+    new trace.
+
+    Args:
+        name (str): Span name (e.g., "GET /tennis").
+        traceparent (str, optional): Remote parent as produced by traceparent().
+        **attributes: Span attributes.
+
+    Yields:
+        Span: The running span.
+    """
+    parent = current_span.get()
+    if parent:
+        span = Span(name, parent.trace_id, parent.span_id, attributes)
+    else:
+        remote = parse_traceparent(traceparent)
+        trace_id, parent_id = remote if remote else (os.urandom(16).hex(), None)
+        span = Span(name, trace_id, parent_id, attributes)
+
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        current_span.reset(token)
+        if _exporter:
+            _exporter.export(span)
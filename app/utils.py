@@ -2,6 +2,16 @@ import asyncio
 from flask import current_app
 from playwright.async_api import async_playwright
 from app.fetchers import fetch_tennis_matches_async
+from app.odds_history import append_snapshot, downsample
+from app.records import to_dicts
+from app.page_selectors import SelectorDrift
+from app.metrics import timed
+from app.tracing import start_span
+from app.degraded import write_snapshot, snapshot_dir
+from app.publication import publish_leagues
+from app.league_views import league_blobs
+from app.search import index_league, league_of
+from app.persistence import save_scrape
 
 import asyncio
 import json
@@ -19,24 +29,71 @@ async def fetch_matches_and_cache(fetch_func, cache_key, fetch_args, logger):
         logger (Logger): Logger instance for logging messages.
 
     Returns:
-        None
+        list | None: The cached match dictionaries, or None if nothing was cached.
+
+    Raises:
+        SelectorDrift: If the scraped page no longer matches any known selectors.
     """
     try:
         logger.info(f"Starting data fetch for cache_key: {cache_key}")
 
         # Fetch data asynchronously
-        data = await fetch_func(*fetch_args)
+        with start_span("fetch", cache_key=cache_key, fetcher=fetch_func.__name__):
+            data = await fetch_func(*fetch_args)
         if not data:
             logger.warning(f"No data fetched for cache_key: {cache_key}")
             return
         
         logger.debug(f"Fetched data: {data}")
+        with timed("post_processing"):
+            data = to_dicts(data)
+            blob = json.dumps(data)
+            blobs = league_blobs(cache_key, data, blob)  # The league and its materialized views
+
+        # Keep the last good snapshot on disk first, so the web tier has it even if Redis is down
+        try:
+            with timed("snapshot_write"):
+                await asyncio.to_thread(write_snapshot, snapshot_dir(current_app), cache_key, blob)
+        except OSError as e:
+            logger.error(f"Error writing snapshot for cache_key {cache_key}: {e}")
 
         # Cache the fetched data
         redis_client = current_app.redis_client
-        await asyncio.to_thread(redis_client.set, cache_key, json.dumps(data))
+        with timed("cache_write"):
+            await asyncio.to_thread(publish_leagues, redis_client, blobs)
         logger.info(f"Successfully cached data under key: {cache_key}")
 
+        # Keep the odds movement; a failing history write must not fail the refresh
+        try:
+            with timed("history_write"):
+                appended = await asyncio.to_thread(append_snapshot, redis_client, cache_key, data)
+                await asyncio.to_thread(downsample, redis_client, cache_key)
+            logger.info(f"Appended odds history for {appended} matches under key: {cache_key}")
+        except Exception as e:
+            logger.error(f"Error appending odds history for cache_key {cache_key}: {e}")
+
+        # Keep every scrape in SQL for season-long reporting
+        if current_app.config["SQL_SNAPSHOTS"]:
+            try:
+                sport, league = league_of(cache_key)
+                with timed("sql_write"):
+                    written = await asyncio.to_thread(save_scrape, sport, league, data)
+                logger.info(f"Wrote {written} odds snapshots of {cache_key} to the database.")
+            except Exception as e:
+                logger.error(f"Error writing cache_key {cache_key} to the database: {e}")
+
+        # Keep the cross-league search index in step with the league
+        try:
+            with timed("search_index"):
+                added, removed = await asyncio.to_thread(index_league, redis_client, cache_key, data)
+            logger.info(f"Search index of {cache_key}: {added} matches added, {removed} removed.")
+        except Exception as e:
+            logger.error(f"Error indexing cache_key {cache_key} for search: {e}")
+
+        return data
+
+    except SelectorDrift:
+        raise  # The caller trips the league's circuit breaker
     except Exception as e:
         logger.error(f"Error in fetch_matches_and_cache for cache_key {cache_key}: {e}")
 
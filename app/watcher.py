@@ -0,0 +1,260 @@
+from app.browser import open_page
+from app.constants import LEAGUES, TENNIS_LEAGUES, LIVE_DEBOUNCE_MS, LIVE_RELOAD_INTERVAL, LIVE_PUBLISH_ATTEMPTS
+from app.odds_history import append_snapshot, match_identifier
+from app.records import FootballMatch, TennisMatch, parse_odd
+from app.fetchers import apply_round
+from app.rate_limit import wait_for_slot
+from app.page_selectors import resolve_listing_selectors
+from app.publication import publish_leagues, read_league, read_league_version
+from app.league_views import league_blobs
+from app.search import index_league, league_of
+from app.degraded import write_snapshot, snapshot_dir
+from app.persistence import save_scrape
+from datetime import datetime, timezone
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Installed into the league page: watches the odds cells of the listing rows and
+# reports only the rows whose odds changed, batched per LIVE_DEBOUNCE_MS.
+OBSERVER_SCRIPT = """
+(config) => {
+    if (window.__oddsObserver) return;
+    const pending = new Map();
+    let timer = null;
+
+    const flush = () => {
+        timer = null;
+        const batch = Array.from(pending.values());
+        pending.clear();
+        if (batch.length) window.__oddsChanged(batch);
+    };
+
+    const matchRow = (element) => {
+        let row = element.closest(config.row);
+        while (row && row.querySelectorAll("a[title]").length < 2) {
+            row = row.parentElement && row.parentElement.closest(config.row);
+        }
+        return row;
+    };
+
+    window.__oddsObserver = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            const element = mutation.target.nodeType === 1 ? mutation.target : mutation.target.parentElement;
+            if (!element || !element.closest(config.oddsCell)) continue;
+            const row = matchRow(element);
+            if (!row) continue;
+            const names = row.querySelectorAll("a[title]");
+            const home = names[0].textContent.trim();
+            const away = names[1].textContent.trim();
+            const odds = Array.from(row.querySelectorAll(config.odds)).map((p) => p.textContent.trim());
+            pending.set(home + " vs " + away, {home, away, odds});
+        }
+        if (pending.size && !timer) timer = setTimeout(flush, config.debounce);
+    });
+    window.__oddsObserver.observe(document.body, {subtree: true, childList: true, characterData: true});
+}
+"""
+
+# Defaults; the selectors are re-resolved on every page load (app/page_selectors.py)
+OBSERVER_CONFIG = {
+    "row": "div[data-v-b8d70024]",
+    "oddsCell": "div[data-v-34474325]",
+    "odds": "div[data-v-34474325] p",
+    "debounce": LIVE_DEBOUNCE_MS,
+}
+
+
+def _patch_matches(matches, changes, tennis=False):
+    """
+    Apply observed odds changes to cached match dictionaries in place.
+
+    Rows are read like the listing parsers read them: the first two odds of a
+    tennis row, the first three of a football row, skipping rows with fewer.
+
+    Returns:
+        tuple: (live_odds hash fields of the valid changes, patched matches)
+    """
+    by_id = {match_identifier(match): match for match in matches}
+    outcomes = ("home", "away") if tennis else ("home", "draw", "away")
+    updated = []
+    live = {}
+
+    for change in changes:
+        match_id = f"{change['home']} vs {change['away']}"
+        odds = [parse_odd(odd) for odd in change["odds"][:len(outcomes)]]
+        if len(odds) < len(outcomes) or None in odds:
+            continue  # Missing or suspended market
+
+        odds = dict(zip(outcomes, odds))
+        live[match_id] = odds
+        match = by_id.get(match_id)
+        if match and match["odds"] != {**match["odds"], **odds}:
+            match["odds"].update(odds)
+            # The favourite and tennis expected points follow the odds
+            if "expected_points" in match:
+                match.update(apply_round(TennisMatch.from_dict(match), match["round"]).to_dict())
+            else:
+                match.update(FootballMatch.from_dict(match).to_dict())
+            updated.append(match)
+    return live, updated
+
+
+def apply_live_update(redis_client, cache_key, changes, timestamp=None, snapshot_directory=None, sql_snapshots=False):
+    """
+    Write a batch of changed odds to Redis.
+
+    The changed odds go to the "live_odds:<cache_key>" hash and are published on
+    the channel of the same name in one pipeline. The league is then read from
+    the cache as currently published, patched, and published with its views as
+    a new version (app/publication.py), but only if no other writer (e.g., a
+    full refresh) published the league in between; on a conflict the newer
+    version is read and patched again. Like a full refresh, the published
+    league replaces the disk snapshot and the matches whose odds moved are
+    appended to the odds history and, with sql_snapshots, to the database as
+    "live" snapshots.
+
+    Args:
+        redis_client (Redis): Redis client.
+        cache_key (str): Cache key of the league.
+        changes (list): Changed rows as reported by the observer.
+        timestamp (int, optional): Update time in ms, defaults to now.
+        snapshot_directory (str, optional): Snapshot directory; no disk snapshot if None.
+        sql_snapshots (bool): Write the moved odds to the database (needs an app context).
+
+    Returns:
+        int: Number of cached matches whose odds were updated.
+    """
+    timestamp = timestamp or int(time.time() * 1000)
+    tennis = cache_key.startswith("tennis_")
+    live, _ = _patch_matches([], changes, tennis)
+    if not live:
+        return 0
+
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hset(f"live_odds:{cache_key}", mapping={
+        match_id: json.dumps({"odds": odds, "timestamp": timestamp}) for match_id, odds in live.items()
+    })
+    pipe.expire(f"live_odds:{cache_key}", 24 * 60 * 60)
+    pipe.publish(f"live_odds:{cache_key}", json.dumps(list(live)))
+    pipe.execute()
+
+    for _ in range(LIVE_PUBLISH_ATTEMPTS):
+        version, cached = read_league_version(redis_client, cache_key)
+        matches = json.loads(cached.decode("utf-8")) if cached else []
+        _, updated = _patch_matches(matches, changes, tennis)
+        if not updated:
+            return 0
+        blobs = league_blobs(cache_key, matches)
+        if publish_leagues(redis_client, blobs, expected={cache_key: version}):
+            break
+    else:
+        logger.warning(f"Live update for {cache_key} not published: the league kept changing.")
+        return 0
+
+    if snapshot_directory:
+        try:
+            write_snapshot(snapshot_directory, cache_key, blobs[cache_key])
+        except OSError as e:
+            logger.error(f"Error writing snapshot for cache_key {cache_key}: {e}")
+
+    index_league(redis_client, cache_key, matches)  # Search results show the odds
+    append_snapshot(redis_client, cache_key, updated, timestamp=timestamp)
+
+    if sql_snapshots:
+        try:
+            sport, league = league_of(cache_key)
+            scraped_at = datetime.fromtimestamp(timestamp / 1000, timezone.utc).replace(tzinfo=None)
+            save_scrape(sport, league, updated, scraped_at=scraped_at, source="live")
+        except Exception as e:
+            logger.error(f"Error writing live odds of {cache_key} to the database: {e}")
+    return len(updated)
+
+
+async def watch_league(app, league_url, cache_key, duration=None):
+    """
+    Keep a league page open and stream odds changes into the cache.
+
+    Instead of reloading the page for every refresh, a MutationObserver reports
+    the odds cells that changed. The page is reloaded every
+    LIVE_RELOAD_INTERVAL seconds to recover from dropped live connections.
+
+    Args:
+        app (Flask): Flask application (provides the Redis client and browser).
+        league_url (str): URL of the league page on OddsPortal.
+        cache_key (str): Cache key of the league.
+        duration (float, optional): Seconds to watch; runs until cancelled if None.
+
+    Returns:
+        None
+    """
+    redis_client = app.redis_client
+    snapshot_directory = snapshot_dir(app)
+    if not await asyncio.to_thread(read_league, redis_client, cache_key):
+        logger.warning(f"No cached matches for {cache_key}; live updates only go to live_odds:{cache_key}.")
+
+    lock = asyncio.Lock()  # Batches are applied in the order they were observed
+
+    async def on_odds_changed(changes):
+        try:
+            async with lock:
+                updated = await asyncio.to_thread(
+                    apply_live_update, redis_client, cache_key, changes,
+                    snapshot_directory=snapshot_directory, sql_snapshots=app.config["SQL_SNAPSHOTS"],
+                )
+            logger.info(f"Live update for {cache_key}: {len(changes)} rows changed, {updated} cached matches updated.")
+        except Exception as e:
+            logger.error(f"Error applying live update for {cache_key}: {e}")
+
+    async with open_page(app, owner=f"watcher:{cache_key}") as page:
+        await page.expose_function("__oddsChanged", on_odds_changed)
+        deadline = time.monotonic() + duration if duration else None
+
+        while deadline is None or time.monotonic() < deadline:
+            await wait_for_slot(league_url)
+            await page.goto(league_url, timeout=30000)
+            selectors = await resolve_listing_selectors(page, league_url)
+            config = {**OBSERVER_CONFIG, "row": selectors["row"], "oddsCell": selectors["odds_cell"], "odds": selectors["odds"]}
+            await page.evaluate(OBSERVER_SCRIPT, config)
+            logger.info(f"Watching {league_url} for odds changes.")
+
+            remaining = deadline - time.monotonic() if deadline else LIVE_RELOAD_INTERVAL
+            await asyncio.sleep(max(0, min(remaining, LIVE_RELOAD_INTERVAL)))
+
+
+def main():
+    """Run the watcher for one league from the command line."""
+    from app import create_app
+    from app.browser import close_browser
+
+    parser = argparse.ArgumentParser(description="Stream live odds changes of a league into Redis.")
+    parser.add_argument("league", help="League name from LEAGUES or TENNIS_LEAGUES")
+    parser.add_argument("--duration", type=float, default=None, help="Seconds to watch (default: forever)")
+    args = parser.parse_args()
+
+    if args.league in LEAGUES:
+        league_url, cache_key = LEAGUES[args.league], f"matches_{args.league}"
+    elif args.league in TENNIS_LEAGUES:
+        league_url, cache_key = TENNIS_LEAGUES[args.league]["matches"], f"tennis_matches_{args.league}"
+    else:
+        parser.error(f"Unknown league: {args.league}")
+
+    logging.basicConfig(level=logging.INFO)
+    app = create_app()
+
+    async def run():
+        try:
+            await watch_league(app, league_url, cache_key, args.duration)
+        finally:
+            await close_browser(app)
+
+    with app.app_context():
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Local HTTP server for offline scrape benchmarks."""
+from bs4 import BeautifulSoup
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import copy
+import os
+import string
+import threading
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEBUG_HTML = os.path.join(REPO_ROOT, "debug.html")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_directory(directory=REPO_ROOT):
+    """
+    Serve a directory on a free localhost port in a background thread.
+
+    Args:
+        directory (str): Directory to serve, defaults to the repository root.
+
+    Returns:
+        tuple: (server, base URL such as "http://127.0.0.1:8123/")
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def _offline(soup):
+    """Drop scripts, stylesheets and remote images so a page loads without network."""
+    for tag in soup.select("script, link, iframe"):
+        tag.decompose()
+    for img in soup.select("img[src]"):
+        del img["src"]
+    return soup
+
+
+def _suffix(n):
+    """Letters-only suffix ("", " b", " c", ... " ba"); digits would look like tennis scores."""
+    if n == 0:
+        return ""
+    letters = ""
+    while n:
+        n, digit = divmod(n, 26)
+        letters = string.ascii_lowercase[digit] + letters
+    return " " + letters
+
+
+def synthetic_listing(rows=None, template=DEBUG_HTML):
+    """
+    Build a league listing page with `rows` matches from the saved debug.html.
+
+    The match rows of the template are repeated with renamed participants, so
+    every generated match is unique and survives the fetchers' deduplication.
+
+    Args:
+        rows (int, optional): Number of match rows; None keeps the template's rows.
+        template (str): Saved OddsPortal listing page.
+
+    Returns:
+        str: HTML of the page, without scripts or remote resources.
+    """
+    with open(template, encoding="utf-8") as f:
+        soup = _offline(BeautifulSoup(f.read(), "html.parser"))
+    if rows is None:
+        return str(soup)
+
+    templates = soup.select("div.eventRow")
+    container = templates[0].parent
+    for row in templates:
+        row.extract()
+
+    for k in range(rows):
+        row = copy.copy(templates[k % len(templates)])
+        suffix = _suffix(k // len(templates))
+        row["id"] = f"{row.get('id', 'row')}{k}"
+        for link in row.select("a[title]"):
+            name = link["title"] + suffix
+            link["title"] = name
+            label = link.select_one("p.participant-name")
+            if label:
+                label.string = name
+        container.append(row)
+    return str(soup)
+
+
+def write_fixtures(directory, sizes):
+    """
+    Write the offline debug page and one synthetic listing per size.
+
+    Args:
+        directory (str): Directory to write to (served by serve_directory).
+        sizes (list): Row counts of the synthetic listings.
+
+    Returns:
+        dict: Fixture name ("debug", "rows_100", ...) to file name.
+    """
+    fixtures = {"debug": None, **{f"rows_{size}": size for size in sizes}}
+    files = {}
+    for name, rows in fixtures.items():
+        files[name] = f"{name}.html"
+        with open(os.path.join(directory, files[name]), "w", encoding="utf-8") as f:
+            f.write(synthetic_listing(rows))
+    return files
@@ -0,0 +1,111 @@
+"""
+Memory and throughput of typed match records against the nested dicts.
+
+Usage:
+    python -m benchmarks.match_records [--matches 500] [--repeat 200]
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from app.records import FootballMatch, TennisMatch, from_cache, to_cache
+
+
+def football_payload(count):
+    """Cached football league as written before typed records (string odds)."""
+    return json.dumps([
+        {
+            "date": "01-02-2025",
+            "home_team": f"Home {i}",
+            "away_team": f"Away {i}",
+            "odds": {
+                "home": f"{random.uniform(1.1, 8):.2f}",
+                "draw": f"{random.uniform(2.5, 6):.2f}",
+                "away": f"{random.uniform(1.1, 12):.2f}",
+            },
+        }
+        for i in range(count)
+    ])
+
+
+def tennis_payload(count):
+    """Cached tennis league as written by the tennis fetcher."""
+    return json.dumps([
+        {
+            "date": "15-01-2025",
+            "round": "Second Round",
+            "home_player": f"Player {i} A.",
+            "away_player": f"Player {i} B.",
+            "odds": {"home": round(random.uniform(1.05, 8), 2), "away": round(random.uniform(1.05, 8), 2)},
+            "expected_points": {"home": None, "away": None},
+            "categories": {"player1": "C", "player2": "D"},
+        }
+        for i in range(count)
+    ])
+
+
+def dict_football_highlights(matches):
+    """The comparisons football.html did per row, including the float filters."""
+    flags = 0
+    for match in matches:
+        home, draw, away = (float(match["odds"][k]) for k in ("home", "draw", "away"))
+        flags += (home <= draw and home <= away) * 2 + (draw <= home and draw <= away) + (away <= home and away <= draw) * 2
+    return flags
+
+
+def record_highlights(matches):
+    """The same flags with typed records: one precomputed attribute per row."""
+    flags = 0
+    for match in matches:
+        favourite = match.favourite
+        flags += (favourite == "home") * 2 + (favourite == "draw") + (favourite == "away") * 2
+    return flags
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def measure_throughput(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return repeat / (time.perf_counter() - start)
+
+
+def run(count, repeat):
+    results = {}
+    for sport, payload, record_type in (
+        ("football", football_payload(count), FootballMatch),
+        ("tennis", tennis_payload(count), TennisMatch),
+    ):
+        dicts = json.loads(payload)
+        records = from_cache(payload, record_type)
+        cached = to_cache(records)  # As written by the fetchers now: float odds and the favourite
+        results[sport] = {
+            "matches": count,
+            "memory_dicts_bytes": measure_memory(lambda: json.loads(payload)),
+            "memory_records_bytes": measure_memory(lambda: from_cache(payload, record_type)),
+            "decode_dicts_per_s": measure_throughput(lambda: json.loads(payload), repeat),
+            "decode_records_per_s": measure_throughput(lambda: from_cache(payload, record_type), repeat),
+            "decode_cached_dicts_per_s": measure_throughput(lambda: json.loads(cached), repeat),
+            "decode_cached_records_per_s": measure_throughput(lambda: from_cache(cached, record_type), repeat),
+            "highlight_dicts_per_s": measure_throughput(lambda: dict_football_highlights(dicts), repeat)
+            if sport == "football" else None,
+            "highlight_records_per_s": measure_throughput(lambda: record_highlights(records), repeat),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.matches, args.repeat), indent=2))
@@ -0,0 +1,93 @@
+"""
+Jobs per minute per CPU: Celery-style scrapes against the asyncio scrape daemon.
+
+Serves debug.html from a local server and scrapes it as a football league:
+
+- celery: every job runs in its own asyncio.run() with a fresh browser, one
+  after the other, as app/tasks.py does.
+- daemon: all jobs run on one event loop with one shared browser and
+  `--concurrency` jobs at a time, as app/daemon.py does.
+
+Both modes scrape in a Chromium page (fetch_football_page_async), skipping
+the plain-HTTP tier and its Redis lookups, so only browser scrapes are
+measured. Needs Playwright's Chromium.
+
+Usage:
+    python -m benchmarks.scrape_daemon [--jobs 8] [--concurrency 4]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from app import create_app
+from app.browser import get_browser, close_browser
+from app.fetchers import fetch_football_page_async
+from benchmarks.fixture_server import serve_directory
+
+
+def cpu_seconds():
+    """CPU time of this process and its finished children (Chromium)."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def run_celery_style(app, url, jobs):
+    async def one_job():
+        await get_browser(app)
+        try:
+            return await fetch_football_page_async(url)
+        finally:
+            await close_browser(app)
+
+    return [asyncio.run(one_job()) for _ in range(jobs)]
+
+
+def run_daemon_style(app, url, jobs, concurrency):
+    async def all_jobs():
+        await get_browser(app)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one_job():
+            async with slots:
+                return await fetch_football_page_async(url)
+
+        try:
+            return await asyncio.gather(*(one_job() for _ in range(jobs)))
+        finally:
+            await close_browser(app)
+
+    return asyncio.run(all_jobs())
+
+
+def measure(name, func, jobs):
+    cpu_start, wall_start = cpu_seconds(), time.perf_counter()
+    results = func()
+    cpu, wall = cpu_seconds() - cpu_start, time.perf_counter() - wall_start
+    return {
+        "mode": name,
+        "jobs": jobs,
+        "rows_per_job": len(results[0]) if results else 0,
+        "wall_seconds": round(wall, 2),
+        "cpu_seconds": round(cpu, 2),
+        "jobs_per_minute": round(jobs / wall * 60, 1),
+        "jobs_per_minute_per_cpu": round(jobs / cpu * 60, 1) if cpu else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    server, base_url = serve_directory()
+    url = base_url + "debug.html"
+    app = create_app()
+    with app.app_context():
+        results = [
+            measure("celery", lambda: run_celery_style(app, url, args.jobs), args.jobs),
+            measure("daemon", lambda: run_daemon_style(app, url, args.jobs, args.concurrency), args.jobs),
+        ]
+    server.shutdown()
+    print(json.dumps(results, indent=2))
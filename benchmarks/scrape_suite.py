@@ -0,0 +1,200 @@
+"""
+Offline end-to-end scrape benchmark against a local fixture server.
+
+Serves the saved debug.html and synthetic listings of 10 to 1000 rows built
+from it (benchmarks/fixture_server.py), scrapes each with every strategy and
+reports per fixture:
+
+- page_load_seconds: page.goto until the load event (the GET for the *_http
+  strategies, which parse the served HTML without a browser)
+- selector_wait_seconds: finding the listing rows (app/page_selectors.py)
+- html_parse_seconds: parsing the served HTML into rows (*_http strategies)
+- extraction_seconds / rows_per_second: the row loop of the fetcher
+- peak_rss_mb: this process plus the Playwright driver and Chromium
+
+Stage times come from the same scrape_stage_seconds metrics the workers
+export (app/metrics.py); medians over --repeat runs are reported. Results are
+written as JSON so two runs can be compared with --compare. Needs Playwright's
+Chromium; Redis is optional (the fixture host is not rate limited).
+
+Usage:
+    python -m benchmarks.scrape_suite [--sizes 10 100 1000] [--repeat 3] [--output results.json]
+    python -m benchmarks.scrape_suite --compare before.json after.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from app import create_app
+from app.browser import get_browser, close_browser, browser_rss
+from app.fetchers import fetch_football_page_async, fetch_tennis_page_async, parse_football_rows, parse_tennis_rows, html_rows
+from app.http_fetch import http_session
+from app.metrics import drain_metrics, timed
+from benchmarks.fixture_server import serve_directory, write_fixtures, REPO_ROOT
+from flask import current_app
+
+
+def http_fetcher(parse_rows):
+    """The plain-HTTP tier of the fetchers, without its Redis validator cache."""
+    async def fetch(url):
+        session = http_session(current_app._get_current_object())
+        with timed("http_fetch"):
+            response = await asyncio.to_thread(session.get, url, timeout=10)
+        return await parse_rows(await html_rows(response.text, url), url)
+    return fetch
+
+
+# Strategy name -> async fetcher taking the listing URL
+STRATEGIES = {
+    "football_listing": fetch_football_page_async,
+    "tennis_listing": fetch_tennis_page_async,
+    "football_http": http_fetcher(parse_football_rows),
+    "tennis_http": http_fetcher(parse_tennis_rows),
+}
+
+
+def own_rss():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+class PeakRss:
+    """Sample the resident memory of this process and the browser in the background."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self.stop = threading.Event()
+
+    def __enter__(self):
+        def sample():
+            while not self.stop.is_set():
+                self.peak = max(self.peak, own_rss() + (browser_rss() or 0))
+                self.stop.wait(self.interval)
+
+        self.thread = threading.Thread(target=sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.thread.join()
+
+
+def stage_seconds(metrics, stage):
+    """Total seconds recorded for a listing stage in drained metrics."""
+    return sum(
+        value for series, value in metrics.items()
+        if series.startswith("scrape_stage_seconds_sum") and f'stage="{stage}"' in series and 'page="listing"' in series
+    )
+
+
+async def run_once(fetcher, url):
+    drain_metrics()
+    with PeakRss() as rss:
+        matches = await fetcher(url)
+    metrics = drain_metrics()
+    extraction = stage_seconds(metrics, "row_extraction")
+    return {
+        "rows": len(matches),
+        "page_load_seconds": stage_seconds(metrics, "navigation") + stage_seconds(metrics, "http_fetch"),
+        "selector_wait_seconds": stage_seconds(metrics, "selector_wait"),
+        "html_parse_seconds": stage_seconds(metrics, "html_parse"),
+        "extraction_seconds": extraction,
+        "rows_per_second": len(matches) / extraction if extraction else None,
+        "peak_rss_mb": rss.peak / 2**20,
+    }
+
+
+def median_of(runs):
+    summary = {}
+    for key in runs[0]:
+        values = [run[key] for run in runs if run[key] is not None]
+        summary[key] = round(statistics.median(values), 4) if values else None
+    return summary
+
+
+async def run_suite(app, base_url, fixtures, strategies, repeat):
+    results = []
+    await get_browser(app)  # Launched once, as in a long-running worker
+    try:
+        for strategy in strategies:
+            for fixture, file_name in fixtures.items():
+                runs = [await run_once(STRATEGIES[strategy], base_url + file_name) for _ in range(repeat)]
+                result = {"strategy": strategy, "fixture": fixture, "runs": repeat, **median_of(runs)}
+                print(json.dumps(result))
+                results.append(result)
+    finally:
+        await close_browser(app)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_path, after_path):
+    """Print the change of every metric between two result files."""
+    with open(before_path) as f:
+        before = {(r["strategy"], r["fixture"]): r for r in json.load(f)["results"]}
+    with open(after_path) as f:
+        after = json.load(f)["results"]
+
+    keys = ["page_load_seconds", "extraction_seconds", "rows_per_second", "peak_rss_mb"]
+    print(f"{'strategy':<18} {'fixture':<10} " + " ".join(f"{key:>22}" for key in keys))
+    for result in after:
+        old = before.get((result["strategy"], result["fixture"]))
+        if not old:
+            continue
+        cells = []
+        for key in keys:
+            if old[key] and result[key] is not None:
+                cells.append(f"{old[key]:>9.3f} -> {result[key]:<9.3f}")
+            else:
+                cells.append(f"{'n/a':>22}")
+        print(f"{result['strategy']:<18} {result['fixture']:<10} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--strategies", nargs="+", choices=sorted(STRATEGIES), default=sorted(STRATEGIES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="Results file (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        raise SystemExit
+
+    with tempfile.TemporaryDirectory() as directory:
+        fixtures = write_fixtures(directory, args.sizes)
+        server, base_url = serve_directory(directory)
+        app = create_app()
+        with app.app_context():
+            results = asyncio.run(run_suite(app, base_url, fixtures, args.strategies, args.repeat))
+        server.shutdown()
+
+    output = args.output or os.path.join(REPO_ROOT, "benchmarks", "results", f"scrape_suite_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": git_commit(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "machine": {"platform": platform.platform(), "cpus": os.cpu_count()},
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
@@ -0,0 +1,193 @@
+"""
+Load test of the web tier against an in-memory Redis.
+
+Boots create_app() with fakeredis (or a real server with --redis-url), seeds
+football and tennis leagues of several sizes and drives /football, /tennis and
+/status/<league> from a growing number of client threads through Flask's test
+client. Reports per endpoint, payload size and concurrency:
+
+- requests_per_second and p50/p95/p99 latency in milliseconds
+- the cost split of one cache hit: Redis read, building the first table
+  page (JSON decode, sort, records of the page) and Jinja render, measured
+  step by step like app/routes.py
+
+The test client skips the network and the HTTP server, so the numbers are
+the per-process cost of the routes and templates, which is what sizes a dyno.
+
+Usage:
+    python -m benchmarks.web_load [--sizes 20 100 500] [--concurrency 1 4 16] [--requests 200]
+"""
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+from flask import render_template
+from app import create_app
+from app.constants import LEAGUES, TENNIS_LEAGUES
+from app.degraded import RedisBreaker
+from app.publication import publish_leagues, read_league
+from app.records import FootballMatch, TennisMatch, Odds, Categories, ExpectedPoints, to_cache
+from app.tables import match_table
+
+
+def football_matches(count):
+    return [
+        FootballMatch(
+            date="01-02-2025",
+            home_team=f"Home {i}",
+            away_team=f"Away {i}",
+            odds=Odds(home=round(random.uniform(1.1, 8), 2), draw=round(random.uniform(2.5, 6), 2), away=round(random.uniform(1.1, 12), 2)),
+            url=f"https://www.oddsportal.com/football/match-{i}/",
+        )
+        for i in range(count)
+    ]
+
+
+def tennis_matches(count):
+    return [
+        TennisMatch(
+            date="15-01-2025",
+            home_player=f"Player {i} A.",
+            away_player=f"Player {i} B.",
+            odds=Odds(home=round(random.uniform(1.05, 8), 2), away=round(random.uniform(1.05, 8), 2)),
+            categories=Categories(player1=random.choice("ABCD"), player2=random.choice("ABCD")),
+            round="Quarterfinals",
+            expected_points=ExpectedPoints(home=round(random.uniform(0, 400), 2), away=round(random.uniform(0, 400), 2)),
+        )
+        for i in range(count)
+    ]
+
+
+def seed(redis_client, sizes):
+    """Cache one football and one tennis league per size; returns the league names."""
+    leagues, blobs = {}, {}
+    for size in sizes:
+        leagues[size] = f"bench_{size}"
+        blobs[f"matches_bench_{size}"] = to_cache(football_matches(size))
+        blobs[f"tennis_matches_bench_{size}"] = to_cache(tennis_matches(size))
+    publish_leagues(redis_client, blobs)
+    return leagues
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def drive(app, path, concurrency, requests):
+    """Send `requests` GETs to `path` from `concurrency` threads."""
+    latencies = []
+    lock = threading.Lock()
+    per_thread = max(1, requests // concurrency)
+
+    def client_thread():
+        client = app.test_client()
+        own = []
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            response = client.get(path)
+            response.get_data()  # Consume the streamed body
+            own.append(time.perf_counter() - start)
+            if response.status_code >= 500:
+                raise RuntimeError(f"{path} returned {response.status_code}")
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=client_thread) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / wall, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def cost_split(app, sport, league, repeat):
+    """Median milliseconds per step of a cache hit, following app/routes.py."""
+    cache_key = f"tennis_matches_{league}" if sport == "tennis" else f"matches_{league}"
+    record_type = TennisMatch if sport == "tennis" else FootballMatch
+    template, leagues = ("tennis.html", TENNIS_LEAGUES) if sport == "tennis" else ("football.html", LEAGUES)
+    steps = {"redis_get": [], "table": [], "render": []}
+
+    with app.test_request_context(f"/{sport}?league={league}"):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            blob = read_league(app.redis_client, cache_key)
+            steps["redis_get"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            table = match_table(blob, record_type)
+            steps["table"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            render_template(template, table=table, leagues=leagues, selected_league=league, loading=False)
+            steps["render"].append(time.perf_counter() - start)
+
+    return {f"{step}_ms": round(statistics.median(times) * 1000, 3) for step, times in steps.items()}
+
+
+def create_bench_app(redis_url=None):
+    app = create_app()
+    if redis_url:
+        from redis import Redis
+        app.redis_client = Redis.from_url(redis_url)
+    else:
+        import fakeredis  # Benchmark-only dependency: pip install fakeredis
+        app.redis_client = fakeredis.FakeRedis()
+    app.redis_breaker = RedisBreaker(app.redis_client)
+    return app
+
+
+def run(sizes, concurrency_levels, requests, repeat, redis_url=None):
+    app = create_bench_app(redis_url)
+    leagues = seed(app.redis_client, sizes)
+    results = []
+    for size, league in leagues.items():
+        for sport in ("football", "tennis"):
+            split = cost_split(app, sport, league, repeat)
+            for concurrency in concurrency_levels:
+                result = {
+                    "endpoint": f"/{sport}",
+                    "matches": size,
+                    "concurrency": concurrency,
+                    **drive(app, f"/{sport}?league={league}", concurrency, requests),
+                    **split,
+                }
+                print(json.dumps(result))
+                results.append(result)
+        for concurrency in concurrency_levels:
+            result = {
+                "endpoint": "/status/<league>",
+                "matches": size,
+                "concurrency": concurrency,
+                **drive(app, f"/status/{league}", concurrency, requests),
+            }
+            print(json.dumps(result))
+            results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and concurrency level")
+    parser.add_argument("--repeat", type=int, default=50, help="Iterations of the cost split")
+    parser.add_argument("--redis-url", default=None, help="Use a real Redis instead of fakeredis")
+    parser.add_argument("--output", default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.concurrency, args.requests, args.repeat, args.redis_url)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
@@ -13,6 +13,7 @@ class Config:
         else "sqlite:///site.db"  # Fallback for local development
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQL_SNAPSHOTS = os.environ.get("SQL_SNAPSHOTS", "true").lower() == "true"  # Write every scrape to matches/odds_snapshots
 
     # Redis Caching
     CACHE_TYPE = "RedisCache"
@@ -21,6 +22,23 @@ class Config:
         "connection_class": redis.StrictRedis
     }
 
+    # Scraping
+    DEEP_ODDS_MODE = os.environ.get("DEEP_ODDS_MODE", "false").lower() == "true"  # Scrape every bookmaker per match
+    HTTP_FAST_PATH = os.environ.get("HTTP_FAST_PATH", "true").lower() == "true"  # Try listings over plain HTTP before Chromium
+    SCRAPE_BACKEND = os.environ.get("SCRAPE_BACKEND", "celery")  # "celery" or "daemon" (app/daemon.py)
+    SCRAPE_DAEMON_CONCURRENCY = int(os.environ.get("SCRAPE_DAEMON_CONCURRENCY", 4))  # Jobs per daemon process
+    BROWSER_MAX_RSS_MB = int(os.environ.get("BROWSER_MAX_RSS_MB", 768))  # Relaunch Chromium above this resident memory
+    BROWSER_MAX_PAGES = int(os.environ.get("BROWSER_MAX_PAGES", 200))  # ... or after this many pages
+    BROWSER_PROFILE_DIR = os.environ.get("BROWSER_PROFILE_DIR", "")  # Persistent profiles with disk cache; empty: a fresh profile per launch
+
+    # Degraded mode: last good league snapshots (share this directory between web and workers)
+    SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", "")  # Empty: a directory in the system temp dir
+    REDIS_READ_TIMEOUT = float(os.environ.get("REDIS_READ_TIMEOUT", 0.5))  # Seconds, page reads only
+
+    # Tracing: "file:<path>" (JSON lines), "otlp:<collector URL>" or empty (context only)
+    TRACE_EXPORT = os.environ.get("TRACE_EXPORT", "")
+    TRACE_SERVICE_NAME = os.environ.get("TRACE_SERVICE_NAME", "oddsportal-scraper")
+
     # Celery Configuration
     CELERY_BROKER_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
     result_backend = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
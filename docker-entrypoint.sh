@@ -65,7 +65,7 @@ if [ "$1" = "worker" ] && [ "$(id -u)" = "0" ]; then
     echo "⚠️ WARNING: Running Celery as root is not recommended. Switching to a non-root user..."
     useradd -m celeryuser
     chown -R celeryuser:celeryuser /app /ms-playwright-browsers
-    exec su celeryuser -c "celery -A app.celery_worker.celery worker --loglevel=info --concurrency=1"
+    exec su celeryuser -c "celery -A app.celery_worker.celery worker -Q interactive,background --loglevel=info --concurrency=1"
 fi
 
 # ✅ Start the requested service
@@ -76,7 +76,15 @@ case "$1" in
         ;;
     worker)
         echo "🚀 Starting Celery worker..."
-        exec celery -A app.celery_worker.celery worker --loglevel=info --concurrency=1
+        exec celery -A app.celery_worker.celery worker -Q interactive,background --loglevel=info --concurrency=1
+        ;;
+    daemon)
+        echo "🚀 Starting asyncio scrape daemon..."
+        exec python -m app.daemon
+        ;;
+    beat)
+        echo "🚀 Starting Celery beat (adaptive refresh scheduler)..."
+        exec celery -A app.celery_worker.celery beat --loglevel=info
         ;;
     bash)
         echo "Opening bash shell for debugging..."
@@ -0,0 +1,67 @@
+"""add matches and odds snapshots
+
+Revision ID: 7c3f9a2e41b8
+Revises: d09edf238c6b
+Create Date: 2026-10-19 13:20:41.118273
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3f9a2e41b8'
+down_revision = 'd09edf238c6b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('matches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sport', sa.String(length=16), nullable=False),
+    sa.Column('league', sa.String(length=100), nullable=False),
+    sa.Column('match_key', sa.String(length=255), nullable=False),
+    sa.Column('kickoff_date', sa.Date(), nullable=False),
+    sa.Column('home', sa.String(length=150), nullable=False),
+    sa.Column('away', sa.String(length=150), nullable=False),
+    sa.Column('round', sa.String(length=50), nullable=True),
+    sa.Column('home_category', sa.String(length=10), nullable=True),
+    sa.Column('away_category', sa.String(length=10), nullable=True),
+    sa.Column('url', sa.String(length=500), nullable=True),
+    sa.Column('first_seen', sa.DateTime(), nullable=False),
+    sa.Column('last_seen', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sport', 'league', 'match_key', 'kickoff_date', name='uq_matches_league_key_date')
+    )
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.create_index('ix_matches_away', ['away'], unique=False)
+        batch_op.create_index('ix_matches_home', ['home'], unique=False)
+        batch_op.create_index('ix_matches_kickoff_date', ['kickoff_date'], unique=False)
+        batch_op.create_index('ix_matches_league_kickoff_date', ['league', 'kickoff_date'], unique=False)
+
+    op.create_table('odds_snapshots',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('match_id', sa.Integer(), nullable=False),
+    sa.Column('scraped_at', sa.DateTime(), nullable=False),
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('home_odds', sa.Float(), nullable=True),
+    sa.Column('draw_odds', sa.Float(), nullable=True),
+    sa.Column('away_odds', sa.Float(), nullable=True),
+    sa.Column('home_expected_points', sa.Float(), nullable=True),
+    sa.Column('away_expected_points', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('match_id', 'scraped_at', 'source', name='uq_odds_snapshots_match_time_source')
+    )
+
+
+def downgrade():
+    op.drop_table('odds_snapshots')
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_index('ix_matches_league_kickoff_date')
+        batch_op.drop_index('ix_matches_kickoff_date')
+        batch_op.drop_index('ix_matches_home')
+        batch_op.drop_index('ix_matches_away')
+
+    op.drop_table('matches')
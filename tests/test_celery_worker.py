@@ -0,0 +1,17 @@
+import os
+
+os.environ.setdefault("WORKER_NODE_ID", "test-node")
+
+from celery.contrib.testing.worker import start_worker
+from app.celery_worker import celery
+from app.sharding import node_queues, node_id
+
+
+def test_worker_consumes_its_shard_queues():
+    celery.conf.update(broker_url="memory://", result_backend="cache+memory://")
+    celery.amqp.queues.select(["interactive", "background"])
+
+    with start_worker(celery, pool="solo", perform_ping_check=False, shutdown_timeout=5) as worker:
+        active = [queue.name for queue in worker.consumer.task_consumer.queues]
+
+    assert active == node_queues(node_id())